@@ -6,6 +6,8 @@ from app.core.security import get_api_key
 from app.services.building_service import BuildingService
 from app.services.activity_service import ActivityService
 from app.services.organization_service import OrganizationService
+from app.services.batch_service import BatchService
+from app.services.api_key_service import ApiKeyService
 
 
 async def get_building_service() -> BuildingService:
@@ -18,3 +20,11 @@ async def get_activity_service() -> ActivityService:
 
 async def get_organization_service() -> OrganizationService:
     return OrganizationService()
+
+
+async def get_batch_service() -> BatchService:
+    return BatchService()
+
+
+async def get_api_key_service() -> ApiKeyService:
+    return ApiKeyService()
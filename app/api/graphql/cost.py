@@ -0,0 +1,99 @@
+from typing import Optional, Set, Type
+
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionSetNode,
+    ValidationRule,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+)
+
+
+def create_query_cost_rule(
+    max_cost: int, default_list_size: int, max_list_size: int
+) -> Type[ValidationRule]:
+    class QueryCostRule(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_):
+            if node.operation != OperationType.QUERY:
+                return
+            cost = self._selection_set_cost(
+                node.selection_set, self.context.schema.query_type, set()
+            )
+            if cost > max_cost:
+                self.report_error(
+                    GraphQLError(
+                        f"Запрос слишком дорогой: стоимость {cost}, максимум {max_cost}",
+                        node,
+                    )
+                )
+
+        def _selection_set_cost(
+            self,
+            selection_set: Optional[SelectionSetNode],
+            parent_type: Optional[GraphQLObjectType],
+            fragments: Set[str],
+        ) -> int:
+            if selection_set is None or parent_type is None:
+                return 0
+
+            total = 0
+            for selection in selection_set.selections:
+                if isinstance(selection, FieldNode):
+                    total += self._field_cost(selection, parent_type, fragments)
+                elif isinstance(selection, InlineFragmentNode):
+                    fragment_type = parent_type
+                    if selection.type_condition is not None:
+                        fragment_type = self.context.schema.get_type(
+                            selection.type_condition.name.value
+                        )
+                    total += self._selection_set_cost(
+                        selection.selection_set, fragment_type, fragments
+                    )
+                elif isinstance(selection, FragmentSpreadNode):
+                    name = selection.name.value
+                    fragment = self.context.get_fragment(name)
+                    if fragment is None or name in fragments:
+                        continue
+                    total += self._selection_set_cost(
+                        fragment.selection_set,
+                        self.context.schema.get_type(fragment.type_condition.name.value),
+                        fragments | {name},
+                    )
+            return total
+
+        def _field_cost(
+            self, node: FieldNode, parent_type: GraphQLObjectType, fragments: Set[str]
+        ) -> int:
+            field = getattr(parent_type, "fields", {}).get(node.name.value)
+            if field is None or node.selection_set is None:
+                return 0
+
+            child_cost = self._selection_set_cost(
+                node.selection_set, get_named_type(field.type), fragments
+            )
+            if not is_list_type(get_nullable_type(field.type)):
+                return 1 + child_cost
+            return self._list_size(node, field) * (1 + child_cost)
+
+        def _list_size(self, node: FieldNode, field) -> int:
+            for argument in node.arguments or ():
+                if argument.name.value != "limit":
+                    continue
+                if isinstance(argument.value, IntValueNode):
+                    return min(int(argument.value.value), max_list_size)
+                return max_list_size
+
+            limit = field.args.get("limit")
+            if limit is not None and isinstance(limit.default_value, int):
+                return min(limit.default_value, max_list_size)
+            return default_list_size
+
+    return QueryCostRule
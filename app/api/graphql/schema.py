@@ -0,0 +1,241 @@
+import asyncio
+from collections import defaultdict
+from typing import List, Optional
+
+import strawberry
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.dataloader import DataLoader
+from strawberry.extensions import AddValidationRules, QueryDepthLimiter
+from strawberry.fastapi import BaseContext, GraphQLRouter
+from strawberry.types import Info
+
+from app.api.graphql.cost import create_query_cost_rule
+from app.core.config import settings
+from app.core.security import get_api_key
+from app.db.base import get_read_session
+from app.db.loaders import get_loaders
+from app.services.activity_service import ActivityService
+from app.services.building_service import BuildingService
+from app.services.organization_service import OrganizationService
+
+
+class GraphQLContext(BaseContext):
+    def __init__(self, db: AsyncSession):
+        super().__init__()
+        self.db = db
+        self.lock = asyncio.Lock()
+        self.organization_service = OrganizationService()
+        self.building_service = BuildingService()
+        self.activity_service = ActivityService()
+
+        loaders = get_loaders(db)
+        self.buildings = self._loader(loaders.buildings.load_many)
+        self.activities = self._loader(loaders.activities.load_many)
+        self.phone_numbers = self._loader(loaders.phone_numbers.load_many)
+        self.organization_activities = self._loader(
+            loaders.organization_activities.load_many
+        )
+        self.organizations_by_building = DataLoader(self._load_organizations_by_building)
+        self.activity_children = DataLoader(self._load_activity_children)
+        self.organization_counts = DataLoader(self._load_organization_counts)
+
+    def _loader(self, load_many) -> DataLoader:
+        async def load(keys):
+            async with self.lock:
+                values = await load_many(keys)
+            return [values.get(key) for key in keys]
+
+        return DataLoader(load)
+
+    async def _load_organizations_by_building(self, building_ids):
+        async with self.lock:
+            organizations = await self.organization_service.get_by_buildings(
+                self.db, building_ids=list(building_ids)
+            )
+        grouped = defaultdict(list)
+        for organization in organizations:
+            grouped[organization.building_id].append(organization)
+        return [grouped[building_id] for building_id in building_ids]
+
+    async def _load_activity_children(self, parent_ids):
+        async with self.lock:
+            children = await self.activity_service.get_children(
+                self.db, parent_ids=list(parent_ids)
+            )
+        grouped = defaultdict(list)
+        for child in children:
+            grouped[child.parent_id].append(child)
+        return [grouped[parent_id] for parent_id in parent_ids]
+
+    async def _load_organization_counts(self, activity_ids):
+        async with self.lock:
+            counts = await self.organization_service.count_by_activities(
+                self.db, activity_ids=list(activity_ids)
+            )
+        return [counts.get(activity_id, 0) for activity_id in activity_ids]
+
+
+def _limit(limit: int) -> int:
+    return max(0, min(limit, settings.GRAPHQL_MAX_LIST_SIZE))
+
+
+@strawberry.type
+class PhoneNumber:
+    id: int
+    number: str
+
+
+@strawberry.type
+class Activity:
+    id: int
+    name: str
+    parent_id: Optional[int]
+
+    @strawberry.field
+    async def parent(self, info: Info) -> Optional["Activity"]:
+        if self.parent_id is None:
+            return None
+        return await info.context.activities.load(self.parent_id)
+
+    @strawberry.field
+    async def children(self, info: Info) -> List["Activity"]:
+        return await info.context.activity_children.load(self.id)
+
+    @strawberry.field
+    async def organization_count(self, info: Info) -> int:
+        return await info.context.organization_counts.load(self.id)
+
+
+@strawberry.type
+class Organization:
+    id: int
+    name: str
+    building_id: Optional[int]
+
+    @strawberry.field
+    async def building(self, info: Info) -> Optional["Building"]:
+        if self.building_id is None:
+            return None
+        return await info.context.buildings.load(self.building_id)
+
+    @strawberry.field
+    async def phone_numbers(self, info: Info) -> List[PhoneNumber]:
+        return await info.context.phone_numbers.load(self.id) or []
+
+    @strawberry.field
+    async def activities(self, info: Info) -> List[Activity]:
+        return await info.context.organization_activities.load(self.id) or []
+
+
+@strawberry.type
+class Building:
+    id: int
+    name: str
+    address: str
+    latitude: float
+    longitude: float
+
+    @strawberry.field
+    async def organizations(
+        self, info: Info, skip: int = 0, limit: int = 100
+    ) -> List[Organization]:
+        organizations = await info.context.organizations_by_building.load(self.id)
+        skip = max(skip, 0)
+        return organizations[skip:skip + _limit(limit)]
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def organization(self, info: Info, id: int) -> Optional[Organization]:
+        context = info.context
+        async with context.lock:
+            return await context.organization_service.get(context.db, organization_id=id)
+
+    @strawberry.field
+    async def organizations(
+        self, info: Info, skip: int = 0, limit: int = 100
+    ) -> List[Organization]:
+        context = info.context
+        async with context.lock:
+            return await context.organization_service.get_all(
+                context.db, skip=skip, limit=_limit(limit)
+            )
+
+    @strawberry.field
+    async def organizations_by_activity(
+        self,
+        info: Info,
+        activity_id: int,
+        include_children: bool = True,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Organization]:
+        context = info.context
+        async with context.lock:
+            return await context.organization_service.get_by_activity(
+                context.db,
+                activity_id=activity_id,
+                include_children=include_children,
+                skip=max(skip, 0),
+                limit=_limit(limit),
+            )
+
+    @strawberry.field
+    async def search_organizations(
+        self, info: Info, name: str, skip: int = 0, limit: int = 100
+    ) -> List[Organization]:
+        context = info.context
+        async with context.lock:
+            return await context.organization_service.search_by_name(
+                context.db, name=name, skip=max(skip, 0), limit=_limit(limit)
+            )
+
+    @strawberry.field
+    async def building(self, info: Info, id: int) -> Optional[Building]:
+        return await info.context.buildings.load(id)
+
+    @strawberry.field
+    async def buildings(
+        self, info: Info, skip: int = 0, limit: int = 100
+    ) -> List[Building]:
+        context = info.context
+        async with context.lock:
+            return await context.building_service.get_all(
+                context.db, skip=skip, limit=_limit(limit)
+            )
+
+    @strawberry.field
+    async def activity(self, info: Info, id: int) -> Optional[Activity]:
+        return await info.context.activities.load(id)
+
+    @strawberry.field
+    async def activity_tree(self, info: Info) -> List[Activity]:
+        return await info.context.activity_children.load(None)
+
+
+async def get_context(
+    db: AsyncSession = Depends(get_read_session, scope="function"),
+    api_key: str = Depends(get_api_key),
+) -> GraphQLContext:
+    return GraphQLContext(db)
+
+
+schema = strawberry.Schema(
+    query=Query,
+    extensions=[
+        QueryDepthLimiter(max_depth=settings.GRAPHQL_MAX_DEPTH),
+        AddValidationRules(
+            [
+                create_query_cost_rule(
+                    max_cost=settings.GRAPHQL_MAX_COST,
+                    default_list_size=settings.GRAPHQL_DEFAULT_LIST_SIZE,
+                    max_list_size=settings.GRAPHQL_MAX_LIST_SIZE,
+                )
+            ]
+        ),
+    ],
+)
+
+router = GraphQLRouter(schema, context_getter=get_context)
@@ -0,0 +1,421 @@
+import functools
+import inspect
+import logging
+import time
+from http.cookies import SimpleCookie
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+
+from app.core.api_keys import api_key_cache
+from app.core.cache_status import CacheStatus, current_cache_status
+from app.core.compression import ENCODINGS, StreamCompressor, compress, is_compressible, negotiate
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.base import LAST_WRITE_COOKIE, LAST_WRITE_HEADER, LastWrite, current_last_write
+from app.db.instrumentation import RequestDBStats, current_db_stats, route_label
+
+logger = logging.getLogger(__name__)
+
+
+http_requests_total = registry.counter(
+    "http_requests_total",
+    "Количество HTTP-запросов",
+    ["method", "route", "status"],
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route"],
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "Количество HTTP-запросов в обработке",
+).labels()
+http_serialization_duration = registry.histogram(
+    "http_response_serialization_seconds",
+    "Время сериализации ответа",
+    ["method", "route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+)
+db_queries_per_request = registry.histogram(
+    "http_request_db_queries",
+    "Количество SQL-запросов на один HTTP-запрос",
+    ["method", "route"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 200, 500),
+)
+db_time_per_request = registry.histogram(
+    "http_request_db_seconds",
+    "Суммарное время SQL-запросов на один HTTP-запрос",
+    ["method", "route"],
+)
+db_rows_total = registry.counter(
+    "http_request_db_rows_total",
+    "Количество строк, полученных из базы",
+    ["method", "route"],
+)
+http_compression_bytes = registry.counter(
+    "http_compression_bytes_total",
+    "Размер ответов до и после сжатия",
+    ["encoding", "stage"],
+)
+http_compression_seconds = registry.counter(
+    "http_compression_seconds_total",
+    "Время, затраченное на сжатие ответов",
+    ["encoding"],
+)
+
+
+def _mark_on_return(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            stats = current_db_stats.get()
+            if stats is not None:
+                stats.mark()
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        if inspect.iscoroutinefunction(endpoint) and not getattr(
+            endpoint, "instrumented", False
+        ):
+            endpoint = _mark_on_return(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class _RouteMetrics:
+    __slots__ = (
+        "method",
+        "route",
+        "duration",
+        "serialization",
+        "db_queries",
+        "db_time",
+        "db_rows",
+        "responses",
+    )
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.duration = http_request_duration.labels(method, route)
+        self.serialization = http_serialization_duration.labels(method, route)
+        self.db_queries = db_queries_per_request.labels(method, route)
+        self.db_time = db_time_per_request.labels(method, route)
+        self.db_rows = db_rows_total.labels(method, route)
+        self.responses: Dict[int, Any] = {}
+
+    def response(self, status: int):
+        child = self.responses.get(status)
+        if child is None:
+            child = self.responses[status] = http_requests_total.labels(
+                self.method, self.route, str(status)
+            )
+        return child
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict[str, Dict[Any, _RouteMetrics]] = {}
+
+    def _route_metrics(self, scope) -> _RouteMetrics:
+        method = scope["method"]
+        by_endpoint = self._routes.get(method)
+        if by_endpoint is None:
+            by_endpoint = self._routes[method] = {}
+
+        endpoint = scope.get("endpoint")
+        metrics = by_endpoint.get(endpoint)
+        if metrics is None:
+            metrics = by_endpoint[endpoint] = _RouteMetrics(method, route_label(scope))
+        return metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        stats = RequestDBStats(scope)
+        token = current_db_stats.set(stats)
+        status = 500
+        http_requests_in_flight.inc()
+
+        async def send_with_stats(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if stats.marked_at:
+                    serialization = (
+                        time.perf_counter()
+                        - stats.marked_at
+                        - (stats.duration - stats.marked_duration)
+                    )
+                    self._route_metrics(scope).serialization.observe(serialization)
+                if settings.SERVER_TIMING_ENABLED:
+                    value = (
+                        f'db;dur={stats.duration * 1000:.2f};'
+                        f'desc="{stats.queries} queries, {stats.rows} rows"'
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", value.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            http_requests_in_flight.dec()
+            current_db_stats.reset(token)
+            self._record(scope, stats, status, time.perf_counter() - started_at)
+
+    def _record(self, scope, stats: RequestDBStats, status: int, duration: float) -> None:
+        metrics = self._route_metrics(scope)
+        metrics.response(status).inc()
+        metrics.duration.observe(duration)
+        metrics.db_queries.observe(stats.queries)
+        metrics.db_time.observe(stats.duration)
+        metrics.db_rows.inc(stats.rows)
+
+        threshold = settings.QUERY_COUNT_LOG_THRESHOLD
+        if threshold and stats.queries > threshold:
+            logger.warning(
+                f"{metrics.method} {metrics.route}: {stats.queries} SQL-запросов "
+                f"({stats.duration * 1000:.1f} мс, {stats.rows} строк) "
+                f"превышает порог {threshold}"
+            )
+
+
+class CacheStatusMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = CacheStatus()
+        token = current_cache_status.set(status)
+
+        async def send_with_cache_status(message):
+            if message["type"] == "http.response.start" and status.entries:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"cache-status", status.header().encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cache_status)
+        finally:
+            current_cache_status.reset(token)
+
+
+def _last_write_cookie(value: str) -> str:
+    cookie = SimpleCookie()
+    cookie[LAST_WRITE_COOKIE] = value
+    cookie[LAST_WRITE_COOKIE]["max-age"] = max(int(settings.READ_YOUR_WRITES_SECONDS), 1)
+    cookie[LAST_WRITE_COOKIE]["path"] = "/"
+    cookie[LAST_WRITE_COOKIE]["httponly"] = True
+    cookie[LAST_WRITE_COOKIE]["samesite"] = "lax"
+    return cookie.output(header="").strip()
+
+
+class LastWriteMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        last_write = LastWrite()
+        token = current_last_write.set(last_write)
+
+        async def send_with_last_write(message):
+            if message["type"] == "http.response.start" and last_write.committed_at is not None:
+                value = f"{last_write.committed_at:.3f}"
+                message["headers"] = list(message.get("headers", [])) + [
+                    (LAST_WRITE_HEADER.lower().encode("latin-1"), value.encode("latin-1")),
+                    (b"set-cookie", _last_write_cookie(value).encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_last_write)
+        finally:
+            current_last_write.reset(token)
+
+
+class ProfilingMiddleware:
+    header = b"x-profile"
+
+    def __init__(self, app, sampler):
+        self.app = app
+        self.sampler = sampler
+
+    async def _requested(self, scope) -> bool:
+        requested = False
+        api_key = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                requested = value not in (b"", b"0", b"false")
+            elif name == b"x-api-key":
+                api_key = value.decode("latin-1")
+        if not requested:
+            return False
+        info = await api_key_cache.lookup(api_key)
+        return info is not None and info.is_admin
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.sampler.begin()
+
+        async def send_with_samples(message):
+            if message["type"] == "http.response.start" and profile is not None:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-samples", str(self.sampler.sample_count(profile)).encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_samples)
+        finally:
+            self.sampler.end(f"{scope['method']} {route_label(scope)}")
+
+
+class _CompressionMetrics:
+    __slots__ = ("bytes_in", "bytes_out", "seconds")
+
+    def __init__(self, encoding: str):
+        self.bytes_in = http_compression_bytes.labels(encoding, "in")
+        self.bytes_out = http_compression_bytes.labels(encoding, "out")
+        self.seconds = http_compression_seconds.labels(encoding)
+
+    def record(self, size_in: int, size_out: int, started_at: float) -> None:
+        self.seconds.inc(time.perf_counter() - started_at)
+        self.bytes_in.inc(size_in)
+        self.bytes_out.inc(size_out)
+
+
+class _CompressingSend:
+    __slots__ = ("send", "encoding", "minimum_size", "metrics", "start", "compressor", "passthrough")
+
+    def __init__(self, send, encoding: str, minimum_size: int, metrics: _CompressionMetrics):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.metrics = metrics
+        self.start = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start = message
+            return
+        if message_type != "http.response.body":
+            await self._flush_start()
+            self.passthrough = True
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            started_at = time.perf_counter()
+            data = self.compressor.chunk(body) if more_body else self.compressor.finish(body)
+            self.metrics.record(len(body), len(data), started_at)
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self.start["headers"] = list(self.start.get("headers", []))
+        headers = MutableHeaders(raw=self.start["headers"])
+        if (
+            "content-encoding" in headers
+            or self.start["status"] in (204, 304)
+            or not is_compressible(headers.get("content-type"))
+        ):
+            await self._pass(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body:
+            if len(body) < self.minimum_size:
+                await self._pass(message)
+                return
+            started_at = time.perf_counter()
+            data = compress(self.encoding, body)
+            self.metrics.record(len(body), len(data), started_at)
+            if len(data) >= len(body):
+                await self._pass(message)
+                return
+            headers["content-encoding"] = self.encoding
+            headers["content-length"] = str(len(data))
+            await self._flush_start()
+            await self.send({"type": "http.response.body", "body": data})
+            return
+
+        self.compressor = StreamCompressor(self.encoding)
+        headers["content-encoding"] = self.encoding
+        if "content-length" in headers:
+            del headers["content-length"]
+        await self._flush_start()
+        started_at = time.perf_counter()
+        data = self.compressor.chunk(body)
+        self.metrics.record(len(body), len(data), started_at)
+        await self.send({"type": "http.response.body", "body": data, "more_body": True})
+
+    async def _flush_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
+
+    async def _pass(self, message) -> None:
+        self.passthrough = True
+        await self._flush_start()
+        await self.send(message)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self._metrics = {encoding: _CompressionMetrics(encoding) for encoding in ENCODINGS}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = negotiate(value.decode("latin-1"))
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(
+            scope,
+            receive,
+            _CompressingSend(send, encoding, self.minimum_size, self._metrics[encoding]),
+        )
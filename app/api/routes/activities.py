@@ -1,21 +1,32 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import get_async_session
 from app.core.security import get_api_key
+from app.api.middleware import InstrumentedRoute
 from app.api.dependencies import get_activity_service
+from app.core.response_cache import response_cache
 from app.services.activity_service import ActivityService
-from app.domain.models.activity import Activity, ActivityCreate, ActivityUpdate, ActivityWithChildren
+from app.domain.models.activity import (
+    Activity,
+    ActivityCreate,
+    ActivityUpdate,
+    ActivityWithChildren,
+    ActivityTree,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+
+_activity_tree_adapter = TypeAdapter(ActivityTree)
 
 
 @router.get("/", response_model=List[Activity])
 async def read_activities(
     skip: int = 0, 
     limit: int = 100, 
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     activity_service: ActivityService = Depends(get_activity_service),
     api_key: str = Depends(get_api_key)
 ):
@@ -27,7 +38,7 @@ async def read_activities(
 @router.post("/", response_model=Activity)
 async def create_activity(
     activity: ActivityCreate, 
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     activity_service: ActivityService = Depends(get_activity_service),
     api_key: str = Depends(get_api_key)
 ):
@@ -38,10 +49,26 @@ async def create_activity(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/tree", response_model=ActivityTree)
+async def read_activity_tree(
+    request: Request,
+    db: AsyncSession = Depends(get_async_session, scope="function"),
+    activity_service: ActivityService = Depends(get_activity_service),
+    api_key: str = Depends(get_api_key)
+):
+    
+    async def build():
+        return {"activities": await activity_service.get_activity_tree(db)}
+
+    return await response_cache.respond(
+        request, db, ("activities.tree",), _activity_tree_adapter, build
+    )
+
+
 @router.get("/{activity_id}", response_model=Activity)
 async def read_activity(
     activity_id: int, 
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     activity_service: ActivityService = Depends(get_activity_service),
     api_key: str = Depends(get_api_key)
 ):
@@ -56,7 +83,7 @@ async def read_activity(
 async def update_activity(
     activity_id: int, 
     activity: ActivityUpdate, 
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     activity_service: ActivityService = Depends(get_activity_service),
     api_key: str = Depends(get_api_key)
 ):
@@ -73,7 +100,7 @@ async def update_activity(
 @router.delete("/{activity_id}")
 async def delete_activity(
     activity_id: int, 
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     activity_service: ActivityService = Depends(get_activity_service),
     api_key: str = Depends(get_api_key)
 ):
@@ -0,0 +1,154 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_api_key_service
+from app.api.middleware import InstrumentedRoute
+from app.core.config import settings
+from app.core.security import get_admin_api_key
+from app.db.base import engine, get_async_session
+from app.domain.models.api_key import ApiKey, ApiKeyCreate, ApiKeyCreated
+from app.services.api_key_service import ApiKeyService
+from app.db.query_stats import query_cache_stats
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.get("/query-cache")
+async def read_query_cache_stats(api_key: str = Depends(get_admin_api_key)):
+    
+    return {
+        "compiled_cache": query_cache_stats.snapshot(),
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "pool": engine.pool.status(),
+    }
+
+
+@router.get("/slow-queries")
+async def read_slow_queries(
+    limit: Optional[int] = Query(None, ge=1),
+    api_key: str = Depends(get_admin_api_key),
+):
+    
+    from app.db.slow_queries import slow_query_log
+
+    return {
+        "enabled": settings.SLOW_QUERY_LOG_ENABLED,
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "explain_sample_rate": settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        "queries": slow_query_log.snapshot(limit),
+    }
+
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(api_key: str = Depends(get_admin_api_key)):
+    
+    from app.db.slow_queries import slow_query_log
+
+    slow_query_log.clear()
+    return {"status": "ok"}
+
+
+def _render_profile(profile, format: str):
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    return profile.speedscope()
+
+
+@router.get("/profile")
+async def read_process_profile(
+    seconds: float = Query(5, gt=0),
+    interval_ms: float = Query(settings.PROFILER_INTERVAL_MS, ge=1, le=1000),
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+    api_key: str = Depends(get_admin_api_key),
+):
+    
+    from app.core.profiler import profile_process
+
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Длительность профилирования не может превышать {settings.PROFILER_MAX_SECONDS} с",
+        )
+
+    profile = await profile_process(seconds, interval_ms / 1000)
+    return _render_profile(profile, format)
+
+
+@router.get("/profile/routes")
+async def read_route_profiles(
+    route: Optional[str] = None,
+    format: str = Query("summary", pattern="^(summary|speedscope|collapsed)$"),
+    api_key: str = Depends(get_admin_api_key),
+):
+    
+    from app.core.profiler import route_sampler
+
+    if format == "summary":
+        return {
+            "enabled": settings.PROFILING_ENABLED,
+            "interval_ms": settings.PROFILER_INTERVAL_MS,
+            "routes": {
+                name: {
+                    "requests": route_sampler.requests[name],
+                    "samples": sum(profile.samples.values()),
+                    "cpu_ms": round(
+                        sum(profile.samples.values()) * route_sampler.interval * 1000, 1
+                    ),
+                }
+                for name, profile in route_sampler.profiles.items()
+            },
+        }
+
+    if route is not None and route not in route_sampler.profiles:
+        raise HTTPException(status_code=404, detail="Профиль маршрута не найден")
+    return _render_profile(route_sampler.merged(route), format)
+
+
+@router.delete("/profile/routes")
+async def clear_route_profiles(api_key: str = Depends(get_admin_api_key)):
+    
+    from app.core.profiler import route_sampler
+
+    route_sampler.reset()
+    return {"status": "ok"}
+
+
+@router.get("/api-keys", response_model=List[ApiKey])
+async def read_api_keys(
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_session, scope="function"),
+    api_key_service: ApiKeyService = Depends(get_api_key_service),
+    api_key: str = Depends(get_admin_api_key),
+):
+    
+    return await api_key_service.get_all(db, skip=skip, limit=limit)
+
+
+@router.post("/api-keys", response_model=ApiKeyCreated)
+async def create_api_key(
+    api_key_in: ApiKeyCreate,
+    db: AsyncSession = Depends(get_async_session, scope="function"),
+    api_key_service: ApiKeyService = Depends(get_api_key_service),
+    api_key: str = Depends(get_admin_api_key),
+):
+    
+    return await api_key_service.create(db, api_key_in)
+
+
+@router.delete("/api-keys/{api_key_id}", response_model=ApiKey)
+async def deactivate_api_key(
+    api_key_id: int,
+    db: AsyncSession = Depends(get_async_session, scope="function"),
+    api_key_service: ApiKeyService = Depends(get_api_key_service),
+    api_key: str = Depends(get_admin_api_key),
+):
+    
+    db_api_key = await api_key_service.deactivate(db, api_key_id)
+    if db_api_key is None:
+        raise HTTPException(status_code=404, detail="API ключ не найден")
+    return db_api_key
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import get_async_session
+from app.core.config import settings
+from app.core.security import RateLimit, get_api_key
+from app.api.middleware import InstrumentedRoute
+from app.api.dependencies import get_batch_service
+from app.services.batch_service import BatchService
+from app.domain.models.batch import BatchRequest, BatchResponse
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.post("/", response_model=BatchResponse, dependencies=[Depends(RateLimit(cost=10))])
+async def execute_batch(
+    batch: BatchRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_async_session, scope="function"),
+    batch_service: BatchService = Depends(get_batch_service),
+    api_key: str = Depends(get_api_key),
+):
+    
+    if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Превышено максимальное количество операций ({settings.BATCH_MAX_OPERATIONS})",
+        )
+
+    result = await batch_service.execute(db, operations=batch.operations)
+    if not result.committed:
+        response.status_code = 400
+    return result
@@ -1,22 +1,27 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import get_async_session
 from app.core.security import get_api_key
+from app.api.middleware import InstrumentedRoute
 from app.api.dependencies import get_building_service
+from app.core.response_cache import response_cache
 from app.services.building_service import BuildingService
 from app.domain.models.building import Building, BuildingCreate, BuildingUpdate
 from app.domain.models.relations import BuildingWithOrganizations
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+
+_building_with_organizations_adapter = TypeAdapter(BuildingWithOrganizations)
 
 
 @router.get("/", response_model=List[Building])
 async def read_buildings(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     building_service: BuildingService = Depends(get_building_service),
     api_key: str = Depends(get_api_key),
 ):
@@ -28,7 +33,7 @@ async def read_buildings(
 @router.post("/", response_model=Building)
 async def create_building(
     building: BuildingCreate,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     building_service: BuildingService = Depends(get_building_service),
     api_key: str = Depends(get_api_key),
 ):
@@ -39,24 +44,34 @@ async def create_building(
 @router.get("/{building_id}", response_model=BuildingWithOrganizations)
 async def read_building(
     building_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    request: Request,
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     building_service: BuildingService = Depends(get_building_service),
     api_key: str = Depends(get_api_key),
 ):
     
-    db_building = await building_service.get_with_organizations(
-        db, building_id=building_id
+    async def build():
+        db_building = await building_service.get_with_organizations(
+            db, building_id=building_id
+        )
+        if db_building is None:
+            raise HTTPException(status_code=404, detail="Здание не найдено")
+        return db_building
+
+    return await response_cache.respond(
+        request,
+        db,
+        ("buildings.detail", building_id),
+        _building_with_organizations_adapter,
+        build,
     )
-    if db_building is None:
-        raise HTTPException(status_code=404, detail="Здание не найдено")
-    return db_building
 
 
 @router.put("/{building_id}", response_model=Building)
 async def update_building(
     building_id: int,
     building: BuildingUpdate,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     building_service: BuildingService = Depends(get_building_service),
     api_key: str = Depends(get_api_key),
 ):
@@ -72,7 +87,7 @@ async def update_building(
 @router.delete("/{building_id}")
 async def delete_building(
     building_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     building_service: BuildingService = Depends(get_building_service),
     api_key: str = Depends(get_api_key),
 ):
@@ -1,31 +1,51 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_async_session
-from app.core.security import get_api_key
+from app.db.base import get_async_session, get_read_session
+from app.core.security import RateLimit, get_api_key
+from app.api.middleware import InstrumentedRoute
 from app.api.dependencies import get_organization_service
+from app.core.config import settings
+from app.core.phones import digits_only
+from app.core.response_cache import response_cache
 from app.services.organization_service import OrganizationService
 from app.domain.models.organization import (
     Organization,
     OrganizationCreate,
     OrganizationUpdate,
+    OrganizationPatch,
     OrganizationWithActivities,
 )
+from app.domain.models.geo import PointsSearch, PolygonSearch, RouteSearch
 from app.domain.models.relations import OrganizationFull
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+_organization_full_adapter = TypeAdapter(OrganizationFull)
+_organization_adapter = TypeAdapter(Organization)
 
 
 @router.get("/", response_model=List[Organization])
 async def read_organizations(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     organization_service: OrganizationService = Depends(get_organization_service),
     api_key: str = Depends(get_api_key),
 ):
     
+    if settings.ORGANIZATION_DOCUMENTS_ENABLED:
+        content = await organization_service.get_all_json(db, skip=skip, limit=limit)
+        if content is not None:
+            return Response(content, media_type="application/json")
+        logger.warning("Документы организаций неполные, список собран из таблиц")
     organizations = await organization_service.get_all(db, skip=skip, limit=limit)
     return organizations
 
@@ -33,7 +53,7 @@ async def read_organizations(
 @router.post("/", response_model=Organization)
 async def create_organization(
     organization: OrganizationCreate,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     organization_service: OrganizationService = Depends(get_organization_service),
     api_key: str = Depends(get_api_key),
 ):
@@ -43,14 +63,16 @@ async def create_organization(
     return OrganizationSchema.model_validate(db_organization)
 
 
-@router.get("/search", response_model=List[Organization])
+@router.get(
+    "/search", response_model=List[Organization], dependencies=[Depends(RateLimit(cost=2))]
+)
 async def search_organizations(
     name: Optional[str] = None,
     building_id: Optional[int] = None,
     activity_id: Optional[int] = None,
     activity_name: Optional[str] = None,
     include_child_activities: bool = True,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     organization_service: OrganizationService = Depends(get_organization_service),
     api_key: str = Depends(get_api_key),
 ):
@@ -71,7 +93,11 @@ async def search_organizations(
         return await organization_service.get_all(db, skip=0, limit=100)
 
 
-@router.get("/by-location", response_model=List[Organization])
+@router.get(
+    "/by-location",
+    response_model=List[Organization],
+    dependencies=[Depends(RateLimit(cost=5))],
+)
 async def get_organizations_by_location(
     latitude: float,
     longitude: float,
@@ -80,7 +106,7 @@ async def get_organizations_by_location(
     min_lon: Optional[float] = None,
     max_lat: Optional[float] = None,
     max_lon: Optional[float] = None,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     organization_service: OrganizationService = Depends(get_organization_service),
     api_key: str = Depends(get_api_key),
 ):
@@ -100,27 +126,231 @@ async def get_organizations_by_location(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get(
+    "/by-phone",
+    response_model=List[Organization],
+    dependencies=[Depends(RateLimit(cost=2))],
+)
+async def get_organizations_by_phone(
+    number: str = Query(..., min_length=1, max_length=64),
+    match: Literal["exact", "suffix"] = "exact",
+    db: AsyncSession = Depends(get_async_session, scope="function"),
+    organization_service: OrganizationService = Depends(get_organization_service),
+    api_key: str = Depends(get_api_key),
+):
+    
+    if match == "suffix" and len(digits_only(number)) < settings.PHONE_SUFFIX_MIN_DIGITS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Для поиска по окончанию номера нужно не менее {settings.PHONE_SUFFIX_MIN_DIGITS} цифр",
+        )
+    try:
+        return await organization_service.get_by_phone(
+            db, number=number, suffix=match == "suffix"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get(
+    "/nearby",
+    response_model=List[Organization],
+    dependencies=[Depends(RateLimit(cost=2))],
+)
+async def get_organizations_nearby(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius: float = Query(..., gt=0),
+    activity_id: int = Query(...),
+    include_child_activities: bool = True,
+    limit: int = Query(100, gt=0),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
+    organization_service: OrganizationService = Depends(get_organization_service),
+    api_key: str = Depends(get_api_key),
+):
+    
+    if radius > settings.GEO_BATCH_MAX_RADIUS_METERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Радиус не должен превышать {settings.GEO_BATCH_MAX_RADIUS_METERS:g} м",
+        )
+    _check_limit(limit, settings.GEO_MAX_RESULTS)
+    return await organization_service.get_nearby(
+        db,
+        latitude=latitude,
+        longitude=longitude,
+        radius=radius,
+        activity_id=activity_id,
+        include_children=include_child_activities,
+        limit=limit,
+    )
+
+
+def _check_vertices(count: int) -> None:
+    if count > settings.GEO_MAX_VERTICES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Превышено максимальное количество точек ({settings.GEO_MAX_VERTICES})",
+        )
+
+
+def _check_limit(limit: int, maximum: int) -> None:
+    if limit > maximum:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Превышено максимальное количество результатов ({maximum})",
+        )
+
+
+@router.post(
+    "/by-polygon",
+    response_model=List[Organization],
+    dependencies=[Depends(RateLimit(cost=5))],
+)
+async def get_organizations_by_polygon(
+    search: PolygonSearch,
+    db: AsyncSession = Depends(get_read_session, scope="function"),
+    organization_service: OrganizationService = Depends(get_organization_service),
+    api_key: str = Depends(get_api_key),
+):
+    
+    _check_vertices(len(search.points))
+    _check_limit(search.limit, settings.GEO_MAX_RESULTS)
+    try:
+        return await organization_service.get_by_polygon(
+            db, points=search.coordinates(), limit=search.limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/by-route",
+    response_model=List[Organization],
+    dependencies=[Depends(RateLimit(cost=5))],
+)
+async def get_organizations_by_route(
+    search: RouteSearch,
+    db: AsyncSession = Depends(get_read_session, scope="function"),
+    organization_service: OrganizationService = Depends(get_organization_service),
+    api_key: str = Depends(get_api_key),
+):
+    
+    _check_vertices(len(search.points))
+    if search.distance > settings.GEO_MAX_ROUTE_DISTANCE_METERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Расстояние от маршрута не должно превышать {settings.GEO_MAX_ROUTE_DISTANCE_METERS:g} м",
+        )
+    _check_limit(search.limit, settings.GEO_MAX_RESULTS)
+    try:
+        return await organization_service.get_by_route(
+            db, points=search.coordinates(), distance=search.distance, limit=search.limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _stream_point_results(
+    points: List, chunks: AsyncIterator[List[List]]
+) -> AsyncIterator[bytes]:
+    index = 0
+    async for results in chunks:
+        encoded: Dict[int, bytes] = {}
+        lines: List[bytes] = []
+        for organizations in results:
+            for organization in organizations:
+                if organization.id not in encoded:
+                    encoded[organization.id] = _organization_adapter.dump_json(
+                        _organization_adapter.validate_python(
+                            organization, from_attributes=True
+                        )
+                    )
+            point = points[index]
+            lines.append(
+                b'{"index":%d,"latitude":%s,"longitude":%s,"organizations":[%s]}\n'
+                % (
+                    index,
+                    json.dumps(point.latitude).encode(),
+                    json.dumps(point.longitude).encode(),
+                    b",".join(encoded[organization.id] for organization in organizations),
+                )
+            )
+            index += 1
+        yield b"".join(lines)
+
+
+@router.post("/by-points", dependencies=[Depends(RateLimit(cost=10))])
+async def get_organizations_by_points(
+    search: PointsSearch,
+    db: AsyncSession = Depends(get_read_session, scope="request"),
+    organization_service: OrganizationService = Depends(get_organization_service),
+    api_key: str = Depends(get_api_key),
+):
+    
+    if len(search.points) > settings.GEO_BATCH_MAX_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Превышено максимальное количество точек ({settings.GEO_BATCH_MAX_POINTS})",
+        )
+    if search.radius > settings.GEO_BATCH_MAX_RADIUS_METERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Радиус не должен превышать {settings.GEO_BATCH_MAX_RADIUS_METERS:g} м",
+        )
+    _check_limit(search.limit, settings.GEO_BATCH_MAX_RESULTS_PER_POINT)
+    chunks = organization_service.iter_by_points(
+        db,
+        points=search.coordinates(),
+        radius=search.radius,
+        activity_id=search.activity_id,
+        include_children=search.include_child_activities,
+        limit=search.limit,
+        chunk_size=settings.GEO_BATCH_CHUNK_POINTS,
+    )
+    return StreamingResponse(
+        _stream_point_results(search.points, chunks),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get("/{organization_id}", response_model=OrganizationFull)
 async def read_organization(
     organization_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    request: Request,
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     organization_service: OrganizationService = Depends(get_organization_service),
     api_key: str = Depends(get_api_key),
 ):
     
-    db_organization = await organization_service.get_with_details(
-        db, organization_id=organization_id
+    async def build():
+        if settings.ORGANIZATION_DOCUMENTS_ENABLED:
+            document = await organization_service.get_json(
+                db, organization_id=organization_id
+            )
+            if document is not None:
+                return document
+        db_organization = await organization_service.get_with_details(
+            db, organization_id=organization_id
+        )
+        if db_organization is None:
+            raise HTTPException(status_code=404, detail="Организация не найдена")
+        return db_organization
+
+    return await response_cache.respond(
+        request,
+        db,
+        ("organizations.detail", organization_id),
+        _organization_full_adapter,
+        build,
     )
-    if db_organization is None:
-        raise HTTPException(status_code=404, detail="Организация не найдена")
-    return db_organization
 
 
 @router.put("/{organization_id}", response_model=Organization)
 async def update_organization(
     organization_id: int,
     organization: OrganizationUpdate,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     organization_service: OrganizationService = Depends(get_organization_service),
     api_key: str = Depends(get_api_key),
 ):
@@ -134,10 +364,28 @@ async def update_organization(
     return OrganizationSchema.model_validate(db_organization)
 
 
+@router.patch("/{organization_id}", response_model=Organization)
+async def patch_organization(
+    organization_id: int,
+    organization: OrganizationPatch,
+    db: AsyncSession = Depends(get_async_session, scope="function"),
+    organization_service: OrganizationService = Depends(get_organization_service),
+    api_key: str = Depends(get_api_key),
+):
+    
+    db_organization = await organization_service.patch(
+        db, organization_id=organization_id, organization_in=organization
+    )
+    if db_organization is None:
+        raise HTTPException(status_code=404, detail="Организация не найдена")
+    from app.domain.models.organization import Organization as OrganizationSchema
+    return OrganizationSchema.model_validate(db_organization)
+
+
 @router.delete("/{organization_id}")
 async def delete_organization(
     organization_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_session, scope="function"),
     organization_service: OrganizationService = Depends(get_organization_service),
     api_key: str = Depends(get_api_key),
 ):
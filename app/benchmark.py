@@ -0,0 +1,288 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db.base import async_session_factory
+from app.db.models import Activity, Building, Organization
+
+
+@dataclass
+class Endpoint:
+    name: str
+    make_url: Callable[[random.Random], str]
+
+
+def _build_endpoints(max_ids: Dict[str, int]) -> List[Endpoint]:
+    prefix = settings.API_V1_STR
+    max_org = max(max_ids["organizations"], 1)
+    max_building = max(max_ids["buildings"], 1)
+    max_activity = max(max_ids["activities"], 1)
+
+    return [
+        Endpoint(
+            "organizations.list",
+            lambda rng: f"{prefix}/organizations/?skip={rng.randint(0, max_org)}&limit=100",
+        ),
+        Endpoint(
+            "organizations.detail",
+            lambda rng: f"{prefix}/organizations/{rng.randint(1, max_org)}",
+        ),
+        Endpoint(
+            "organizations.by_building",
+            lambda rng: f"{prefix}/organizations/search?building_id={rng.randint(1, max_building)}",
+        ),
+        Endpoint(
+            "organizations.by_activity_tree",
+            lambda rng: f"{prefix}/organizations/search?activity_id={rng.randint(1, max_activity)}",
+        ),
+        Endpoint(
+            "organizations.search_name",
+            lambda rng: f"{prefix}/organizations/search?name={rng.choice(['Альфа', 'Урал', 'Техно', 'Союз'])}",
+        ),
+        Endpoint(
+            "organizations.by_radius",
+            lambda rng: f"{prefix}/organizations/by-location?latitude={rng.gauss(55.7558, 0.1):.5f}"
+            f"&longitude={rng.gauss(37.6173, 0.1):.5f}&radius={rng.choice([300, 1000, 3000])}",
+        ),
+        Endpoint(
+            "buildings.detail",
+            lambda rng: f"{prefix}/buildings/{rng.randint(1, max_building)}",
+        ),
+        Endpoint(
+            "activities.list",
+            lambda rng: f"{prefix}/activities/?limit=100",
+        ),
+        Endpoint(
+            "activities.tree",
+            lambda rng: f"{prefix}/activities/tree",
+        ),
+    ]
+
+
+async def _get_max_ids() -> Dict[str, int]:
+    async with async_session_factory() as db:
+        return {
+            "organizations": await db.scalar(select(func.max(Organization.id))) or 0,
+            "buildings": await db.scalar(select(func.max(Building.id))) or 0,
+            "activities": await db.scalar(select(func.max(Activity.id))) or 0,
+        }
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _run_endpoint(
+    client: httpx.AsyncClient,
+    endpoint: Endpoint,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> Dict[str, float]:
+    rng = random.Random(seed)
+    urls = [endpoint.make_url(rng) for _ in range(requests)]
+    latencies: List[float] = []
+    errors = 0
+    queue = iter(urls)
+
+    async def worker():
+        nonlocal errors
+        for url in queue:
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 500:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+    }
+
+
+def _compare(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> None:
+    print(f"\n{'endpoint':34} {'p50 Δ%':>9} {'p95 Δ%':>9} {'p99 Δ%':>9} {'rps Δ%':>9}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+
+        def delta(key: str) -> str:
+            if not previous.get(key):
+                return "-"
+            return f"{(current[key] - previous[key]) / previous[key] * 100:+.1f}"
+
+        print(
+            f"{name:34} {delta('p50_ms'):>9} {delta('p95_ms'):>9} "
+            f"{delta('p99_ms'):>9} {delta('throughput_rps'):>9}"
+        )
+
+
+async def run_benchmark(
+    requests: int,
+    concurrency: int,
+    only: Optional[List[str]],
+    seed: int,
+) -> Dict[str, Dict]:
+    from app.main import app
+
+    endpoints = _build_endpoints(await _get_max_ids())
+    if only:
+        endpoints = [endpoint for endpoint in endpoints if endpoint.name in only]
+
+    results: Dict[str, Dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://benchmark",
+            headers={"X-API-Key": settings.API_KEY},
+            timeout=None,
+        ) as client:
+            for endpoint in endpoints:
+                await _run_endpoint(client, endpoint, min(requests, 20), concurrency, seed)
+                results[endpoint.name] = await _run_endpoint(
+                    client, endpoint, requests, concurrency, seed
+                )
+                stats = results[endpoint.name]
+                print(
+                    f"{endpoint.name:34} p50={stats['p50_ms']:>9.2f}ms "
+                    f"p95={stats['p95_ms']:>9.2f}ms p99={stats['p99_ms']:>9.2f}ms "
+                    f"rps={stats['throughput_rps']:>9.1f} errors={stats['errors']}"
+                )
+    return results
+
+
+def _measure_compression(bodies: List[bytes], best: bool, repeat: int) -> Dict[str, Dict]:
+    from app.core.compression import ENCODINGS, compress
+
+    raw_bytes = sum(len(body) for body in bodies)
+    results: Dict[str, Dict] = {}
+    for encoding in ENCODINGS:
+        started = time.process_time()
+        for _ in range(repeat):
+            compressed_bytes = sum(len(compress(encoding, body, best=best)) for body in bodies)
+        cpu = (time.process_time() - started) / repeat
+        results[encoding] = {
+            "raw_bytes": raw_bytes,
+            "compressed_bytes": compressed_bytes,
+            "saved_percent": round((1 - compressed_bytes / raw_bytes) * 100, 1) if raw_bytes else 0.0,
+            "cpu_ms_per_response": round(cpu / len(bodies) * 1000, 4) if bodies else 0.0,
+            "saved_bytes_per_cpu_ms": round((raw_bytes - compressed_bytes) / (cpu * 1000), 1)
+            if cpu
+            else 0.0,
+        }
+    return results
+
+
+async def run_compression_benchmark(
+    requests: int, only: Optional[List[str]], seed: int, repeat: int
+) -> Dict[str, Dict]:
+    from app.main import app
+
+    endpoints = _build_endpoints(await _get_max_ids())
+    if only:
+        endpoints = [endpoint for endpoint in endpoints if endpoint.name in only]
+
+    results: Dict[str, Dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://benchmark",
+            headers={"X-API-Key": settings.API_KEY, "Accept-Encoding": "identity"},
+            timeout=None,
+        ) as client:
+            print(
+                f"{'endpoint':34} {'mode':6} {'encoding':8} {'raw B':>9} "
+                f"{'saved %':>8} {'cpu ms':>8} {'B/cpu ms':>10}"
+            )
+            for endpoint in endpoints:
+                rng = random.Random(seed)
+                bodies = []
+                for _ in range(requests):
+                    response = await client.get(endpoint.make_url(rng))
+                    if response.status_code == 200:
+                        bodies.append(response.content)
+                bodies = [
+                    body for body in bodies if len(body) >= settings.COMPRESSION_MINIMUM_SIZE
+                ]
+                if not bodies:
+                    continue
+
+                results[endpoint.name] = {
+                    mode: _measure_compression(bodies, mode == "cache", repeat)
+                    for mode in ("live", "cache")
+                }
+                for mode, by_encoding in results[endpoint.name].items():
+                    for encoding, stats in by_encoding.items():
+                        print(
+                            f"{endpoint.name:34} {mode:6} {encoding:8} "
+                            f"{stats['raw_bytes'] // len(bodies):>9} "
+                            f"{stats['saved_percent']:>8.1f} "
+                            f"{stats['cpu_ms_per_response']:>8.3f} "
+                            f"{stats['saved_bytes_per_cpu_ms']:>10.0f}"
+                        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест API")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--endpoint", action="append", dest="endpoints")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="Сравнить с результатами предыдущего запуска")
+    parser.add_argument(
+        "--compression",
+        action="store_true",
+        help="Сравнить экономию трафика и затраты CPU на сжатие ответов",
+    )
+    parser.add_argument("--compression-repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.compression:
+        results = asyncio.run(
+            run_compression_benchmark(
+                min(args.requests, 50), args.endpoints, args.seed, args.compression_repeat
+            )
+        )
+    else:
+        results = asyncio.run(
+            run_benchmark(args.requests, args.concurrency, args.endpoints, args.seed)
+        )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            _compare(results, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
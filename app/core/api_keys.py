@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import cache_requests
+from app.db.base import RoutingSession, UnitOfWork
+from app.db.repositories.api_key_repository import ApiKeyRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ApiKeyInfo:
+    id: int
+    name: str
+    is_admin: bool
+    rate_limit_per_minute: Optional[int]
+    burst: Optional[int]
+
+
+BOOTSTRAP_KEY = ApiKeyInfo(
+    id=0, name="bootstrap", is_admin=True, rate_limit_per_minute=None, burst=None
+)
+
+
+def hash_api_key(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def generate_api_key() -> Tuple[str, str, str]:
+    key = secrets.token_urlsafe(32)
+    return key, key[:8], hash_api_key(key)
+
+
+class ApiKeyCache:
+    def __init__(
+        self, refresh_seconds: float, negative_ttl: float, negative_max_size: int
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.negative_ttl = negative_ttl
+        self.negative_max_size = negative_max_size
+        self.repository = ApiKeyRepository()
+        self._keys: Dict[str, ApiKeyInfo] = {}
+        self._unknown: "OrderedDict[str, float]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._hits = cache_requests.labels("api_keys", "hit")
+        self._misses = cache_requests.labels("api_keys", "miss")
+
+    @staticmethod
+    def _info(db_key) -> ApiKeyInfo:
+        return ApiKeyInfo(
+            id=db_key.id,
+            name=db_key.name,
+            is_admin=db_key.is_admin,
+            rate_limit_per_minute=db_key.rate_limit_per_minute,
+            burst=db_key.burst,
+        )
+
+    async def lookup(self, key: Optional[str]) -> Optional[ApiKeyInfo]:
+        if not key:
+            return None
+        if settings.API_KEY and hmac.compare_digest(key, settings.API_KEY):
+            return BOOTSTRAP_KEY
+
+        key_hash = hash_api_key(key)
+        info = self._keys.get(key_hash)
+        if info is not None:
+            self._hits.inc()
+            return info
+
+        self._misses.inc()
+        expires_at = self._unknown.get(key_hash)
+        if expires_at is not None and expires_at > time.monotonic():
+            return None
+
+        # Ключ мог быть создан в другом воркере: читаем с primary, а не с реплики.
+        async with UnitOfWork() as db:
+            db_key = await self.repository.get_active_by_hash(db, key_hash)
+        if db_key is None:
+            self._remember_unknown(key_hash)
+            return None
+        self._unknown.pop(key_hash, None)
+        info = self._keys[key_hash] = self._info(db_key)
+        return info
+
+    def _remember_unknown(self, key_hash: str) -> None:
+        self._unknown[key_hash] = time.monotonic() + self.negative_ttl
+        self._unknown.move_to_end(key_hash)
+        while len(self._unknown) > self.negative_max_size:
+            self._unknown.popitem(last=False)
+
+    async def refresh(self) -> None:
+        async with UnitOfWork(read_only=True) as db:
+            db_keys = await self.repository.get_active(db)
+        self._keys = {db_key.key_hash: self._info(db_key) for db_key in db_keys}
+
+    def add(self, db: AsyncSession, db_key) -> None:
+        db.info.setdefault("api_key_changes", []).append(
+            (db_key.key_hash, self._info(db_key))
+        )
+
+    def remove(self, db: AsyncSession, key_hash: str) -> None:
+        db.info.setdefault("api_key_changes", []).append((key_hash, None))
+
+    def apply(self, changes: List[Tuple[str, Optional[ApiKeyInfo]]]) -> None:
+        for key_hash, info in changes:
+            if info is None:
+                self._keys.pop(key_hash, None)
+                self._remember_unknown(key_hash)
+            else:
+                self._keys[key_hash] = info
+                self._unknown.pop(key_hash, None)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refresh_task = loop.create_task(self._refresh_once())
+
+    async def _refresh_once(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Не удалось обновить кэш API ключей: {str(e)}")
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Не удалось обновить кэш API ключей: {str(e)}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+api_key_cache = ApiKeyCache(
+    settings.API_KEYS_REFRESH_SECONDS,
+    negative_ttl=settings.API_KEYS_NEGATIVE_TTL_SECONDS,
+    negative_max_size=settings.API_KEYS_NEGATIVE_CACHE_SIZE,
+)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _apply_api_key_changes(session) -> None:
+    changes = session.info.pop("api_key_changes", None)
+    if changes:
+        api_key_cache.apply(changes)
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _discard_api_key_changes(session, previous_transaction) -> None:
+    session.info.pop("api_key_changes", None)
@@ -0,0 +1,30 @@
+from contextvars import ContextVar
+from typing import List, Optional
+
+
+class CacheStatus:
+    __slots__ = ("entries", "stale")
+
+    def __init__(self):
+        self.entries: List[str] = []
+        self.stale = False
+
+    def header(self) -> str:
+        return ", ".join(self.entries)
+
+
+current_cache_status: ContextVar[Optional[CacheStatus]] = ContextVar(
+    "current_cache_status", default=None
+)
+
+
+def record_cache_status(value: str, stale: bool = False) -> None:
+    status = current_cache_status.get()
+    if status is not None:
+        status.entries.append(value)
+        status.stale = status.stale or stale
+
+
+def served_stale() -> bool:
+    status = current_cache_status.get()
+    return status is not None and status.stale
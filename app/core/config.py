@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 import os
 from dotenv import load_dotenv
@@ -16,20 +17,151 @@ class Settings(BaseSettings):
     API_KEY: str = os.getenv("API_KEY", "test")  
 
     
-    POSTGRES_SERVER: str = os.getenv("POSTGRES_SERVER")
-    POSTGRES_USER: str = os.getenv("POSTGRES_USER")
-    POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD")
-    POSTGRES_DB: str = os.getenv("POSTGRES_DB")
+    POSTGRES_SERVER: Optional[str] = os.getenv("POSTGRES_SERVER")
+    POSTGRES_USER: Optional[str] = os.getenv("POSTGRES_USER")
+    POSTGRES_PASSWORD: Optional[str] = os.getenv("POSTGRES_PASSWORD")
+    POSTGRES_DB: Optional[str] = os.getenv("POSTGRES_DB")
     DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
 
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(
+        os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "500")
+    )
+
+    QUERY_COUNT_LOG_THRESHOLD: int = int(os.getenv("QUERY_COUNT_LOG_THRESHOLD", "50"))
+    SERVER_TIMING_ENABLED: bool = (
+        os.getenv("SERVER_TIMING_ENABLED", "True").lower() == "true"
+    )
+
+    API_KEYS_REFRESH_SECONDS: float = float(os.getenv("API_KEYS_REFRESH_SECONDS", "30"))
+    API_KEYS_NEGATIVE_TTL_SECONDS: float = float(os.getenv("API_KEYS_NEGATIVE_TTL_SECONDS", "5"))
+    API_KEYS_NEGATIVE_CACHE_SIZE: int = int(os.getenv("API_KEYS_NEGATIVE_CACHE_SIZE", "10000"))
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_REDIS_URL: Optional[str] = os.getenv("RATE_LIMIT_REDIS_URL")
+    RATE_LIMIT_DEFAULT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_DEFAULT_PER_MINUTE", "600"))
+    RATE_LIMIT_DEFAULT_BURST: int = int(os.getenv("RATE_LIMIT_DEFAULT_BURST", "60"))
+
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "True").lower() == "true"
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "True").lower() == "true"
+
+    SWR_ENABLED: bool = os.getenv("SWR_ENABLED", "True").lower() == "true"
+    SWR_SOFT_TTL_SECONDS: float = float(os.getenv("SWR_SOFT_TTL_SECONDS", "30"))
+    SWR_HARD_TTL_SECONDS: float = float(os.getenv("SWR_HARD_TTL_SECONDS", "600"))
+    SWR_MAX_ENTRIES: int = int(os.getenv("SWR_MAX_ENTRIES", "1024"))
+
+    DATA_VERSION_POLL_SECONDS: float = float(os.getenv("DATA_VERSION_POLL_SECONDS", "1"))
+
+    RESPONSE_CACHE_ENABLED: bool = (
+        os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+    )
+    RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+    SLOW_QUERY_LOG_ENABLED: bool = (
+        os.getenv("SLOW_QUERY_LOG_ENABLED", "False").lower() == "true"
+    )
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_BUFFER_SIZE: int = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = float(
+        os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1")
+    )
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = int(
+        os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "5000")
+    )
+
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "False").lower() == "true"
+    PROFILER_INTERVAL_MS: float = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+    PROFILER_MAX_SECONDS: int = int(os.getenv("PROFILER_MAX_SECONDS", "60"))
+
+    DB_CONNECT_ATTEMPTS: int = int(os.getenv("DB_CONNECT_ATTEMPTS", "30"))
+    DB_CONNECT_BACKOFF_SECONDS: float = float(os.getenv("DB_CONNECT_BACKOFF_SECONDS", "0.25"))
+    DB_CONNECT_MAX_BACKOFF_SECONDS: float = float(
+        os.getenv("DB_CONNECT_MAX_BACKOFF_SECONDS", "5")
+    )
+
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "True").lower() == "true"
+
+    DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_ROUTING: str = os.getenv("REPLICA_ROUTING", "round_robin")
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    READ_YOUR_WRITES_CLOCK_SKEW_SECONDS: float = float(
+        os.getenv("READ_YOUR_WRITES_CLOCK_SKEW_SECONDS", "1")
+    )
+
+    ORGANIZATION_DOCUMENTS_ENABLED: bool = (
+        os.getenv("ORGANIZATION_DOCUMENTS_ENABLED", "True").lower() == "true"
+    )
+
+    JOBS_WORKER_ENABLED: bool = (
+        os.getenv(
+            "JOBS_WORKER_ENABLED",
+            "False" if os.getenv("SERVER_MODE") == "production" else "True",
+        ).lower()
+        == "true"
+    )
+    JOBS_BATCH_SIZE: int = int(os.getenv("JOBS_BATCH_SIZE", "100"))
+    JOBS_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOBS_POLL_INTERVAL_SECONDS", "1"))
+    JOBS_MAX_POLL_INTERVAL_SECONDS: float = float(
+        os.getenv("JOBS_MAX_POLL_INTERVAL_SECONDS", "10")
+    )
+    JOBS_MAINTENANCE_INTERVAL_SECONDS: float = float(
+        os.getenv("JOBS_MAINTENANCE_INTERVAL_SECONDS", "60")
+    )
+    JOBS_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("JOBS_LOCK_TIMEOUT_SECONDS", "300"))
+    JOBS_MAX_ATTEMPTS: int = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+    JOBS_RETRY_BACKOFF_SECONDS: float = float(os.getenv("JOBS_RETRY_BACKOFF_SECONDS", "2"))
+    JOBS_RETENTION_HOURS: float = float(os.getenv("JOBS_RETENTION_HOURS", "24"))
+
+    GEO_MAX_VERTICES: int = int(os.getenv("GEO_MAX_VERTICES", "10000"))
+    GEO_MAX_ROUTE_DISTANCE_METERS: float = float(
+        os.getenv("GEO_MAX_ROUTE_DISTANCE_METERS", "50000")
+    )
+    GEO_BATCH_MAX_POINTS: int = int(os.getenv("GEO_BATCH_MAX_POINTS", "10000"))
+    GEO_BATCH_MAX_RADIUS_METERS: float = float(
+        os.getenv("GEO_BATCH_MAX_RADIUS_METERS", "50000")
+    )
+    GEO_BATCH_CHUNK_POINTS: int = int(os.getenv("GEO_BATCH_CHUNK_POINTS", "500"))
+    GEO_BATCH_MAX_RESULTS_PER_POINT: int = int(
+        os.getenv("GEO_BATCH_MAX_RESULTS_PER_POINT", "100")
+    )
+    GEO_MAX_RESULTS: int = int(os.getenv("GEO_MAX_RESULTS", "1000"))
+
+    PHONE_COUNTRY_CODE: str = os.getenv("PHONE_COUNTRY_CODE", "7")
+    PHONE_TRUNK_PREFIX: str = os.getenv("PHONE_TRUNK_PREFIX", "8")
+    PHONE_NATIONAL_NUMBER_LENGTH: int = int(os.getenv("PHONE_NATIONAL_NUMBER_LENGTH", "10"))
+    PHONE_SUFFIX_MIN_DIGITS: int = int(os.getenv("PHONE_SUFFIX_MIN_DIGITS", "4"))
+
+    BATCH_MAX_OPERATIONS: int = int(os.getenv("BATCH_MAX_OPERATIONS", "1000"))
+
+    GRAPHQL_ENABLED: bool = os.getenv("GRAPHQL_ENABLED", "True").lower() == "true"
+    GRAPHQL_MAX_DEPTH: int = int(os.getenv("GRAPHQL_MAX_DEPTH", "6"))
+    GRAPHQL_MAX_COST: int = int(os.getenv("GRAPHQL_MAX_COST", "20000"))
+    GRAPHQL_DEFAULT_LIST_SIZE: int = int(os.getenv("GRAPHQL_DEFAULT_LIST_SIZE", "10"))
+    GRAPHQL_MAX_LIST_SIZE: int = int(os.getenv("GRAPHQL_MAX_LIST_SIZE", "1000"))
+
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
     @property
     def ASYNC_SQLALCHEMY_DATABASE_URI(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
+    @property
+    def REPLICA_DATABASE_URIS(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+from app.db.base import UnitOfWork
+from app.db.repositories.data_version_repository import DataVersionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersionWatcher:
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self.repository = DataVersionRepository()
+        self.version: Optional[int] = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+        self._callbacks.append(callback)
+        return callback
+
+    async def check(self) -> bool:
+        async with UnitOfWork(read_only=True) as db:
+            version = await self.repository.get_version(db)
+        changed = self.version is not None and version != self.version
+        self.version = version
+        if changed:
+            for callback in self._callbacks:
+                callback()
+        return changed
+
+    async def _watch_forever(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Не удалось проверить версию данных: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._task is None and self.poll_interval > 0:
+            self._task = asyncio.create_task(self._watch_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+data_version_watcher = DataVersionWatcher(settings.DATA_VERSION_POLL_SECONDS)
@@ -0,0 +1,116 @@
+import math
+from typing import Sequence, Tuple
+
+import numpy as np
+import shapely
+
+METERS_PER_DEGREE = 111320
+
+LatLon = Tuple[float, float]
+BoundingBox = Tuple[float, float, float, float]
+
+
+def bounding_box(points: Sequence[LatLon], margin: float = 0) -> BoundingBox:
+    latitudes = [lat for lat, _ in points]
+    longitudes = [lon for _, lon in points]
+    min_lat, max_lat = min(latitudes), max(latitudes)
+    lat_margin = margin / METERS_PER_DEGREE
+    lon_margin = margin / (
+        METERS_PER_DEGREE
+        * max(math.cos(math.radians(max(abs(min_lat), abs(max_lat)))), 1e-6)
+    )
+    return (
+        min_lat - lat_margin,
+        min(longitudes) - lon_margin,
+        max_lat + lat_margin,
+        max(longitudes) + lon_margin,
+    )
+
+
+def to_meters(
+    latitudes: np.ndarray, longitudes: np.ndarray, origin_lat: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    scale = METERS_PER_DEGREE * math.cos(math.radians(origin_lat))
+    return np.asarray(longitudes) * scale, np.asarray(latitudes) * METERS_PER_DEGREE
+
+
+class PolygonArea:
+    def __init__(self, points: Sequence[LatLon]):
+        if len(points) < 3:
+            raise ValueError("Полигон должен содержать не менее трёх вершин")
+        polygon = shapely.polygons([(lon, lat) for lat, lon in points])
+        if not shapely.is_valid(polygon):
+            polygon = shapely.make_valid(polygon)
+        if shapely.area(polygon) == 0:
+            raise ValueError("Полигон не должен быть вырожденным")
+        shapely.prepare(polygon)
+        self.geometry = polygon
+        self.bbox = bounding_box(points)
+
+    def contains(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        return shapely.intersects_xy(self.geometry, longitudes, latitudes)
+
+
+class RouteCorridor:
+    def __init__(self, points: Sequence[LatLon], distance: float):
+        if len(points) < 2:
+            raise ValueError("Маршрут должен содержать не менее двух точек")
+        if distance <= 0:
+            raise ValueError("Расстояние до маршрута должно быть положительным")
+        self.distance = distance
+        self.origin_lat = sum(lat for lat, _ in points) / len(points)
+        x, y = to_meters(
+            [lat for lat, _ in points], [lon for _, lon in points], self.origin_lat
+        )
+        self.geometry = shapely.linestrings(x, y)
+        shapely.prepare(self.geometry)
+        self.bbox = bounding_box(points, margin=distance)
+
+    def contains(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        x, y = to_meters(latitudes, longitudes, self.origin_lat)
+        return shapely.dwithin(self.geometry, shapely.points(x, y), self.distance)
+
+
+EARTH_RADIUS_METERS = 6371008.8
+
+
+def haversine(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1)))
+
+
+class PointIndex:
+    def __init__(self, ids: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray):
+        self.ids = ids
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.tree = shapely.STRtree(shapely.points(longitudes, latitudes))
+
+    def query_radius(
+        self, latitudes: np.ndarray, longitudes: np.ndarray, radius: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if not len(self.ids) or not len(latitudes):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+
+        max_lat = min(float(np.abs(latitudes).max()) + radius / METERS_PER_DEGREE, 89.9)
+        degrees = 1.01 * radius / (METERS_PER_DEGREE * math.cos(math.radians(max_lat)))
+        point_idx, tree_idx = self.tree.query(
+            shapely.points(longitudes, latitudes), predicate="dwithin", distance=degrees
+        )
+        distances = haversine(
+            latitudes[point_idx],
+            longitudes[point_idx],
+            self.latitudes[tree_idx],
+            self.longitudes[tree_idx],
+        )
+        keep = distances <= radius
+        point_idx, tree_idx, distances = point_idx[keep], tree_idx[keep], distances[keep]
+        order = np.lexsort((distances, point_idx))
+        return point_idx[order], self.ids[tree_idx[order]], distances[order]
@@ -0,0 +1,92 @@
+import math
+from typing import List, Optional, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9
+
+
+def encode(latitude: float, longitude: float, precision: int = PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def successor(prefix: str) -> Optional[str]:
+    chars = list(prefix)
+    while chars:
+        index = BASE32.index(chars[-1])
+        if index + 1 < len(BASE32):
+            chars[-1] = BASE32[index + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+def cover(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    max_cells: int = 16,
+) -> List[Tuple[str, Optional[str]]]:
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    min_lon, max_lon = max(min_lon, -180.0), min(max_lon, 180.0)
+
+    for precision in range(PRECISION, 0, -1):
+        lat_size, lon_size = cell_size(precision)
+        lat_cells = range(
+            math.floor((min_lat + 90) / lat_size),
+            min(math.floor((max_lat + 90) / lat_size), round(180 / lat_size) - 1) + 1,
+        )
+        lon_cells = range(
+            math.floor((min_lon + 180) / lon_size),
+            min(math.floor((max_lon + 180) / lon_size), round(360 / lon_size) - 1) + 1,
+        )
+        if len(lat_cells) * len(lon_cells) <= max_cells or precision == 1:
+            break
+
+    prefixes = sorted(
+        {
+            encode(
+                -90 + (lat_cell + 0.5) * lat_size,
+                -180 + (lon_cell + 0.5) * lon_size,
+                precision,
+            )
+            for lat_cell in lat_cells
+            for lon_cell in lon_cells
+        }
+    )
+
+    ranges: List[Tuple[str, Optional[str]]] = []
+    for prefix in prefixes:
+        upper = successor(prefix)
+        if ranges and ranges[-1][1] == prefix:
+            ranges[-1] = (ranges[-1][0], upper)
+        else:
+            ranges.append((prefix, upper))
+    return ranges
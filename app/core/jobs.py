@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.base import RoutingSession, UnitOfWork
+from app.db.repositories.job_repository import JobRepository, as_utc, utcnow
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, List[Dict[str, Any]]], Awaitable[None]]
+
+jobs_queue_depth = registry.gauge(
+    "jobs_queue_depth",
+    "Количество задач в очереди по статусу",
+    ["kind", "status"],
+)
+jobs_queue_lag = registry.gauge(
+    "jobs_queue_lag_seconds",
+    "Возраст самой старой ожидающей задачи",
+    ["kind"],
+)
+jobs_processed = registry.counter(
+    "jobs_processed_total",
+    "Обработанные задачи по результату",
+    ["kind", "result"],
+)
+job_wait_seconds = registry.histogram(
+    "job_wait_seconds",
+    "Время от постановки задачи до начала обработки",
+    ["kind"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+job_batch_duration = registry.histogram(
+    "job_batch_duration_seconds",
+    "Время обработки пачки задач одного типа",
+    ["kind"],
+)
+
+
+class JobQueue:
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        max_poll_interval: float,
+        maintenance_interval: float,
+        lock_timeout: float,
+        max_attempts: int,
+        retry_backoff: float,
+        retention_hours: float,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
+        self.maintenance_interval = maintenance_interval
+        self.lock_timeout = timedelta(seconds=lock_timeout)
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retention = timedelta(hours=retention_hours)
+        self.repository = JobRepository()
+        self.handlers: Dict[str, JobHandler] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stats_labels = set()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self.handlers[kind] = handler
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        kind: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> None:
+        await self.repository.enqueue(
+            db,
+            kind=kind,
+            payload=payload,
+            idempotency_key=idempotency_key,
+            max_attempts=self.max_attempts,
+        )
+        db.info["jobs_enqueued"] = True
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def run_once(self) -> int:
+        async with UnitOfWork() as db:
+            db.info["bookkeeping"] = True
+            jobs = await self.repository.claim(db, limit=self.batch_size)
+        if not jobs:
+            return 0
+
+        now = utcnow()
+        by_kind = defaultdict(list)
+        for job in jobs:
+            job_wait_seconds.labels(job.kind).observe(
+                max((now - as_utc(job.created_at)).total_seconds(), 0)
+            )
+            by_kind[job.kind].append(job)
+
+        for kind, kind_jobs in by_kind.items():
+            try:
+                await self._process(kind, kind_jobs)
+            except Exception as e:
+                logger.warning(f"Ошибка обработки задач {kind}: {str(e)}")
+        return len(jobs)
+
+    async def _process(self, kind: str, jobs: List) -> None:
+        started_at = time.perf_counter()
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"Неизвестный тип задачи: {kind}")
+            async with UnitOfWork() as db:
+                await handler(db, [job.payload for job in jobs])
+                await self.repository.complete(db, [job.id for job in jobs])
+        except Exception as e:
+            if len(jobs) > 1:
+                for job in jobs:
+                    await self._process(kind, [job])
+                return
+            await self._retry_or_fail(jobs[0], e)
+            return
+        finally:
+            job_batch_duration.labels(kind).observe(time.perf_counter() - started_at)
+
+        jobs_processed.labels(kind, "done").inc(len(jobs))
+
+    async def _retry_or_fail(self, job, error: Exception) -> None:
+        message = f"{type(error).__name__}: {error}"[:2000]
+        async with UnitOfWork() as db:
+            db.info["bookkeeping"] = True
+            if job.attempts >= job.max_attempts:
+                await self.repository.fail(db, job.id, error=message)
+                jobs_processed.labels(job.kind, "failed").inc()
+                logger.error(
+                    f"Задача {job.id} ({job.kind}) не выполнена после "
+                    f"{job.attempts} попыток: {message}"
+                )
+                return
+            delay = timedelta(seconds=self.retry_backoff * 2 ** (job.attempts - 1))
+            retried = await self.repository.retry(db, job.id, error=message, delay=delay)
+        if not retried:
+            jobs_processed.labels(job.kind, "superseded").inc()
+            logger.info(
+                f"Задача {job.id} ({job.kind}) не повторяется: "
+                f"уже есть ожидающая задача с тем же ключом"
+            )
+            return
+        jobs_processed.labels(job.kind, "retry").inc()
+        logger.warning(
+            f"Задача {job.id} ({job.kind}), попытка {job.attempts}: {message}; "
+            f"повтор через {delay.total_seconds():.1f} с"
+        )
+
+    async def maintain(self) -> None:
+        async with UnitOfWork() as db:
+            db.info["bookkeeping"] = True
+            await self.repository.requeue_stale(db, lock_timeout=self.lock_timeout)
+            await self.repository.purge_finished(db, older_than=self.retention)
+
+    async def update_stats(self) -> None:
+        async with UnitOfWork(read_only=True) as db:
+            rows = await self.repository.get_stats(db)
+
+        now = utcnow()
+        seen = set()
+        lags: Dict[str, float] = {}
+        for row in rows:
+            seen.add((row.kind, row.status))
+            jobs_queue_depth.labels(row.kind, row.status).set(row.count)
+            if row.status == "pending" and row.oldest is not None:
+                lags[row.kind] = max((now - as_utc(row.oldest)).total_seconds(), 0)
+
+        for kind, status in self._stats_labels - seen:
+            jobs_queue_depth.labels(kind, status).set(0)
+        for kind in {kind for kind, _ in self._stats_labels | seen}:
+            jobs_queue_lag.labels(kind).set(lags.get(kind, 0))
+        self._stats_labels |= seen
+
+    async def run_forever(self) -> None:
+        idle_interval = self.poll_interval
+        next_maintenance = 0.0
+        while True:
+            self._wake.clear()
+            processed = 0
+            try:
+                if time.monotonic() >= next_maintenance:
+                    next_maintenance = time.monotonic() + self.maintenance_interval
+                    await self.maintain()
+                    await self.update_stats()
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Ошибка обработчика очереди задач: {str(e)}")
+
+            if processed:
+                idle_interval = self.poll_interval
+            if processed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), idle_interval)
+                idle_interval = self.poll_interval
+            except asyncio.TimeoutError:
+                if not processed:
+                    idle_interval = min(idle_interval * 2, self.max_poll_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+job_queue = JobQueue(
+    batch_size=settings.JOBS_BATCH_SIZE,
+    poll_interval=settings.JOBS_POLL_INTERVAL_SECONDS,
+    max_poll_interval=settings.JOBS_MAX_POLL_INTERVAL_SECONDS,
+    maintenance_interval=settings.JOBS_MAINTENANCE_INTERVAL_SECONDS,
+    lock_timeout=settings.JOBS_LOCK_TIMEOUT_SECONDS,
+    max_attempts=settings.JOBS_MAX_ATTEMPTS,
+    retry_backoff=settings.JOBS_RETRY_BACKOFF_SECONDS,
+    retention_hours=settings.JOBS_RETENTION_HOURS,
+)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _wake_on_enqueue(session) -> None:
+    if session.info.pop("jobs_enqueued", False):
+        job_queue.wake()
@@ -0,0 +1,43 @@
+import re
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+MAX_DIGITS = 15
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def digits_only(number: str) -> str:
+    return _NON_DIGITS.sub("", number)
+
+
+def normalize_phone(number: str) -> Optional[str]:
+    digits = digits_only(number)
+    if not digits:
+        return None
+    if not number.lstrip().startswith("+"):
+        national_length = settings.PHONE_NATIONAL_NUMBER_LENGTH
+        trunk_prefix = settings.PHONE_TRUNK_PREFIX
+        if len(digits) == national_length + len(trunk_prefix) and digits.startswith(
+            trunk_prefix
+        ):
+            digits = settings.PHONE_COUNTRY_CODE + digits[len(trunk_prefix):]
+        elif len(digits) == national_length:
+            digits = settings.PHONE_COUNTRY_CODE + digits
+    if len(digits) > MAX_DIGITS:
+        return None
+    return digits
+
+
+def phone_values(number: str) -> Dict[str, Optional[str]]:
+    normalized = normalize_phone(number)
+    return {
+        "number": number,
+        "number_normalized": normalized,
+        "number_reversed": normalized[::-1] if normalized else None,
+    }
+
+
+def digit_prefix_upper_bound(prefix: str) -> str:
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
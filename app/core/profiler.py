@@ -0,0 +1,233 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+_frames: Dict[CodeType, Frame] = {}
+_cwd = os.getcwd() + os.sep
+
+
+def _frame(code: CodeType) -> Frame:
+    frame = _frames.get(code)
+    if frame is None:
+        filename = code.co_filename
+        if filename.startswith(_cwd):
+            filename = filename[len(_cwd):]
+        frame = _frames[code] = (code.co_name, filename, code.co_firstlineno)
+    return frame
+
+
+def _stack(frame: Optional[FrameType], root: Optional[str] = None) -> Stack:
+    stack = []
+    while frame is not None:
+        stack.append(_frame(frame.f_code))
+        frame = frame.f_back
+    if root is not None:
+        stack.append((root, "", 0))
+    stack.reverse()
+    return tuple(stack)
+
+
+class Profile:
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def add(self, stack: Stack) -> None:
+        self.samples[stack] += 1
+
+    def collapsed(self) -> str:
+        lines = [
+            ";".join(f"{name} ({filename}:{line})" if filename else name for name, filename, line in stack)
+            + f" {count}"
+            for stack, count in self.samples.most_common()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> Dict[str, Any]:
+        frames: Dict[Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.samples.most_common():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "app.core.profiler",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": name, "file": filename, "line": line} if filename else {"name": name}
+                    for name, filename, line in frames
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": self.name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+class StackSampler(ABC):
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        if wait:
+            self._thread.join()
+        self._thread = None
+
+    def _run(self, stop: threading.Event) -> None:
+        own_id = threading.get_ident()
+        while not stop.wait(self.interval):
+            self.sample(own_id, sys._current_frames())
+
+    @abstractmethod
+    def sample(self, own_id: int, frames: Dict[int, FrameType]) -> None:
+        pass
+
+
+class ProcessSampler(StackSampler):
+    def __init__(self, interval: float, name: str = "process"):
+        super().__init__(interval)
+        self.profile = Profile(name, interval)
+
+    def sample(self, own_id: int, frames: Dict[int, FrameType]) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in frames.items():
+            if thread_id != own_id:
+                self.profile.add(_stack(frame, names.get(thread_id, str(thread_id))))
+
+    def stop(self, wait: bool = True) -> None:
+        super().stop(wait)
+        self.profile.finished_at = time.perf_counter()
+
+
+async def profile_process(seconds: float, interval: float) -> Profile:
+    sampler = ProcessSampler(interval, name=f"{seconds:g}s, pid {os.getpid()}")
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        await asyncio.to_thread(sampler.stop)
+    return sampler.profile
+
+
+class RouteSampler(StackSampler):
+    def __init__(self, interval: float):
+        super().__init__(interval)
+        self.profiles: Dict[str, Profile] = {}
+        self.requests: Counter = Counter()
+        self._tasks: Dict[asyncio.Task, Profile] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def begin(self) -> Optional[Profile]:
+        task = asyncio.current_task()
+        if task is None:
+            return None
+
+        if self._loop is None:
+            self._loop = task.get_loop()
+            self._loop_thread_id = threading.get_ident()
+
+        profile = Profile(task.get_name(), self.interval)
+        with self._lock:
+            self._tasks[task] = profile
+        if not self.running:
+            self.start()
+        return profile
+
+    def end(self, route: str) -> None:
+        with self._lock:
+            profile = self._tasks.pop(asyncio.current_task(), None)
+            idle = not self._tasks
+        if idle:
+            self.stop(wait=False)
+        if profile is None:
+            return
+
+        profile.finished_at = time.perf_counter()
+        aggregate = self.profiles.get(route)
+        if aggregate is None:
+            aggregate = self.profiles[route] = Profile(route, self.interval)
+        with self._lock:
+            aggregate.samples.update(profile.samples)
+        self.requests[route] += 1
+
+    def sample_count(self, profile: Profile) -> int:
+        with self._lock:
+            return sum(profile.samples.values())
+
+    def sample(self, own_id: int, frames: Dict[int, FrameType]) -> None:
+        frame = frames.get(self._loop_thread_id)
+        if frame is None:
+            return
+
+        with self._lock:
+            profile = self._tasks.get(asyncio.current_task(self._loop))
+        if profile is None:
+            return
+        stack = _stack(frame)
+        with self._lock:
+            profile.add(stack)
+
+    def merged(self, route: Optional[str] = None) -> Profile:
+        merged = Profile(route or "all routes", self.interval)
+        for name, profile in self.profiles.items():
+            if route is None:
+                for stack, count in profile.samples.items():
+                    merged.samples[((name, "", 0),) + stack] += count
+            elif name == route:
+                merged.samples.update(profile.samples)
+        return merged
+
+    def reset(self) -> None:
+        self.profiles = {}
+        self.requests = Counter()
+
+
+route_sampler = RouteSampler(settings.PROFILER_INTERVAL_MS / 1000)
@@ -0,0 +1,105 @@
+import logging
+import time
+from typing import Dict, NamedTuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: float
+    retry_after: float
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class InMemoryRateLimiter:
+    def __init__(self):
+        self._buckets: Dict[int, _Bucket] = {}
+
+    async def hit(self, key_id: int, rate: float, burst: float, cost: float = 1) -> RateLimitResult:
+        now = time.monotonic()
+        bucket = self._buckets.get(key_id)
+        if bucket is None:
+            bucket = self._buckets[key_id] = _Bucket(burst, now)
+        else:
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated_at) * rate)
+            bucket.updated_at = now
+
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            return RateLimitResult(True, bucket.tokens, 0.0)
+        return RateLimitResult(False, bucket.tokens, (cost - bucket.tokens) / rate)
+
+    async def close(self) -> None:
+        pass
+
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class RedisRateLimiter:
+    def __init__(self, url: str, prefix: str = "rate_limit"):
+        from redis import asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key_id: int, rate: float, burst: float, cost: float = 1) -> RateLimitResult:
+        try:
+            allowed, remaining, retry_after = await self._script(
+                keys=[f"{self.prefix}:{key_id}"], args=[rate, burst, cost]
+            )
+        except Exception as e:
+            logger.warning(f"Хранилище лимитов недоступно, запрос пропущен без проверки: {str(e)}")
+            return RateLimitResult(True, burst, 0.0)
+        return RateLimitResult(bool(allowed), float(remaining), float(retry_after))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_rate_limiter():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        if not settings.RATE_LIMIT_REDIS_URL:
+            raise ValueError("Для RATE_LIMIT_BACKEND=redis необходимо указать RATE_LIMIT_REDIS_URL")
+        return RedisRateLimiter(settings.RATE_LIMIT_REDIS_URL)
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Неизвестное хранилище лимитов: {settings.RATE_LIMIT_BACKEND}")
+    return InMemoryRateLimiter()
+
+
+rate_limiter = create_rate_limiter()
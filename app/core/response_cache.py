@@ -0,0 +1,123 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache_status import record_cache_status, served_stale
+from app.core.compression import compress, negotiate
+from app.core.config import settings
+from app.core.data_version import data_version_watcher
+from app.core.metrics import cache_requests, registry
+from app.db.base import on_write_commit
+
+response_cache_bytes = registry.counter(
+    "response_cache_bytes_total",
+    "Байты ответов, отданных из кэша, по виду сжатия",
+    ["encoding"],
+)
+response_cache_entries = registry.gauge(
+    "response_cache_entries",
+    "Количество записей в кэше ответов",
+).labels()
+
+
+class CachedResponse:
+    __slots__ = ("body", "media_type", "expires_at", "variants")
+
+    def __init__(self, body: bytes, media_type: str, expires_at: float):
+        self.body = body
+        self.media_type = media_type
+        self.expires_at = expires_at
+        self.variants: Dict[str, bytes] = {}
+
+    def variant(self, encoding: Optional[str]) -> Optional[bytes]:
+        if (
+            encoding is None
+            or not settings.COMPRESSION_ENABLED
+            or len(self.body) < settings.COMPRESSION_MINIMUM_SIZE
+        ):
+            return None
+        body = self.variants.get(encoding)
+        if body is None:
+            body = self.variants[encoding] = compress(encoding, self.body, best=True)
+        return body
+
+    def response(self, accept_encoding: Optional[str]) -> Response:
+        encoding = negotiate(accept_encoding)
+        body = self.variant(encoding)
+        headers = {"Vary": "Accept-Encoding"}
+        if body is None:
+            body, encoding = self.body, "identity"
+        else:
+            headers["Content-Encoding"] = encoding
+        response_cache_bytes.labels(encoding).inc(len(body))
+        return Response(body, media_type=self.media_type, headers=headers)
+
+
+class ResponseCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._hits = cache_requests.labels("response", "hit")
+        self._misses = cache_requests.labels("response", "miss")
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at < time.monotonic():
+            self._misses.inc()
+            return None
+        self._entries.move_to_end(key)
+        self._hits.inc()
+        return entry
+
+    def put(self, key: Hashable, body: bytes, media_type: str = "application/json") -> CachedResponse:
+        entry = self._entries[key] = CachedResponse(
+            body, media_type, time.monotonic() + self.ttl
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        response_cache_entries.set(len(self._entries))
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        response_cache_entries.set(0)
+
+    async def respond(
+        self,
+        request: Request,
+        db: AsyncSession,
+        key: Hashable,
+        adapter: TypeAdapter,
+        build: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        cacheable = settings.RESPONSE_CACHE_ENABLED and db.info.get("read_only")
+        entry = self.get(key) if cacheable else None
+        if entry is not None:
+            record_cache_status(f"response; hit; ttl={int(entry.expires_at - time.monotonic())}")
+            return entry.response(request.headers.get("accept-encoding"))
+
+        value = await build()
+        if isinstance(value, str):
+            body = value.encode("utf-8")
+        else:
+            body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+        if not cacheable or served_stale():
+            record_cache_status("response; fwd=bypass" if not cacheable else "response; fwd=miss")
+            return Response(body, media_type="application/json")
+
+        record_cache_status("response; fwd=miss; stored")
+        return self.put(key, body).response(request.headers.get("accept-encoding"))
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_TTL_SECONDS, settings.RESPONSE_CACHE_MAX_ENTRIES
+)
+
+on_write_commit(response_cache.clear)
+data_version_watcher.subscribe(response_cache.clear)
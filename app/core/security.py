@@ -1,17 +1,76 @@
-from fastapi import Security, HTTPException, Depends
+import math
+
+from fastapi import Security, HTTPException, Depends, Response
 from fastapi.security.api_key import APIKeyHeader
-from starlette.status import HTTP_403_FORBIDDEN
+from starlette.status import HTTP_403_FORBIDDEN, HTTP_429_TOO_MANY_REQUESTS
 
+from app.core.api_keys import BOOTSTRAP_KEY, ApiKeyInfo, api_key_cache
 from app.core.config import settings
+from app.core.metrics import registry
+from app.core.rate_limit import rate_limiter
 
 API_KEY_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
+rate_limit_rejections = registry.counter(
+    "rate_limit_rejections_total",
+    "Запросы, отклонённые из-за превышения лимита API ключа",
+    ["key"],
+)
+
+
+async def get_api_key_info(api_key_header: str = Security(api_key_header)) -> ApiKeyInfo:
+    api_key_info = await api_key_cache.lookup(api_key_header)
+    if api_key_info is None:
+        raise HTTPException(
+            status_code=HTTP_403_FORBIDDEN,
+            detail="Не удалось проверить API ключ"
+        )
+    return api_key_info
+
+
+async def get_api_key(
+    api_key_header: str = Security(api_key_header),
+    api_key_info: ApiKeyInfo = Depends(get_api_key_info),
+) -> str:
+    return api_key_header
+
+
+async def get_admin_api_key(
+    api_key_header: str = Security(api_key_header),
+    api_key_info: ApiKeyInfo = Depends(get_api_key_info),
+) -> str:
+    if not api_key_info.is_admin:
+        raise HTTPException(
+            status_code=HTTP_403_FORBIDDEN,
+            detail="API ключ не имеет административного доступа"
+        )
+    return api_key_header
+
+
+class RateLimit:
+    def __init__(self, cost: float = 1):
+        self.cost = cost
+
+    async def __call__(
+        self, response: Response, api_key_info: ApiKeyInfo = Depends(get_api_key_info)
+    ) -> None:
+        if not settings.RATE_LIMIT_ENABLED or api_key_info is BOOTSTRAP_KEY:
+            return
+
+        rate_limit_per_minute = (
+            api_key_info.rate_limit_per_minute or settings.RATE_LIMIT_DEFAULT_PER_MINUTE
+        )
+        burst = api_key_info.burst or settings.RATE_LIMIT_DEFAULT_BURST
 
-async def get_api_key(api_key_header: str = Security(api_key_header)) -> str:
-    if api_key_header == settings.API_KEY:
-        return api_key_header
-    raise HTTPException(
-        status_code=HTTP_403_FORBIDDEN, 
-        detail="Не удалось проверить API ключ"
-    )
+        result = await rate_limiter.hit(
+            api_key_info.id, rate_limit_per_minute / 60, burst, self.cost
+        )
+        if not result.allowed:
+            rate_limit_rejections.labels(api_key_info.name).inc()
+            raise HTTPException(
+                status_code=HTTP_429_TOO_MANY_REQUESTS,
+                detail="Превышен лимит запросов для API ключа",
+                headers={"Retry-After": str(math.ceil(result.retry_after))},
+            )
+        response.headers["X-RateLimit-Remaining"] = str(int(result.remaining))
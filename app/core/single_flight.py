@@ -0,0 +1,97 @@
+import asyncio
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+T = TypeVar("T")
+
+single_flight_calls = registry.counter(
+    "single_flight_calls_total",
+    "Вызовы с объединением одинаковых параллельных запросов",
+    ["method", "role"],
+)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def call_key(
+    signature: inspect.Signature, self, db, args: Tuple, kwargs: Dict
+) -> Optional[Tuple]:
+    bound = signature.bind(self, db, *args, **kwargs)
+    bound.apply_defaults()
+    key = tuple(
+        (name, _freeze(value))
+        for name, value in bound.arguments.items()
+        if name not in ("self", "db")
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._leaders = single_flight_calls.labels(name, "leader")
+        self._followers = single_flight_calls.labels(name, "follower")
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            self._followers.inc()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self._leaders.inc()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+def single_flight(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    signature = inspect.signature(method)
+    group = SingleFlight(method.__qualname__)
+
+    @functools.wraps(method)
+    async def wrapper(self, db, *args, **kwargs) -> T:
+        if not settings.SINGLE_FLIGHT_ENABLED or not db.info.get("read_only"):
+            return await method(self, db, *args, **kwargs)
+
+        key = call_key(signature, self, db, args, kwargs)
+        if key is None:
+            return await method(self, db, *args, **kwargs)
+        return await group.do(key, lambda: method(self, db, *args, **kwargs))
+
+    wrapper.single_flight = group
+    return wrapper
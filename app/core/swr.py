@@ -0,0 +1,155 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from app.core.cache_status import record_cache_status
+from app.core.config import settings
+from app.core.data_version import data_version_watcher
+from app.core.metrics import cache_requests, registry
+from app.core.single_flight import call_key
+from app.db.base import UnitOfWork, on_write_commit
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+swr_refreshes = registry.counter(
+    "swr_refreshes_total",
+    "Фоновые обновления устаревших записей кэша",
+    ["cache", "result"],
+)
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "expires_at")
+
+    def __init__(self, value: Any, fresh_until: float, expires_at: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.expires_at = expires_at
+
+
+class StaleWhileRevalidateCache:
+    def __init__(self, name: str, soft_ttl: float, hard_ttl: float, max_entries: int):
+        self.name = name
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self._hits = cache_requests.labels(name, "hit")
+        self._stale = cache_requests.labels(name, "stale")
+        self._misses = cache_requests.labels(name, "miss")
+        self._refreshed = swr_refreshes.labels(name, "ok")
+        self._refresh_errors = swr_refreshes.labels(name, "error")
+
+    def get(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, now + self.soft_ttl, now + self.hard_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def mark_stale(self) -> None:
+        now = time.monotonic()
+        for entry in self._entries.values():
+            entry.fresh_until = min(entry.fresh_until, now)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def refresh(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing[key] = asyncio.get_running_loop().create_task(
+            self._refresh(key, load), context=contextvars.Context()
+        )
+
+    async def _refresh(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self.put(key, await load())
+            self._refreshed.inc()
+        except Exception as e:
+            self._refresh_errors.inc()
+            logger.warning(f"Не удалось обновить устаревшую запись кэша {self.name}: {str(e)}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def fetch(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[T]],
+        refresh: Callable[[], Awaitable[T]],
+    ) -> T:
+        entry = self.get(key)
+        if entry is not None:
+            ttl = entry.fresh_until - time.monotonic()
+            if ttl > 0:
+                self._hits.inc()
+                record_cache_status(f"{self.name}; hit; ttl={int(ttl)}")
+                return entry.value
+
+            self._stale.inc()
+            self.refresh(key, refresh)
+            record_cache_status(f"{self.name}; hit; ttl={math.floor(ttl)}", stale=True)
+            return entry.value
+
+        self._misses.inc()
+        value = await load()
+        self.put(key, value)
+        record_cache_status(f"{self.name}; fwd=miss; stored")
+        return value
+
+
+def stale_while_revalidate(
+    soft_ttl: Optional[float] = None,
+    hard_ttl: Optional[float] = None,
+    max_entries: Optional[int] = None,
+):
+    def decorator(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        signature = inspect.signature(method)
+        cache = StaleWhileRevalidateCache(
+            method.__qualname__,
+            soft_ttl if soft_ttl is not None else settings.SWR_SOFT_TTL_SECONDS,
+            hard_ttl if hard_ttl is not None else settings.SWR_HARD_TTL_SECONDS,
+            max_entries or settings.SWR_MAX_ENTRIES,
+        )
+        on_write_commit(cache.mark_stale)
+        data_version_watcher.subscribe(cache.mark_stale)
+
+        async def reload(self, args, kwargs) -> T:
+            async with UnitOfWork(read_only=True) as db:
+                return await method(self, db, *args, **kwargs)
+
+        @functools.wraps(method)
+        async def wrapper(self, db, *args, **kwargs) -> T:
+            if not settings.SWR_ENABLED or not db.info.get("read_only"):
+                record_cache_status(f"{cache.name}; fwd=bypass")
+                return await method(self, db, *args, **kwargs)
+
+            key = call_key(signature, self, db, args, kwargs)
+            if key is None:
+                return await method(self, db, *args, **kwargs)
+            return await cache.fetch(
+                key,
+                lambda: method(self, db, *args, **kwargs),
+                lambda: reload(self, args, kwargs),
+            )
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,47 @@
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+startup_duration = registry.gauge(
+    "app_startup_seconds",
+    "Длительность этапов запуска приложения",
+    ["phase"],
+)
+
+WarmUpHook = Callable[[], Awaitable[None]]
+
+
+class WarmUp:
+    def __init__(self):
+        self._hooks: List[Tuple[str, WarmUpHook]] = []
+        self.ready = False
+        self.report: Dict[str, Dict[str, object]] = {}
+
+    def register(self, name: str, hook: WarmUpHook) -> None:
+        self._hooks.append((name, hook))
+
+    async def run(self) -> None:
+        started_at = time.perf_counter()
+        for name, hook in self._hooks:
+            hook_started_at = time.perf_counter()
+            try:
+                await hook()
+                status = "ok"
+            except Exception as e:
+                logger.error(f"Ошибка прогрева {name}: {str(e)}")
+                status = "error"
+            duration = time.perf_counter() - hook_started_at
+            startup_duration.labels(name).set(duration)
+            self.report[name] = {"status": status, "duration_ms": round(duration * 1000, 1)}
+
+        duration = time.perf_counter() - started_at
+        startup_duration.labels("warmup").set(duration)
+        self.ready = True
+        logger.info(f"Прогрев завершён за {duration * 1000:.0f} мс")
+
+
+warmup = WarmUp()
@@ -1,30 +1,242 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import declarative_base, sessionmaker
+import itertools
+import time
+from contextvars import ContextVar
+from fastapi import Request
+from sqlalchemy import event, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from sqlalchemy.pool import NullPool
-from typing import AsyncGenerator
+from sqlalchemy.sql.dml import UpdateBase
+from typing import AsyncGenerator, Callable, Dict, List, Optional
 
 from app.core.config import settings
+from app.db.query_stats import query_cache_stats
+from app.db.instrumentation import instrument_engine
 
 
 Base = declarative_base()
 
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
 
-engine = create_async_engine(
-    settings.ASYNC_SQLALCHEMY_DATABASE_URI,
-    echo=settings.DB_ECHO,
-    future=True,
-    poolclass=NullPool,
+
+class LastWrite:
+    __slots__ = ("committed_at",)
+
+    def __init__(self):
+        self.committed_at: Optional[float] = None
+
+
+current_last_write: ContextVar[Optional[LastWrite]] = ContextVar(
+    "current_last_write", default=None
 )
 
 
+def create_db_engine(url: str, name: str = "primary") -> AsyncEngine:
+    options = {"query_cache_size": settings.DB_QUERY_CACHE_SIZE}
+
+    if settings.DB_POOL_SIZE > 0:
+        options["pool_size"] = settings.DB_POOL_SIZE
+        options["max_overflow"] = settings.DB_MAX_OVERFLOW
+    else:
+        options["poolclass"] = NullPool
+
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        }
+
+    async_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        future=True,
+        **options,
+    )
+    query_cache_stats.track(async_engine.sync_engine)
+    instrument_engine(async_engine.sync_engine, name)
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        from app.db.slow_queries import slow_query_log
+
+        slow_query_log.track(async_engine)
+    return async_engine
+
+
+engine = create_db_engine(settings.ASYNC_SQLALCHEMY_DATABASE_URI)
+
+replica_engines = [
+    create_db_engine(url, f"replica{index}")
+    for index, url in enumerate(settings.REPLICA_DATABASE_URIS, start=1)
+]
+
+
+class ReplicaRouter:
+    def __init__(self, engines: List[AsyncEngine], strategy: str = "round_robin"):
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Неизвестная стратегия маршрутизации: {strategy}")
+
+        self.engines = [e.sync_engine for e in engines]
+        self.strategy = strategy
+        self.active: Dict[Engine, int] = {e: 0 for e in self.engines}
+        self._counter = itertools.count()
+
+        for sync_engine in self.engines:
+            event.listen(sync_engine, "checkout", self._on_checkout(sync_engine))
+            event.listen(sync_engine, "checkin", self._on_checkin(sync_engine))
+
+    def _on_checkout(self, sync_engine: Engine):
+        def listener(dbapi_connection, connection_record, connection_proxy):
+            self.active[sync_engine] += 1
+
+        return listener
+
+    def _on_checkin(self, sync_engine: Engine):
+        def listener(dbapi_connection, connection_record):
+            self.active[sync_engine] -= 1
+
+        return listener
+
+    def choose(self) -> Optional[Engine]:
+        if not self.engines:
+            return None
+        if self.strategy == "least_connections":
+            return min(self.engines, key=self.active.__getitem__)
+        return self.engines[next(self._counter) % len(self.engines)]
+
+
+replica_router = ReplicaRouter(replica_engines, settings.REPLICA_ROUTING)
+
+
+def reset_engines_after_fork() -> None:
+    for async_engine in (engine, *replica_engines):
+        async_engine.sync_engine.dispose(close=False)
+    replica_router.active = {e: 0 for e in replica_router.engines}
+
+
+async def dispose_engines() -> None:
+    for async_engine in (engine, *replica_engines):
+        await async_engine.dispose()
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.info.get("read_only")
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            if "replica" not in self.info:
+                self.info["replica"] = replica_router.choose()
+            if self.info["replica"] is not None:
+                return self.info["replica"]
+        return engine.sync_engine
+
+
+_write_commit_callbacks: List[Callable[[], None]] = []
+
+
+def on_write_commit(callback: Callable[[], None]) -> Callable[[], None]:
+    _write_commit_callbacks.append(callback)
+    return callback
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flushed(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def _bump_data_version(session) -> None:
+    if session.info.get("bookkeeping"):
+        return
+    if not (session.info.get("wrote") or session.new or session.dirty or session.deleted):
+        return
+    from app.db.models import DATA_VERSION, DataVersion
+
+    session.execute(
+        update(DataVersion)
+        .where(DataVersion.name == DATA_VERSION)
+        .values(version=DataVersion.version + 1)
+    )
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _notify_write_commit(session) -> None:
+    if session.info.pop("wrote", False) and not session.info.get("bookkeeping"):
+        session.info["committed_write"] = True
+        for callback in _write_commit_callbacks:
+            callback()
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _forget_writes(session, previous_transaction) -> None:
+    session.info.pop("wrote", None)
+
+
 async_session_factory = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    autoflush=False,
 )
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
+class UnitOfWork:
+    def __init__(
+        self, session_factory: Optional[sessionmaker] = None, read_only: bool = False
+    ):
+        self.session_factory = session_factory or async_session_factory
+        self.read_only = read_only
+        self.session: Optional[AsyncSession] = None
+
+    async def __aenter__(self) -> AsyncSession:
+        self.session = self.session_factory()
+        self.session.info["read_only"] = self.read_only
+        return self.session
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
         try:
-            yield session
+            if exc_type is not None:
+                await self.session.rollback()
+            elif not self.read_only and self.session.in_transaction():
+                await self.session.commit()
         finally:
-            await session.close()
+            await self.session.close()
+
+
+def _wrote_recently(request: Request) -> bool:
+    last_write = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(
+        LAST_WRITE_COOKIE
+    )
+    try:
+        elapsed = time.time() - float(last_write)
+    except (TypeError, ValueError):
+        return False
+    return (
+        -settings.READ_YOUR_WRITES_CLOCK_SKEW_SECONDS
+        <= elapsed
+        < settings.READ_YOUR_WRITES_SECONDS
+    )
+
+
+async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    read_only = request.method in ("GET", "HEAD") and not _wrote_recently(request)
+
+    async with UnitOfWork(read_only=read_only) as session:
+        yield session
+
+    # Метку записи выставляет LastWriteMiddleware, только если коммит что-то записал.
+    last_write = current_last_write.get()
+    if last_write is not None and session.info.get("committed_write"):
+        last_write.committed_at = time.time()
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with UnitOfWork(read_only=not _wrote_recently(request)) as session:
+        yield session
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import UnitOfWork, dispose_engines
+from app.db.repositories.activity_repository import ActivityRepository
+from app.db.repositories.organization_document_repository import (
+    OrganizationDocumentRepository,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_documents() -> int:
+    started_at = time.perf_counter()
+    async with UnitOfWork() as db:
+        count = await OrganizationDocumentRepository().rebuild(db)
+    logger.info(
+        f"Документы организаций перестроены: {count} за "
+        f"{(time.perf_counter() - started_at) * 1000:.0f} мс"
+    )
+    return count
+
+
+async def ensure_documents() -> None:
+    async with UnitOfWork(read_only=True) as db:
+        complete = await OrganizationDocumentRepository().is_complete(db)
+    if complete:
+        logger.info("Документы организаций актуальны, перестроение пропущено")
+        return
+    await rebuild_documents()
+
+
+REFRESH_BUILDING_DOCUMENTS = "documents.building"
+REFRESH_ACTIVITY_DOCUMENTS = "documents.activity"
+REFRESH_ORGANIZATION_DOCUMENTS = "documents.organizations"
+
+
+async def refresh_building_documents(db: AsyncSession, payloads: List[Dict[str, Any]]) -> None:
+    repository = OrganizationDocumentRepository()
+    organization_ids = await repository.get_organization_ids_by_buildings(
+        db, {payload["building_id"] for payload in payloads}
+    )
+    await repository.refresh(db, organization_ids)
+
+
+async def refresh_activity_documents(db: AsyncSession, payloads: List[Dict[str, Any]]) -> None:
+    repository = OrganizationDocumentRepository()
+    activity_ids = {payload["activity_id"] for payload in payloads}
+    moved_ids = {payload["activity_id"] for payload in payloads if payload.get("subtree")}
+    if moved_ids:
+        activity_ids |= await ActivityRepository().get_descendant_ids(db, moved_ids)
+    organization_ids = await repository.get_organization_ids_by_activities(
+        db, activity_ids
+    )
+    await repository.refresh(db, organization_ids)
+
+
+async def refresh_organization_documents(
+    db: AsyncSession, payloads: List[Dict[str, Any]]
+) -> None:
+    organization_ids = {
+        organization_id
+        for payload in payloads
+        for organization_id in payload["organization_ids"]
+    }
+    await OrganizationDocumentRepository().refresh(db, organization_ids)
+
+
+def register_jobs(queue) -> None:
+    queue.register(REFRESH_BUILDING_DOCUMENTS, refresh_building_documents)
+    queue.register(REFRESH_ACTIVITY_DOCUMENTS, refresh_activity_documents)
+    queue.register(REFRESH_ORGANIZATION_DOCUMENTS, refresh_organization_documents)
+
+
+async def main() -> None:
+    try:
+        await rebuild_documents()
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
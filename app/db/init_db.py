@@ -1,5 +1,6 @@
 import logging
 from sqlalchemy import select, insert
+from app.core.phones import phone_values
 from app.db.base import async_session_factory
 from app.db.models import (
     Building,
@@ -17,8 +18,8 @@ async def init_db():
     logger.info("Creating initial test data...")
 
     async with async_session_factory() as db:
-        result = await db.execute(select(Building))
-        if result.scalars().first():
+        result = await db.execute(select(Building.id).limit(1))
+        if result.scalar() is not None:
             logger.info("Database already contains data, skipping initialization")
             return
 
@@ -179,9 +180,9 @@ async def init_db():
             await db.commit()
             await db.refresh(org1)
 
-            phone1_1 = PhoneNumber(number="2-222-222", organization_id=org1.id)
-            phone1_2 = PhoneNumber(number="3-333-333", organization_id=org1.id)
-            phone1_3 = PhoneNumber(number="8-923-666-13-13", organization_id=org1.id)
+            phone1_1 = PhoneNumber(**phone_values("2-222-222"), organization_id=org1.id)
+            phone1_2 = PhoneNumber(**phone_values("3-333-333"), organization_id=org1.id)
+            phone1_3 = PhoneNumber(**phone_values("8-923-666-13-13"), organization_id=org1.id)
             db.add_all([phone1_1, phone1_2, phone1_3])
             await db.commit()
 
@@ -200,8 +201,8 @@ async def init_db():
             await db.commit()
             await db.refresh(org2)
 
-            phone2_1 = PhoneNumber(number="7-777-777", organization_id=org2.id)
-            phone2_2 = PhoneNumber(number="8-800-555-35-35", organization_id=org2.id)
+            phone2_1 = PhoneNumber(**phone_values("7-777-777"), organization_id=org2.id)
+            phone2_2 = PhoneNumber(**phone_values("8-800-555-35-35"), organization_id=org2.id)
             db.add_all([phone2_1, phone2_2])
             await db.commit()
 
@@ -223,7 +224,7 @@ async def init_db():
             await db.commit()
             await db.refresh(org3)
 
-            phone3_1 = PhoneNumber(number="4-444-444", organization_id=org3.id)
+            phone3_1 = PhoneNumber(**phone_values("4-444-444"), organization_id=org3.id)
             db.add(phone3_1)
             await db.commit()
 
@@ -243,8 +244,8 @@ async def init_db():
             await db.commit()
             await db.refresh(org4)
 
-            phone4_1 = PhoneNumber(number="5-555-555", organization_id=org4.id)
-            phone4_2 = PhoneNumber(number="9-999-999", organization_id=org4.id)
+            phone4_1 = PhoneNumber(**phone_values("5-555-555"), organization_id=org4.id)
+            phone4_2 = PhoneNumber(**phone_values("9-999-999"), organization_id=org4.id)
             db.add_all([phone4_1, phone4_2])
             await db.commit()
 
@@ -265,7 +266,7 @@ async def init_db():
             await db.commit()
             await db.refresh(org5)
 
-            phone5_1 = PhoneNumber(number="6-666-666", organization_id=org5.id)
+            phone5_1 = PhoneNumber(**phone_values("6-666-666"), organization_id=org5.id)
             db.add(phone5_1)
             await db.commit()
 
@@ -285,8 +286,8 @@ async def init_db():
             await db.commit()
             await db.refresh(org6)
 
-            phone6_1 = PhoneNumber(number="1-111-111", organization_id=org6.id)
-            phone6_2 = PhoneNumber(number="8-912-345-67-89", organization_id=org6.id)
+            phone6_1 = PhoneNumber(**phone_values("1-111-111"), organization_id=org6.id)
+            phone6_2 = PhoneNumber(**phone_values("8-912-345-67-89"), organization_id=org6.id)
             db.add_all([phone6_1, phone6_2])
             await db.commit()
 
@@ -0,0 +1,101 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import registry
+
+
+class RequestDBStats:
+    __slots__ = ("scope", "queries", "duration", "rows", "marked_at", "marked_duration")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.queries = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.marked_at = 0.0
+        self.marked_duration = 0.0
+
+    def mark(self) -> None:
+        self.marked_at = time.perf_counter()
+        self.marked_duration = self.duration
+
+
+def route_label(scope) -> str:
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+
+    path = scope.get("path", "")
+    try:
+        rendered = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+
+    if rendered != path and path.endswith(rendered):
+        return path[: len(path) - len(rendered)] + template
+    return template
+
+
+current_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar(
+    "current_db_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started_at"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_db_stats.get()
+    if stats is None:
+        return
+
+    started_at = conn.info.pop("query_started_at", None)
+    if started_at is not None:
+        stats.duration += time.perf_counter() - started_at
+    stats.queries += 1
+    stats.rows += max(getattr(cursor, "rowcount", -1), 0)
+
+
+db_pool_connections = registry.gauge(
+    "db_pool_connections",
+    "Соединения пула базы данных по состояниям",
+    ["engine", "state"],
+)
+db_pool_size = registry.gauge(
+    "db_pool_size",
+    "Размер пула соединений базы данных",
+    ["engine"],
+)
+
+
+def _pool_collector(sync_engine: Engine, name: str):
+    pool = sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+
+    size = db_pool_size.labels(name)
+    checked_out = db_pool_connections.labels(name, "checked_out")
+    idle = db_pool_connections.labels(name, "idle")
+    overflow = db_pool_connections.labels(name, "overflow")
+
+    def collect() -> None:
+        size.set(pool.size())
+        checked_out.set(pool.checkedout())
+        idle.set(pool.checkedin())
+        overflow.set(max(pool.overflow(), 0))
+
+    return collect
+
+
+def instrument_engine(sync_engine: Engine, name: str = "primary") -> None:
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+    collector = _pool_collector(sync_engine, name)
+    if collector is not None:
+        registry.add_collector(collector)
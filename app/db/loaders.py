@@ -0,0 +1,173 @@
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.metrics import cache_requests
+from app.db.base import RoutingSession
+from app.db.models import Activity, Building, Organization, PhoneNumber, organization_activity
+
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+MAX_BATCH_SIZE = 1000
+
+
+class DataLoader(Generic[KeyType, ValueType]):
+    def __init__(
+        self,
+        batch_load_fn: Callable[[List[KeyType]], Awaitable[Dict[KeyType, ValueType]]],
+        default: Callable[[], Optional[ValueType]] = lambda: None,
+        name: str = "loader",
+        max_batch_size: int = MAX_BATCH_SIZE,
+    ):
+        self.batch_load_fn = batch_load_fn
+        self.default = default
+        self.max_batch_size = max_batch_size
+        self.cache: Dict[KeyType, Optional[ValueType]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._hits_total = cache_requests.labels(name, "hit")
+        self._misses_total = cache_requests.labels(name, "miss")
+
+    async def load(self, key: KeyType) -> Optional[ValueType]:
+        return (await self.load_many([key]))[key]
+
+    async def load_many(
+        self, keys: Iterable[KeyType]
+    ) -> Dict[KeyType, Optional[ValueType]]:
+        keys = [key for key in dict.fromkeys(keys) if key is not None]
+        missing = [key for key in keys if key not in self.cache]
+
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        self._hits_total.inc(len(keys) - len(missing))
+        self._misses_total.inc(len(missing))
+
+        for start in range(0, len(missing), self.max_batch_size):
+            batch = missing[start:start + self.max_batch_size]
+            loaded = await self.batch_load_fn(batch)
+            for key in batch:
+                self.cache[key] = loaded[key] if key in loaded else self.default()
+
+        return {key: self.cache[key] for key in keys}
+
+    def prime(self, key: KeyType, value: ValueType) -> None:
+        self.cache[key] = value
+
+
+_buildings_by_ids_query = select(Building).where(
+    Building.id.in_(bindparam("ids", expanding=True))
+)
+
+_activities_by_ids_query = select(Activity).where(
+    Activity.id.in_(bindparam("ids", expanding=True))
+)
+
+_phones_by_organization_ids_query = (
+    select(PhoneNumber)
+    .where(PhoneNumber.organization_id.in_(bindparam("ids", expanding=True)))
+    .order_by(PhoneNumber.id)
+)
+
+_activities_by_organization_ids_query = (
+    select(organization_activity.c.organization_id, Activity)
+    .join(Activity, Activity.id == organization_activity.c.activity_id)
+    .where(organization_activity.c.organization_id.in_(bindparam("ids", expanding=True)))
+)
+
+
+class RequestLoaders:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.buildings: DataLoader[int, Building] = DataLoader(
+            self._load_buildings, name="loader_buildings"
+        )
+        self.activities: DataLoader[int, Activity] = DataLoader(
+            self._load_activities, name="loader_activities"
+        )
+        self.phone_numbers: DataLoader[int, List[PhoneNumber]] = DataLoader(
+            self._load_phone_numbers, default=list, name="loader_phone_numbers"
+        )
+        self.organization_activities: DataLoader[int, List[Activity]] = DataLoader(
+            self._load_organization_activities,
+            default=list,
+            name="loader_organization_activities",
+        )
+
+    async def _load_buildings(self, ids: List[int]) -> Dict[int, Building]:
+        result = await self.db.execute(_buildings_by_ids_query, {"ids": ids})
+        return {building.id: building for building in result.scalars().all()}
+
+    async def _load_activities(self, ids: List[int]) -> Dict[int, Activity]:
+        result = await self.db.execute(_activities_by_ids_query, {"ids": ids})
+        return {activity.id: activity for activity in result.scalars().all()}
+
+    async def _load_phone_numbers(self, ids: List[int]) -> Dict[int, List[PhoneNumber]]:
+        result = await self.db.execute(_phones_by_organization_ids_query, {"ids": ids})
+        phones = defaultdict(list)
+        for phone in result.scalars().all():
+            phones[phone.organization_id].append(phone)
+        return phones
+
+    async def _load_organization_activities(
+        self, ids: List[int]
+    ) -> Dict[int, List[Activity]]:
+        result = await self.db.execute(
+            _activities_by_organization_ids_query, {"ids": ids}
+        )
+        activities = defaultdict(list)
+        for organization_id, activity in result:
+            self.activities.prime(activity.id, activity)
+            activities[organization_id].append(activity)
+        return activities
+
+    async def attach_organization_relations(
+        self, organizations: List[Organization]
+    ) -> List[Organization]:
+        if not organizations:
+            return organizations
+
+        organization_ids = [org.id for org in organizations]
+        buildings = await self.buildings.load_many(org.building_id for org in organizations)
+        phone_numbers = await self.phone_numbers.load_many(organization_ids)
+        activities = await self.organization_activities.load_many(organization_ids)
+
+        for org in organizations:
+            set_committed_value(org, "building", buildings.get(org.building_id))
+            set_committed_value(org, "phone_numbers", list(phone_numbers[org.id]))
+            set_committed_value(org, "activities", list(activities[org.id]))
+
+        return organizations
+
+
+def get_loaders(db: AsyncSession) -> RequestLoaders:
+    loaders = db.info.get("loaders")
+    if loaders is None:
+        loaders = db.info["loaders"] = RequestLoaders(db)
+    return loaders
+
+
+# После записи закэшированные связи могут устареть: следующий get_loaders создаст новые.
+@event.listens_for(RoutingSession, "after_flush")
+def _reset_loaders_after_flush(session, flush_context) -> None:
+    session.info.pop("loaders", None)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _reset_loaders_after_bulk_write(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info.pop("loaders", None)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _reset_loaders_after_commit(session) -> None:
+    session.info.pop("loaders", None)
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _reset_loaders_after_rollback(session, previous_transaction) -> None:
+    session.info.pop("loaders", None)
@@ -1,50 +1,130 @@
-import os
-import subprocess
-import logging
 import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
 
-from app.db.init_db import init_db
 from app.core.config import settings
+from app.db.base import engine, dispose_engines
+from app.db.documents import ensure_documents
+from app.db.init_db import init_db
+from app.db.models import Building
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MIGRATIONS_LOCK_ID = 4_829_310_117
 
-def run_migrations() -> None:
-    logger.info("Запуск миграций базы данных")
-
-    try:
-        if not os.path.exists("alembic/versions"):
-            os.makedirs("alembic/versions", exist_ok=True)
 
+async def wait_for_database() -> None:
+    delay = settings.DB_CONNECT_BACKOFF_SECONDS
+    for attempt in range(1, settings.DB_CONNECT_ATTEMPTS + 1):
         try:
-            subprocess.run(
-                ["alembic", "current"], check=True, capture_output=True, text=True
-            )
-        except subprocess.CalledProcessError:
-            logger.info("Создание начальной миграции")
-            subprocess.run(
-                ["alembic", "revision", "--autogenerate", "-m", "Initial migration"],
-                check=True,
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return
+        except (OSError, SQLAlchemyError) as e:
+            if attempt == settings.DB_CONNECT_ATTEMPTS:
+                logger.error(f"База данных недоступна после {attempt} попыток: {e}")
+                raise
+            logger.info(
+                f"База данных недоступна (попытка {attempt}/{settings.DB_CONNECT_ATTEMPTS}), "
+                f"повтор через {delay:.1f} с"
             )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.DB_CONNECT_MAX_BACKOFF_SECONDS)
+
+
+@asynccontextmanager
+async def migrations_lock(conn: AsyncConnection):
+    if conn.dialect.name != "postgresql":
+        yield
+        return
+
+    await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATIONS_LOCK_ID})
+    await conn.commit()
+    try:
+        yield
+    finally:
+        await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATIONS_LOCK_ID})
+        await conn.commit()
 
-        logger.info("Применение миграций")
-        subprocess.run(["alembic", "upgrade", "head"], check=True)
 
-        logger.info("Миграции успешно применены")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Ошибка при выполнении миграций: {e}")
-        raise
-    except Exception as e:
-        logger.error(f"Неожиданная ошибка при выполнении миграций: {e}")
-        raise
+def _upgrade(connection, revision: str = "head") -> None:
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "app" / "migrations"))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, revision)
 
 
-async def setup_db() -> None:
-    run_migrations()
+async def run_migrations(conn: AsyncConnection) -> None:
+    logger.info("Применение миграций")
+    await conn.run_sync(_upgrade)
+    await conn.commit()
 
-    await init_db()
+
+async def is_seeded(conn: AsyncConnection) -> bool:
+    seeded = await conn.scalar(select(Building.id).limit(1)) is not None
+    await conn.commit()
+    return seeded
+
+
+async def setup_db() -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    started_at = time.perf_counter()
+
+    await wait_for_database()
+    timings["wait_for_database"] = time.perf_counter() - started_at
+
+    async with engine.connect() as conn:
+        phase_started_at = time.perf_counter()
+        async with migrations_lock(conn):
+            timings["lock"] = time.perf_counter() - phase_started_at
+
+            phase_started_at = time.perf_counter()
+            await run_migrations(conn)
+            timings["migrations"] = time.perf_counter() - phase_started_at
+
+            phase_started_at = time.perf_counter()
+            if await is_seeded(conn):
+                logger.info("База данных уже содержит данные, заполнение пропущено")
+            else:
+                await init_db()
+            timings["seed"] = time.perf_counter() - phase_started_at
+
+            phase_started_at = time.perf_counter()
+            await ensure_documents()
+            timings["documents"] = time.perf_counter() - phase_started_at
+
+    timings["total"] = time.perf_counter() - started_at
+    logger.info(
+        "Подготовка базы данных завершена за {:.0f} мс ({})".format(
+            timings["total"] * 1000,
+            ", ".join(
+                f"{phase}: {duration * 1000:.0f} мс"
+                for phase, duration in timings.items()
+                if phase != "total"
+            ),
+        )
+    )
+    return timings
+
+
+async def main() -> None:
+    try:
+        await setup_db()
+    finally:
+        await dispose_engines()
 
 
 if __name__ == "__main__":
-    asyncio.run(setup_db())
+    asyncio.run(main())
@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Table
+from sqlalchemy import DDL, JSON, Boolean, Column, DateTime, Index, Integer, String, Float, ForeignKey, Table, event, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
 
+_digits_type = String(16).with_variant(String(16, collation="C"), "postgresql")
+
 organization_activity = Table(
     "organization_activity",
     Base.metadata,
@@ -34,6 +37,10 @@ class Building(Base):
         "Organization", back_populates="building", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_buildings_latitude_longitude", "latitude", "longitude"),
+    )
+
 
 class Activity(Base):
     __tablename__ = "activities"
@@ -55,12 +62,19 @@ class PhoneNumber(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     number = Column(String, nullable=False)
+    number_normalized = Column(_digits_type, nullable=True)
+    number_reversed = Column(_digits_type, nullable=True)
     organization_id = Column(
         Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
     )
 
     organization = relationship("Organization", back_populates="phone_numbers")
 
+    __table_args__ = (
+        Index("ix_phone_numbers_number_normalized", "number_normalized"),
+        Index("ix_phone_numbers_number_reversed", "number_reversed"),
+    )
+
 
 class Organization(Base):
     __tablename__ = "organizations"
@@ -72,3 +86,92 @@ class Organization(Base):
     building = relationship("Building", back_populates="organizations")
     phone_numbers = relationship("PhoneNumber", back_populates="organization", cascade="all, delete-orphan")
     activities = relationship("Activity", secondary="organization_activity", back_populates="organizations")
+
+
+class OrganizationDocument(Base):
+    __tablename__ = "organization_documents"
+
+    organization_id = Column(
+        Integer, ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
+    document = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    summary = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class OrganizationGeoIndex(Base):
+    __tablename__ = "organization_geo_index"
+
+    activity_id = Column(
+        Integer, ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True
+    )
+    geohash = Column(String(12), primary_key=True)
+    organization_id = Column(
+        Integer, ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
+    depth = Column(Integer, nullable=False, default=0, server_default="0")
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_organization_geo_index_organization_id", "organization_id"),
+    )
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    idempotency_key = Column(String, nullable=True)
+    status = Column(String(16), nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=5, server_default="5")
+    last_error = Column(String, nullable=True)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+        Index(
+            "ix_jobs_pending_idempotency_key",
+            "idempotency_key",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
+
+class ApiKey(Base):
+    __tablename__ = "api_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    key_prefix = Column(String(8), nullable=False)
+    key_hash = Column(String(64), nullable=False, unique=True)
+    is_active = Column(Boolean, nullable=False, default=True, server_default="true")
+    is_admin = Column(Boolean, nullable=False, default=False, server_default="false")
+    rate_limit_per_minute = Column(Integer, nullable=True)
+    burst = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+DATA_VERSION = "data"
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    name = Column(String(32), primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+event.listen(
+    DataVersion.__table__,
+    "after_create",
+    DDL(f"INSERT INTO data_versions (name, version) VALUES ('{DATA_VERSION}', 0)"),
+)
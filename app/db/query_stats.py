@@ -0,0 +1,44 @@
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+
+from app.core.metrics import registry
+
+
+class QueryCacheStats:
+    def __init__(self):
+        self.counts: Dict[CacheStats, int] = {stat: 0 for stat in CacheStats}
+
+    def track(self, sync_engine: Engine) -> None:
+        event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            self.counts[context.cache_hit] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        hits = self.counts[CacheStats.CACHE_HIT]
+        misses = self.counts[CacheStats.CACHE_MISS]
+        cacheable = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "uncached": sum(self.counts.values()) - cacheable,
+            "hit_rate": round(hits / cacheable, 4) if cacheable else None,
+        }
+
+    def collect(self) -> None:
+        for stat, count in self.counts.items():
+            compiled_cache_lookups.labels(stat.name.lower()).set(count)
+
+
+compiled_cache_lookups = registry.counter(
+    "sqlalchemy_compiled_cache_total",
+    "Обращения к кэшу скомпилированных SQL-выражений",
+    ["result"],
+)
+
+query_cache_stats = QueryCacheStats()
+registry.add_collector(query_cache_stats.collect)
@@ -1,18 +1,32 @@
-from typing import List, Optional, Set
-from sqlalchemy import select, func
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import select, func, or_, bindparam, String
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.db.repositories.base_repository import BaseRepository
+from app.db.loaders import get_loaders
 from app.db.models import Activity
 from app.domain.models.activity import ActivityCreate, ActivityUpdate
 
 
+_children_query = select(Activity).where(Activity.parent_id == bindparam("parent_id"))
+
+_parent_id_query = select(Activity.parent_id).where(Activity.id == bindparam("activity_id"))
+
+_by_name_query = select(Activity).where(
+    func.lower(Activity.name) == func.lower(bindparam("name", type_=String))
+)
+
+
 class ActivityRepository(BaseRepository[Activity, ActivityCreate, ActivityUpdate]):
 
     def __init__(self):
         super().__init__(Activity)
 
+    async def get(self, db: AsyncSession, id: int) -> Optional[Activity]:
+        return await get_loaders(db).activities.load(id)
+
     async def get_root_activities(self, db: AsyncSession) -> List[Activity]:
         query = (
             select(Activity)
@@ -33,20 +47,33 @@ class ActivityRepository(BaseRepository[Activity, ActivityCreate, ActivityUpdate
         result = await db.execute(query)
         return result.scalars().first()
 
-    async def get_activity_tree(self, db: AsyncSession) -> List[Activity]:
-        query = (
-            select(Activity)
-            .where(Activity.parent_id.is_(None))
-            .options(selectinload(Activity.children))
-        )
+    async def get_children_by_parent_ids(
+        self, db: AsyncSession, parent_ids: List[Optional[int]]
+    ) -> List[Activity]:
+        ids = [parent_id for parent_id in parent_ids if parent_id is not None]
+        condition = Activity.parent_id.in_(ids)
+        if len(ids) != len(parent_ids):
+            condition = or_(condition, Activity.parent_id.is_(None))
+
+        query = select(Activity).where(condition).order_by(Activity.id)
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_activity_tree(self, db: AsyncSession) -> List[Activity]:
+        result = await db.execute(select(Activity).order_by(Activity.id))
+        activities = result.scalars().all()
+
+        children: Dict[Optional[int], List[Activity]] = {}
+        for activity in activities:
+            children.setdefault(activity.parent_id, []).append(activity)
+        for activity in activities:
+            set_committed_value(activity, "children", children.get(activity.id, []))
+        return children.get(None, [])
+
     async def get_all_child_ids(self, db: AsyncSession, activity_id: int) -> Set[int]:
         result = {activity_id}
 
-        query = select(Activity).where(Activity.parent_id == activity_id)
-        db_result = await db.execute(query)
+        db_result = await db.execute(_children_query, {"parent_id": activity_id})
         children = db_result.scalars().all()
 
         for child in children:
@@ -64,8 +91,7 @@ class ActivityRepository(BaseRepository[Activity, ActivityCreate, ActivityUpdate
         current_id = parent_id
 
         while current_id is not None:
-            query = select(Activity.parent_id).where(Activity.id == current_id)
-            result = await db.execute(query)
+            result = await db.execute(_parent_id_query, {"activity_id": current_id})
             parent_id = result.scalar_one_or_none()
 
             if parent_id is not None:
@@ -76,9 +102,30 @@ class ActivityRepository(BaseRepository[Activity, ActivityCreate, ActivityUpdate
 
         return depth
 
-    async def get_by_name(self, db: AsyncSession, name: str) -> Optional[Activity]:
-        query = select(Activity).where(func.lower(Activity.name) == func.lower(name))
+    async def get_parent_map(self, db: AsyncSession) -> Dict[int, Optional[int]]:
+        query = select(Activity.id, Activity.parent_id)
         result = await db.execute(query)
+        return {row.id: row.parent_id for row in result}
+
+    async def get_descendant_ids(
+        self, db: AsyncSession, activity_ids: Iterable[int]
+    ) -> Set[int]:
+        children: Dict[Optional[int], List[int]] = {}
+        for activity_id, parent_id in (await self.get_parent_map(db)).items():
+            children.setdefault(parent_id, []).append(activity_id)
+
+        result: Set[int] = set()
+        stack = list(activity_ids)
+        while stack:
+            activity_id = stack.pop()
+            if activity_id in result:
+                continue
+            result.add(activity_id)
+            stack.extend(children.get(activity_id, ()))
+        return result
+
+    async def get_by_name(self, db: AsyncSession, name: str) -> Optional[Activity]:
+        result = await db.execute(_by_name_query, {"name": name})
         return result.scalars().first()
 
     async def search_by_name(self, db: AsyncSession, name: str) -> List[Activity]:
@@ -98,6 +145,5 @@ class ActivityRepository(BaseRepository[Activity, ActivityCreate, ActivityUpdate
         
         db_obj = Activity(**obj_in_data)
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await db.flush()
         return db_obj
@@ -0,0 +1,34 @@
+from typing import List, Optional
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.base_repository import BaseRepository
+from app.db.models import ApiKey
+from app.domain.models.api_key import ApiKeyCreate
+
+
+_active_keys_query = select(ApiKey).where(ApiKey.is_active.is_(True))
+
+_by_hash_query = _active_keys_query.where(ApiKey.key_hash == bindparam("key_hash"))
+
+
+class ApiKeyRepository(BaseRepository[ApiKey, ApiKeyCreate, ApiKeyCreate]):
+    def __init__(self):
+        super().__init__(ApiKey)
+
+    async def get_active(self, db: AsyncSession) -> List[ApiKey]:
+        result = await db.execute(_active_keys_query)
+        return result.scalars().all()
+
+    async def get_active_by_hash(self, db: AsyncSession, key_hash: str) -> Optional[ApiKey]:
+        result = await db.execute(_by_hash_query, {"key_hash": key_hash})
+        return result.scalars().first()
+
+    async def create_with_hash(
+        self, db: AsyncSession, *, obj_in: ApiKeyCreate, key_prefix: str, key_hash: str
+    ) -> ApiKey:
+        db_obj = ApiKey(**obj_in.model_dump(), key_prefix=key_prefix, key_hash=key_hash)
+        db.add(db_obj)
+        await db.flush()
+        await db.refresh(db_obj)
+        return db_obj
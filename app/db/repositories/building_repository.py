@@ -1,16 +1,56 @@
-from typing import List, Optional
-from sqlalchemy import select, and_
+from typing import Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import select, and_, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.repositories.base_repository import BaseRepository
-from app.db.models import Building
+from app.db.loaders import get_loaders
+from app.db.models import Building, Organization, organization_activity
 from app.domain.models.building import BuildingCreate, BuildingUpdate
 
 
+_in_rectangle_query = select(Building).where(
+    and_(
+        Building.latitude >= bindparam("min_lat"),
+        Building.latitude <= bindparam("max_lat"),
+        Building.longitude >= bindparam("min_lon"),
+        Building.longitude <= bindparam("max_lon"),
+    )
+)
+
+_coordinates_in_rectangle_query = select(
+    Building.id, Building.latitude, Building.longitude
+).where(
+    and_(
+        Building.latitude >= bindparam("min_lat"),
+        Building.latitude <= bindparam("max_lat"),
+        Building.longitude >= bindparam("min_lon"),
+        Building.longitude <= bindparam("max_lon"),
+    )
+)
+
+_coordinates_with_activities_query = _coordinates_in_rectangle_query.where(
+    Building.id.in_(
+        select(Organization.building_id)
+        .join(
+            organization_activity,
+            organization_activity.c.organization_id == Organization.id,
+        )
+        .where(
+            organization_activity.c.activity_id.in_(
+                bindparam("activity_ids", expanding=True)
+            )
+        )
+    )
+)
+
+
 class BuildingRepository(BaseRepository[Building, BuildingCreate, BuildingUpdate]):
     def __init__(self):
         super().__init__(Building)
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[Building]:
+        return await get_loaders(db).buildings.load(id)
     
     async def get_with_organizations(self, db: AsyncSession, building_id: int) -> Optional[Building]:
         query = (
@@ -31,18 +71,15 @@ class BuildingRepository(BaseRepository[Building, BuildingCreate, BuildingUpdate
         min_lon = longitude - radius_degrees
         max_lon = longitude + radius_degrees
         
-        query = (
-            select(Building)
-            .where(
-                and_(
-                    Building.latitude >= min_lat,
-                    Building.latitude <= max_lat,
-                    Building.longitude >= min_lon,
-                    Building.longitude <= max_lon
-                )
-            )
+        result = await db.execute(
+            _in_rectangle_query,
+            {
+                "min_lat": min_lat,
+                "max_lat": max_lat,
+                "min_lon": min_lon,
+                "max_lon": max_lon,
+            },
         )
-        result = await db.execute(query)
         buildings = result.scalars().all()
         
         result_buildings = []
@@ -57,16 +94,60 @@ class BuildingRepository(BaseRepository[Building, BuildingCreate, BuildingUpdate
     async def get_buildings_in_rectangle(
         self, db: AsyncSession, min_lat: float, min_lon: float, max_lat: float, max_lon: float
     ) -> List[Building]:
-        query = (
-            select(Building)
-            .where(
-                and_(
-                    Building.latitude >= min_lat,
-                    Building.latitude <= max_lat,
-                    Building.longitude >= min_lon,
-                    Building.longitude <= max_lon
-                )
-            )
+        result = await db.execute(
+            _in_rectangle_query,
+            {
+                "min_lat": min_lat,
+                "max_lat": max_lat,
+                "min_lon": min_lon,
+                "max_lon": max_lon,
+            },
         )
-        result = await db.execute(query)
         return result.scalars().all()
+
+    async def get_coordinates(
+        self,
+        db: AsyncSession,
+        bbox: Tuple[float, float, float, float],
+        activity_ids: Optional[Iterable[int]] = None,
+    ):
+        import numpy as np
+
+        min_lat, min_lon, max_lat, max_lon = bbox
+        params = {
+            "min_lat": min_lat,
+            "max_lat": max_lat,
+            "min_lon": min_lon,
+            "max_lon": max_lon,
+        }
+        query = _coordinates_in_rectangle_query
+        if activity_ids is not None:
+            query = _coordinates_with_activities_query
+            params["activity_ids"] = list(activity_ids)
+
+        rows = (await db.execute(query, params)).all()
+        return (
+            np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows)),
+            np.fromiter((row.latitude for row in rows), dtype=float, count=len(rows)),
+            np.fromiter((row.longitude for row in rows), dtype=float, count=len(rows)),
+        )
+
+    async def get_building_ids_in_area(self, db: AsyncSession, area) -> List[int]:
+        ids, latitudes, longitudes = await self.get_coordinates(db, area.bbox)
+        if not len(ids):
+            return []
+        return ids[area.contains(latitudes, longitudes)].tolist()
+
+    async def get_building_ids_in_polygon(
+        self, db: AsyncSession, points: Sequence[Tuple[float, float]]
+    ) -> List[int]:
+        from app.core.geo import PolygonArea
+
+        return await self.get_building_ids_in_area(db, PolygonArea(points))
+
+    async def get_building_ids_along_route(
+        self, db: AsyncSession, points: Sequence[Tuple[float, float]], distance: float
+    ) -> List[int]:
+        from app.core.geo import RouteCorridor
+
+        return await self.get_building_ids_in_area(db, RouteCorridor(points, distance))
@@ -0,0 +1,13 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import DATA_VERSION, DataVersion
+
+
+_version_query = select(DataVersion.version).where(DataVersion.name == DATA_VERSION)
+
+
+class DataVersionRepository:
+    async def get_version(self, db: AsyncSession) -> Optional[int]:
+        return await db.scalar(_version_query)
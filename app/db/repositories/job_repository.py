@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import delete, exists, func, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.db.models import Job
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+_insert_by_dialect = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+SUPERSEDED = "Заменена ожидающей задачей с тем же ключом"
+
+_other = aliased(Job)
+
+_has_pending_duplicate = exists().where(
+    _other.idempotency_key == Job.idempotency_key,
+    _other.status == "pending",
+    _other.id != Job.id,
+)
+
+
+class JobRepository:
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        *,
+        kind: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        max_attempts: int = 5,
+        run_at: Optional[datetime] = None,
+    ) -> None:
+        now = utcnow()
+        values = {
+            "kind": kind,
+            "payload": payload,
+            "idempotency_key": idempotency_key,
+            "status": "pending",
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "run_at": run_at or now,
+            "created_at": now,
+        }
+        insert = _insert_by_dialect.get(db.get_bind().dialect.name)
+        if insert is None or idempotency_key is None:
+            db.add(Job(**values))
+            await db.flush()
+            return
+
+        await db.execute(
+            insert(Job)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=[Job.idempotency_key],
+                index_where=text("status = 'pending'"),
+            )
+        )
+
+    async def claim(self, db: AsyncSession, *, limit: int) -> Sequence[Row]:
+        now = utcnow()
+        ids_query = (
+            select(Job.id)
+            .where(Job.status == "pending", Job.run_at <= now)
+            .order_by(Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        ids = (await db.execute(ids_query)).scalars().all()
+        if not ids:
+            return []
+
+        result = await db.execute(
+            update(Job)
+            .where(Job.id.in_(ids))
+            .values(status="running", locked_at=now, attempts=Job.attempts + 1)
+            .returning(
+                Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.created_at
+            )
+        )
+        return sorted(result.all(), key=lambda job: job.id)
+
+    async def requeue_stale(self, db: AsyncSession, *, lock_timeout: timedelta) -> None:
+        now = utcnow()
+        locked_before = now - lock_timeout
+        stale = (Job.status == "running", Job.locked_at < locked_before)
+        await db.execute(
+            update(Job)
+            .where(*stale, Job.idempotency_key.is_not(None), _has_pending_duplicate)
+            .values(status="done", locked_at=None, finished_at=now, last_error=SUPERSEDED)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            async with db.begin_nested():
+                await db.execute(
+                    update(Job)
+                    .where(
+                        *stale,
+                        ~_has_pending_duplicate,
+                        ~exists().where(
+                            _other.idempotency_key == Job.idempotency_key,
+                            _other.status == "running",
+                            _other.locked_at < locked_before,
+                            _other.id < Job.id,
+                        ),
+                    )
+                    .values(status="pending", locked_at=None)
+                    .execution_options(synchronize_session=False)
+                )
+        except IntegrityError:
+            pass
+
+    async def complete(self, db: AsyncSession, job_ids: List[int]) -> None:
+        await db.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids))
+            .values(status="done", locked_at=None, finished_at=utcnow(), last_error=None)
+        )
+
+    async def retry(
+        self, db: AsyncSession, job_id: int, *, error: str, delay: timedelta
+    ) -> bool:
+        try:
+            async with db.begin_nested():
+                result = await db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, ~_has_pending_duplicate)
+                    .values(
+                        status="pending",
+                        locked_at=None,
+                        run_at=utcnow() + delay,
+                        last_error=error,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount:
+                    return True
+        except IntegrityError:
+            pass
+        await db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status="done", locked_at=None, finished_at=utcnow(), last_error=SUPERSEDED)
+        )
+        return False
+
+    async def fail(self, db: AsyncSession, job_id: int, *, error: str) -> None:
+        await db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status="failed", locked_at=None, finished_at=utcnow(), last_error=error)
+        )
+
+    async def purge_finished(self, db: AsyncSession, *, older_than: timedelta) -> None:
+        await db.execute(
+            delete(Job).where(Job.status == "done", Job.finished_at < utcnow() - older_than)
+        )
+
+    async def get_stats(self, db: AsyncSession) -> Sequence[Row]:
+        query = (
+            select(
+                Job.kind,
+                Job.status,
+                func.count().label("count"),
+                func.min(Job.created_at).label("oldest"),
+            )
+            .where(Job.status.in_(["pending", "running", "failed"]))
+            .group_by(Job.kind, Job.status)
+        )
+        result = await db.execute(query)
+        return result.all()
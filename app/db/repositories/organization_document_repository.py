@@ -0,0 +1,152 @@
+from typing import Iterable, List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy import Text, bindparam, cast, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.db.models import Activity, Organization, OrganizationDocument, organization_activity
+from app.db.repositories.organization_geo_index_repository import (
+    OrganizationGeoIndexRepository,
+)
+from app.domain.models.organization import Organization as OrganizationSchema
+from app.domain.models.relations import OrganizationFull
+
+
+_full_adapter = TypeAdapter(OrganizationFull)
+_summary_adapter = TypeAdapter(OrganizationSchema)
+
+_document_query = select(cast(OrganizationDocument.document, Text)).where(
+    OrganizationDocument.organization_id == bindparam("organization_id")
+)
+
+_summaries_query = (
+    select(cast(OrganizationDocument.summary, Text))
+    .select_from(Organization)
+    .outerjoin(
+        OrganizationDocument, OrganizationDocument.organization_id == Organization.id
+    )
+    .order_by(Organization.id)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+_organizations_for_documents_query = (
+    select(Organization)
+    .where(Organization.id.in_(bindparam("ids", expanding=True)))
+    .options(
+        selectinload(Organization.building),
+        selectinload(Organization.phone_numbers),
+        selectinload(Organization.activities),
+    )
+    .execution_options(populate_existing=True)
+)
+
+_by_buildings_query = select(Organization.id).where(
+    Organization.building_id.in_(bindparam("building_ids", expanding=True))
+)
+
+_by_activities_query = (
+    select(organization_activity.c.organization_id)
+    .where(organization_activity.c.activity_id.in_(bindparam("activity_ids", expanding=True)))
+    .distinct()
+)
+
+_parents_query = select(Activity.id, Activity.parent_id)
+
+REFRESH_BATCH_SIZE = 500
+
+
+def build_documents(organization: Organization) -> dict:
+    document = _full_adapter.dump_python(
+        _full_adapter.validate_python(organization, from_attributes=True), mode="json"
+    )
+    summary = _summary_adapter.dump_python(
+        _summary_adapter.validate_python(organization, from_attributes=True), mode="json"
+    )
+    for item in (document, summary):
+        item["phone_numbers"].sort(key=lambda phone: phone["id"])
+    document["activities"].sort(key=lambda activity: activity["id"])
+    return {"organization_id": organization.id, "document": document, "summary": summary}
+
+
+class OrganizationDocumentRepository:
+    def __init__(self):
+        self.geo_index = OrganizationGeoIndexRepository()
+
+    async def get_raw(self, db: AsyncSession, organization_id: int) -> Optional[str]:
+        result = await db.execute(_document_query, {"organization_id": organization_id})
+        return result.scalar_one_or_none()
+
+    async def get_raw_summaries(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> Optional[List[str]]:
+        result = await db.execute(_summaries_query, {"skip": skip, "limit": limit})
+        summaries = result.scalars().all()
+        if any(summary is None for summary in summaries):
+            return None
+        return summaries
+
+    async def refresh(self, db: AsyncSession, organization_ids: Iterable[int]) -> int:
+        ids = sorted(set(organization_ids))
+        if not ids:
+            return 0
+        parents = {row.id: row.parent_id for row in await db.execute(_parents_query)}
+        total = 0
+        for start in range(0, len(ids), REFRESH_BATCH_SIZE):
+            batch = ids[start:start + REFRESH_BATCH_SIZE]
+            result = await db.execute(_organizations_for_documents_query, {"ids": batch})
+            organizations = result.scalars().all()
+            documents = [build_documents(organization) for organization in organizations]
+
+            await self.remove(db, batch)
+            if documents:
+                await db.execute(insert(OrganizationDocument), documents)
+            await self.geo_index.add(db, organizations, parents)
+            total += len(documents)
+        return total
+
+    async def remove(self, db: AsyncSession, organization_ids: Iterable[int]) -> None:
+        ids = list(organization_ids)
+        if ids:
+            await db.execute(
+                delete(OrganizationDocument).where(
+                    OrganizationDocument.organization_id.in_(ids)
+                )
+            )
+            await self.geo_index.remove(db, ids)
+
+    async def get_organization_ids_by_buildings(
+        self, db: AsyncSession, building_ids: Iterable[int]
+    ) -> List[int]:
+        result = await db.execute(_by_buildings_query, {"building_ids": list(building_ids)})
+        return result.scalars().all()
+
+    async def get_organization_ids_by_activities(
+        self, db: AsyncSession, activity_ids: Iterable[int]
+    ) -> List[int]:
+        result = await db.execute(_by_activities_query, {"activity_ids": list(activity_ids)})
+        return result.scalars().all()
+
+    async def is_complete(self, db: AsyncSession) -> bool:
+        organizations = await db.scalar(select(func.count()).select_from(Organization))
+        documents = await db.scalar(select(func.count()).select_from(OrganizationDocument))
+        return organizations == documents and await self.geo_index.is_complete(db)
+
+    async def rebuild(self, db: AsyncSession, batch_size: int = REFRESH_BATCH_SIZE) -> int:
+        await db.execute(delete(OrganizationDocument))
+        await self.geo_index.clear(db)
+        total = 0
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(Organization.id)
+                .where(Organization.id > last_id)
+                .order_by(Organization.id)
+                .limit(batch_size)
+            )
+            ids = result.scalars().all()
+            if not ids:
+                return total
+            total += await self.refresh(db, ids)
+            last_id = ids[-1]
+            db.expunge_all()
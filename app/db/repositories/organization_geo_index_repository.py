@@ -0,0 +1,100 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, delete, distinct, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import geohash
+from app.db.models import Organization, OrganizationGeoIndex, organization_activity
+
+
+def build_index_rows(
+    organization: Organization, parents: Dict[int, Optional[int]]
+) -> List[dict]:
+    building = organization.building
+    if building is None:
+        return []
+
+    depths: Dict[int, int] = {}
+    for activity in organization.activities:
+        current, depth = activity.id, 0
+        while current is not None and depth <= len(parents):
+            if depths.get(current, depth + 1) > depth:
+                depths[current] = depth
+            current = parents.get(current)
+            depth += 1
+
+    cell = geohash.encode(building.latitude, building.longitude)
+    return [
+        {
+            "activity_id": activity_id,
+            "geohash": cell,
+            "organization_id": organization.id,
+            "depth": depth,
+            "latitude": building.latitude,
+            "longitude": building.longitude,
+        }
+        for activity_id, depth in sorted(depths.items())
+    ]
+
+
+class OrganizationGeoIndexRepository:
+
+    async def add(
+        self,
+        db: AsyncSession,
+        organizations: Iterable[Organization],
+        parents: Dict[int, Optional[int]],
+    ) -> None:
+        rows = [
+            row
+            for organization in organizations
+            for row in build_index_rows(organization, parents)
+        ]
+        if rows:
+            await db.execute(insert(OrganizationGeoIndex), rows)
+
+    async def remove(self, db: AsyncSession, organization_ids: Iterable[int]) -> None:
+        ids = list(organization_ids)
+        if ids:
+            await db.execute(
+                delete(OrganizationGeoIndex).where(
+                    OrganizationGeoIndex.organization_id.in_(ids)
+                )
+            )
+
+    async def clear(self, db: AsyncSession) -> None:
+        await db.execute(delete(OrganizationGeoIndex))
+
+    async def find(
+        self,
+        db: AsyncSession,
+        activity_id: int,
+        bbox: Tuple[float, float, float, float],
+        include_children: bool = True,
+    ) -> List:
+        conditions = [
+            and_(OrganizationGeoIndex.geohash >= low, OrganizationGeoIndex.geohash < high)
+            if high is not None
+            else OrganizationGeoIndex.geohash >= low
+            for low, high in geohash.cover(*bbox)
+        ]
+        query = select(
+            OrganizationGeoIndex.organization_id,
+            OrganizationGeoIndex.latitude,
+            OrganizationGeoIndex.longitude,
+        ).where(OrganizationGeoIndex.activity_id == activity_id, or_(*conditions))
+        if not include_children:
+            query = query.where(OrganizationGeoIndex.depth == 0)
+        result = await db.execute(query)
+        return result.all()
+
+    async def is_complete(self, db: AsyncSession) -> bool:
+        expected = await db.scalar(
+            select(func.count(distinct(organization_activity.c.organization_id)))
+            .select_from(organization_activity)
+            .join(Organization, Organization.id == organization_activity.c.organization_id)
+            .where(Organization.building_id.is_not(None))
+        )
+        indexed = await db.scalar(
+            select(func.count(distinct(OrganizationGeoIndex.organization_id)))
+        )
+        return expected == indexed
@@ -1,11 +1,84 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select, func, and_, delete
+from collections import Counter, defaultdict
+from typing import List, Optional, Dict, Any, Set, Tuple
+from sqlalchemy import select, func, and_, delete, insert, bindparam, String
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.core.phones import digit_prefix_upper_bound, digits_only, normalize_phone, phone_values
 from app.db.repositories.base_repository import BaseRepository
+from app.db.repositories.organization_document_repository import (
+    OrganizationDocumentRepository,
+)
+from app.db.loaders import MAX_BATCH_SIZE, get_loaders
 from app.db.models import Organization, PhoneNumber, Activity, Building, organization_activity
-from app.domain.models.organization import OrganizationCreate, OrganizationUpdate
+from app.domain.models.organization import (
+    OrganizationCreate,
+    OrganizationUpdate,
+    OrganizationPatch,
+)
+
+
+_organizations_query = select(Organization)
+
+_details_query = _organizations_query.where(
+    Organization.id == bindparam("organization_id")
+)
+
+_by_building_query = _organizations_query.where(
+    Organization.building_id == bindparam("building_id")
+)
+
+_by_buildings_query = _organizations_query.where(
+    Organization.building_id.in_(bindparam("building_ids", expanding=True))
+)
+
+_by_activity_query = _organizations_query.where(
+    Organization.activities.any(Activity.id == bindparam("activity_id"))
+)
+
+_by_activities_query = _organizations_query.where(
+    Organization.activities.any(
+        Activity.id.in_(bindparam("activity_ids", expanding=True))
+    )
+)
+
+_by_phone_query = _organizations_query.where(
+    Organization.id.in_(
+        select(PhoneNumber.organization_id).where(
+            PhoneNumber.number_normalized == bindparam("number")
+        )
+    )
+)
+
+_by_phone_suffix_query = _organizations_query.where(
+    Organization.id.in_(
+        select(PhoneNumber.organization_id).where(
+            PhoneNumber.number_reversed >= bindparam("lower"),
+            PhoneNumber.number_reversed < bindparam("upper"),
+        )
+    )
+)
+
+_by_ids_query = _organizations_query.where(
+    Organization.id.in_(bindparam("organization_ids", expanding=True))
+)
+
+_by_buildings_and_activities_query = _by_activities_query.where(
+    Organization.building_id.in_(bindparam("building_ids", expanding=True))
+)
+
+IN_CHUNK_SIZE = MAX_BATCH_SIZE
+
+
+def _paginate(query, skip: int, limit: Optional[int]):
+    if limit is None:
+        return query
+    return query.order_by(Organization.id).offset(skip).limit(limit)
+
+_search_by_name_query = _organizations_query.where(
+    func.lower(Organization.name).contains(
+        func.lower(bindparam("name", type_=String))
+    )
+)
 
 
 class OrganizationRepository(
@@ -14,37 +87,41 @@ class OrganizationRepository(
 
     def __init__(self):
         super().__init__(Organization)
+        self.documents = OrganizationDocumentRepository()
+
+    async def get_document_json(
+        self, db: AsyncSession, organization_id: int
+    ) -> Optional[str]:
+        return await self.documents.get_raw(db, organization_id)
+
+    async def get_multi_documents_json(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> Optional[List[str]]:
+        return await self.documents.get_raw_summaries(db, skip=skip, limit=limit)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Organization]:
+        await self.documents.remove(db, [id])
+        return await super().remove(db, id=id)
 
     async def get_multi_with_relations(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[Organization]:
-        query = (
-            select(Organization)
-            .options(
-                selectinload(Organization.building),
-                selectinload(Organization.phone_numbers),
-                selectinload(Organization.activities),
-            )
-            .offset(skip)
-            .limit(limit)
-        )
+        query = _organizations_query.offset(skip).limit(limit)
         result = await db.execute(query)
-        return result.scalars().all()
+        return await get_loaders(db).attach_organization_relations(
+            result.scalars().all()
+        )
 
     async def get_with_details(
         self, db: AsyncSession, organization_id: int
     ) -> Optional[Organization]:
-        query = (
-            select(Organization)
-            .options(
-                selectinload(Organization.building),
-                selectinload(Organization.phone_numbers),
-                selectinload(Organization.activities),
-            )
-            .where(Organization.id == organization_id)
+        result = await db.execute(
+            _details_query, {"organization_id": organization_id}
         )
-        result = await db.execute(query)
-        return result.scalars().first()
+        organization = result.scalars().first()
+        if organization is not None:
+            await get_loaders(db).attach_organization_relations([organization])
+        return organization
 
     async def create_with_relations(
         self, db: AsyncSession, *, obj_in: OrganizationCreate
@@ -55,7 +132,7 @@ class OrganizationRepository(
         await db.flush()
 
         for phone in obj_in.phone_numbers:
-            db_phone = PhoneNumber(number=phone.number, organization_id=db_obj.id)
+            db_phone = PhoneNumber(**phone_values(phone.number), organization_id=db_obj.id)
             db.add(db_phone)
 
         if obj_in.activity_ids:
@@ -68,10 +145,11 @@ class OrganizationRepository(
             db_obj.activities.extend(activities)
             await db.flush()
 
-        await db.commit()
+        await db.flush()
         
         await db.refresh(db_obj, attribute_names=["phone_numbers", "activities", "building"])
-        
+        await self.documents.refresh(db, [db_obj.id])
+
         return db_obj
 
     async def update_with_relations(
@@ -80,97 +158,252 @@ class OrganizationRepository(
         update_data = obj_in.model_dump(exclude_unset=True)
 
         if "phone_numbers" in update_data:
-            phone_numbers = update_data.pop("phone_numbers")
-
-            await db.execute(delete(PhoneNumber).where(PhoneNumber.organization_id == db_obj.id))
-
-            for phone in phone_numbers:
-                db.add(PhoneNumber(number=phone["number"], organization_id=db_obj.id))
+            phone_numbers = update_data.pop("phone_numbers") or []
+            desired = Counter(phone["number"] for phone in phone_numbers)
+            current = await self._get_phone_rows(db, db_obj.id)
+
+            to_remove = []
+            for phone_id, number in current:
+                if desired[number] > 0:
+                    desired[number] -= 1
+                else:
+                    to_remove.append(phone_id)
+
+            await self._apply_phone_changes(
+                db, db_obj.id, add=list(desired.elements()), remove_ids=to_remove
+            )
 
         if "activity_ids" in update_data:
-            activity_ids = update_data.pop("activity_ids")
-            
-            stmt = select(Activity).where(Activity.id.in_(activity_ids)).options(selectinload(Activity.children))
-            result = await db.execute(stmt)
-            activities = result.scalars().all()
-            
-            await db.execute(delete(organization_activity).where(organization_activity.c.organization_id == db_obj.id))
-            
-            await db.refresh(db_obj, attribute_names=["activities"])
-            
-            db_obj.activities.extend(activities)
-            await db.flush()
+            activity_ids = set(update_data.pop("activity_ids") or [])
+            current = await self._get_activity_ids(db, db_obj.id)
+
+            await self._apply_activity_changes(
+                db,
+                db_obj.id,
+                add=activity_ids - current,
+                remove=current - activity_ids,
+            )
 
         for field, value in update_data.items():
             setattr(db_obj, field, value)
 
         db.add(db_obj)
-        await db.commit()
-        
+        await db.flush()
+
         await db.refresh(db_obj, attribute_names=["phone_numbers", "activities", "building"])
-        
+        await self.documents.refresh(db, [db_obj.id])
+
         return db_obj
 
+    async def patch_with_relations(
+        self, db: AsyncSession, *, db_obj: Organization, obj_in: OrganizationPatch
+    ) -> Organization:
+        patch_data = obj_in.model_dump(
+            exclude_unset=True,
+            exclude={
+                "add_phone_numbers",
+                "remove_phone_numbers",
+                "add_activity_ids",
+                "remove_activity_ids",
+            },
+        )
+
+        if obj_in.add_phone_numbers or obj_in.remove_phone_numbers:
+            remove_numbers = set(obj_in.remove_phone_numbers)
+            current = await self._get_phone_rows(db, db_obj.id)
+            existing = {number for _, number in current if number not in remove_numbers}
+
+            to_add = []
+            for phone in obj_in.add_phone_numbers:
+                if phone.number not in existing:
+                    existing.add(phone.number)
+                    to_add.append(phone.number)
+
+            await self._apply_phone_changes(
+                db,
+                db_obj.id,
+                add=to_add,
+                remove_ids=[
+                    phone_id for phone_id, number in current if number in remove_numbers
+                ],
+            )
+
+        if obj_in.add_activity_ids or obj_in.remove_activity_ids:
+            remove_ids = set(obj_in.remove_activity_ids)
+            current = await self._get_activity_ids(db, db_obj.id)
+
+            await self._apply_activity_changes(
+                db,
+                db_obj.id,
+                add=set(obj_in.add_activity_ids) - current - remove_ids,
+                remove=current & remove_ids,
+            )
+
+        for field, value in patch_data.items():
+            setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        await db.flush()
+
+        await db.refresh(db_obj, attribute_names=["phone_numbers", "activities", "building"])
+        await self.documents.refresh(db, [db_obj.id])
+
+        return db_obj
+
+    async def _get_phone_rows(
+        self, db: AsyncSession, organization_id: int
+    ) -> List[Tuple[int, str]]:
+        query = (
+            select(PhoneNumber.id, PhoneNumber.number)
+            .where(PhoneNumber.organization_id == organization_id)
+            .order_by(PhoneNumber.id)
+        )
+        result = await db.execute(query)
+        return [(row.id, row.number) for row in result]
+
+    async def _get_activity_ids(self, db: AsyncSession, organization_id: int) -> Set[int]:
+        query = select(organization_activity.c.activity_id).where(
+            organization_activity.c.organization_id == organization_id
+        )
+        result = await db.execute(query)
+        return set(result.scalars().all())
+
+    async def _apply_phone_changes(
+        self,
+        db: AsyncSession,
+        organization_id: int,
+        *,
+        add: List[str],
+        remove_ids: List[int],
+    ) -> None:
+        if remove_ids:
+            await db.execute(delete(PhoneNumber).where(PhoneNumber.id.in_(remove_ids)))
+
+        if add:
+            await db.execute(
+                insert(PhoneNumber),
+                [
+                    {**phone_values(number), "organization_id": organization_id}
+                    for number in add
+                ],
+            )
+
+    async def _apply_activity_changes(
+        self,
+        db: AsyncSession,
+        organization_id: int,
+        *,
+        add: Set[int],
+        remove: Set[int],
+    ) -> None:
+        if remove:
+            await db.execute(
+                delete(organization_activity).where(
+                    and_(
+                        organization_activity.c.organization_id == organization_id,
+                        organization_activity.c.activity_id.in_(remove),
+                    )
+                )
+            )
+
+        if add:
+            query = select(Activity.id).where(Activity.id.in_(add))
+            result = await db.execute(query)
+            existing_ids = result.scalars().all()
+
+            if existing_ids:
+                await db.execute(
+                    organization_activity.insert(),
+                    [
+                        {"organization_id": organization_id, "activity_id": activity_id}
+                        for activity_id in existing_ids
+                    ],
+                )
+
     async def get_by_building(
         self, db: AsyncSession, building_id: int
     ) -> List[Organization]:
-        query = (
-            select(Organization)
-            .options(
-                selectinload(Organization.building),
-                selectinload(Organization.phone_numbers),
-                selectinload(Organization.activities),
+        result = await db.execute(_by_building_query, {"building_id": building_id})
+        return await get_loaders(db).attach_organization_relations(
+            result.scalars().all()
+        )
+
+    async def get_by_buildings(
+        self, db: AsyncSession, building_ids: List[int]
+    ) -> List[Organization]:
+        return await self._get_chunked(
+            db, _by_buildings_query, "building_ids", sorted(set(building_ids))
+        )
+
+    async def _get_chunked(
+        self,
+        db: AsyncSession,
+        query,
+        name: str,
+        ids: List[int],
+        params: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Organization]:
+        organizations: List[Organization] = []
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await db.execute(
+                query, {**(params or {}), name: ids[start:start + IN_CHUNK_SIZE]}
             )
-            .where(Organization.building_id == building_id)
+            organizations.extend(sorted(result.scalars().all(), key=lambda o: o.id))
+            if limit is not None and len(organizations) >= limit:
+                organizations = organizations[:limit]
+                break
+        return await get_loaders(db).attach_organization_relations(organizations)
+
+    async def count_by_activities(
+        self, db: AsyncSession, activity_ids: List[int]
+    ) -> Dict[int, int]:
+        query = (
+            select(organization_activity.c.activity_id, func.count())
+            .where(organization_activity.c.activity_id.in_(activity_ids))
+            .group_by(organization_activity.c.activity_id)
         )
         result = await db.execute(query)
-        return result.scalars().all()
+        return {activity_id: count for activity_id, count in result}
 
     async def get_by_activity(
-        self, db: AsyncSession, activity_id: int, include_children: bool = False
+        self,
+        db: AsyncSession,
+        activity_id: int,
+        include_children: bool = False,
+        skip: int = 0,
+        limit: Optional[int] = None,
     ) -> List[Organization]:
         if not include_children:
-            query = (
-                select(Organization)
-                .options(
-                    selectinload(Organization.building),
-                    selectinload(Organization.phone_numbers),
-                    selectinload(Organization.activities),
-                )
-                .where(Organization.activities.any(Activity.id == activity_id))
+            result = await db.execute(
+                _paginate(_by_activity_query, skip, limit), {"activity_id": activity_id}
+            )
+            return await get_loaders(db).attach_organization_relations(
+                result.scalars().all()
             )
-            result = await db.execute(query)
-            return result.scalars().all()
 
         from app.db.repositories.activity_repository import ActivityRepository
 
         activity_repo = ActivityRepository()
         activity_ids = await activity_repo.get_all_child_ids(db, activity_id)
 
-        query = (
-            select(Organization)
-            .options(
-                selectinload(Organization.building),
-                selectinload(Organization.phone_numbers),
-                selectinload(Organization.activities),
-            )
-            .where(Organization.activities.any(Activity.id.in_(activity_ids)))
+        result = await db.execute(
+            _paginate(_by_activities_query, skip, limit),
+            {"activity_ids": list(activity_ids)},
+        )
+        return await get_loaders(db).attach_organization_relations(
+            result.scalars().all()
         )
-        result = await db.execute(query)
-        return result.scalars().all()
 
-    async def search_by_name(self, db: AsyncSession, name: str) -> List[Organization]:
-        query = (
-            select(Organization)
-            .options(
-                selectinload(Organization.building),
-                selectinload(Organization.phone_numbers),
-                selectinload(Organization.activities),
-            )
-            .where(func.lower(Organization.name).contains(func.lower(name)))
+    async def search_by_name(
+        self, db: AsyncSession, name: str, skip: int = 0, limit: Optional[int] = None
+    ) -> List[Organization]:
+        result = await db.execute(
+            _paginate(_search_by_name_query, skip, limit), {"name": name}
+        )
+        return await get_loaders(db).attach_organization_relations(
+            result.scalars().all()
         )
-        result = await db.execute(query)
-        return result.scalars().all()
 
     async def get_by_location(
         self,
@@ -200,22 +433,164 @@ class OrganizationRepository(
                 "Необходимо указать либо радиус, либо координаты прямоугольной области"
             )
 
+        loaders = get_loaders(db)
+        for building in buildings:
+            loaders.buildings.prime(building.id, building)
+
         building_ids = [b.id for b in buildings]
 
         if not building_ids:
             return []
 
-        query = (
-            select(Organization)
-            .options(
-                selectinload(Organization.building),
-                selectinload(Organization.phone_numbers),
-                selectinload(Organization.activities),
+        return await self._get_chunked(
+            db, _by_buildings_query, "building_ids", sorted(set(building_ids))
+        )
+
+    async def get_by_polygon(
+        self, db: AsyncSession, points: List[Tuple[float, float]], limit: int = 100
+    ) -> List[Organization]:
+        from app.db.repositories.building_repository import BuildingRepository
+
+        building_ids = await BuildingRepository().get_building_ids_in_polygon(db, points)
+        return await self._get_chunked(
+            db, _by_buildings_query, "building_ids", sorted(building_ids), limit=limit
+        )
+
+    async def get_by_route(
+        self,
+        db: AsyncSession,
+        points: List[Tuple[float, float]],
+        distance: float,
+        limit: int = 100,
+    ) -> List[Organization]:
+        from app.db.repositories.building_repository import BuildingRepository
+
+        building_ids = await BuildingRepository().get_building_ids_along_route(
+            db, points, distance
+        )
+        return await self._get_chunked(
+            db, _by_buildings_query, "building_ids", sorted(building_ids), limit=limit
+        )
+
+    async def get_activity_ids(
+        self, db: AsyncSession, activity_id: Optional[int], include_children: bool = True
+    ) -> Optional[Set[int]]:
+        if activity_id is None:
+            return None
+        if not include_children:
+            return {activity_id}
+
+        from app.db.repositories.activity_repository import ActivityRepository
+
+        return await ActivityRepository().get_all_child_ids(db, activity_id)
+
+    async def get_by_points(
+        self,
+        db: AsyncSession,
+        points: List[Tuple[float, float]],
+        radius: float,
+        activity_ids: Optional[Set[int]] = None,
+        limit: int = 20,
+    ) -> List[List[Organization]]:
+        import numpy as np
+
+        from app.core.geo import PointIndex, bounding_box
+        from app.db.repositories.building_repository import BuildingRepository
+
+        results: List[List[Organization]] = [[] for _ in points]
+        if not points:
+            return results
+
+        ids, latitudes, longitudes = await BuildingRepository().get_coordinates(
+            db, bounding_box(points, margin=radius), activity_ids
+        )
+        point_idx, building_ids, _ = PointIndex(ids, latitudes, longitudes).query_radius(
+            np.array([lat for lat, _ in points], dtype=float),
+            np.array([lon for _, lon in points], dtype=float),
+            radius,
+        )
+        if not len(building_ids):
+            return results
+
+        if activity_ids is None:
+            query, params = _by_buildings_query, {}
+        else:
+            query = _by_buildings_and_activities_query
+            params = {"activity_ids": list(activity_ids)}
+        organizations = await self._get_chunked(
+            db, query, "building_ids", np.unique(building_ids).tolist(), params
+        )
+
+        by_building = defaultdict(list)
+        for organization in organizations:
+            by_building[organization.building_id].append(organization)
+        for index, building_id in zip(point_idx.tolist(), building_ids.tolist()):
+            found = results[index]
+            if len(found) < limit:
+                found.extend(by_building.get(building_id, ()))
+        for found in results:
+            del found[limit:]
+        return results
+
+    async def get_nearby(
+        self,
+        db: AsyncSession,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        activity_id: int,
+        include_children: bool = True,
+        limit: int = 100,
+    ) -> List[Organization]:
+        import numpy as np
+
+        from app.core.geo import bounding_box, haversine
+
+        rows = await self.documents.geo_index.find(
+            db,
+            activity_id,
+            bounding_box([(latitude, longitude)], margin=radius),
+            include_children=include_children,
+        )
+        if not rows:
+            return []
+
+        distances = haversine(
+            latitude,
+            longitude,
+            np.array([row.latitude for row in rows], dtype=float),
+            np.array([row.longitude for row in rows], dtype=float),
+        )
+        nearest = [
+            index
+            for index in np.argsort(distances, kind="stable")[:limit]
+            if distances[index] <= radius
+        ]
+        order = {rows[index].organization_id: position for position, index in enumerate(nearest)}
+        organizations = await self._get_chunked(
+            db, _by_ids_query, "organization_ids", list(order)
+        )
+        return sorted(organizations, key=lambda o: order[o.id])
+
+    async def get_by_phone(
+        self, db: AsyncSession, number: str, suffix: bool = False
+    ) -> List[Organization]:
+        if suffix:
+            lower = digits_only(number)[::-1]
+            if not lower:
+                raise ValueError("Номер телефона должен содержать цифры")
+            result = await db.execute(
+                _by_phone_suffix_query,
+                {"lower": lower, "upper": digit_prefix_upper_bound(lower)},
             )
-            .where(Organization.building_id.in_(building_ids))
+        else:
+            normalized = normalize_phone(number)
+            if normalized is None:
+                raise ValueError("Некорректный номер телефона")
+            result = await db.execute(_by_phone_query, {"number": normalized})
+        return await get_loaders(db).attach_organization_relations(
+            result.scalars().all()
         )
-        result = await db.execute(query)
-        return result.scalars().all()
 
     async def get_by_activity_name(
         self, db: AsyncSession, activity_name: str, include_children: bool = True
@@ -229,28 +604,16 @@ class OrganizationRepository(
             return []
 
         if not include_children:
-            query = (
-                select(Organization)
-                .options(
-                    selectinload(Organization.building),
-                    selectinload(Organization.phone_numbers),
-                    selectinload(Organization.activities),
-                )
-                .where(Organization.activities.any(Activity.id == activity.id))
+            result = await db.execute(_by_activity_query, {"activity_id": activity.id})
+            return await get_loaders(db).attach_organization_relations(
+                result.scalars().all()
             )
-            result = await db.execute(query)
-            return result.scalars().all()
 
         activity_ids = await activity_repo.get_all_child_ids(db, activity.id)
 
-        query = (
-            select(Organization)
-            .options(
-                selectinload(Organization.building),
-                selectinload(Organization.phone_numbers),
-                selectinload(Organization.activities),
-            )
-            .where(Organization.activities.any(Activity.id.in_(activity_ids)))
+        result = await db.execute(
+            _by_activities_query, {"activity_ids": list(activity_ids)}
+        )
+        return await get_loaders(db).attach_organization_relations(
+            result.scalars().all()
         )
-        result = await db.execute(query)
-        return result.scalars().all()
@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import List, Sequence
+
+from sqlalchemy import insert
+
+from app.core.phones import phone_values
+from app.db.base import async_session_factory
+from app.db.documents import rebuild_documents
+from app.db.models import Activity, Building, Organization, PhoneNumber, organization_activity
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+CITIES = [
+    ("Москва", 55.7558, 37.6173, 0.35),
+    ("Санкт-Петербург", 59.9311, 30.3609, 0.18),
+    ("Новосибирск", 55.0415, 82.9346, 0.08),
+    ("Екатеринбург", 56.8389, 60.6057, 0.08),
+    ("Казань", 55.7879, 49.1233, 0.07),
+    ("Нижний Новгород", 56.3269, 44.0059, 0.06),
+    ("Самара", 53.1959, 50.1002, 0.05),
+    ("Краснодар", 45.0355, 38.9753, 0.05),
+    ("Ростов-на-Дону", 47.2357, 39.7015, 0.04),
+    ("Владивосток", 43.1155, 131.8855, 0.04),
+]
+
+STREETS = [
+    "Ленина", "Мира", "Советская", "Гагарина", "Пушкина", "Садовая",
+    "Лесная", "Школьная", "Набережная", "Центральная", "Молодёжная", "Заводская",
+]
+
+LEGAL_FORMS = ['ООО', 'ЗАО', 'ИП', 'АО', 'ПАО']
+
+NAME_WORDS = [
+    "Альфа", "Вектор", "Гранит", "Лидер", "Меридиан", "Партнёр", "Прогресс",
+    "Регион", "Сибирь", "Стандарт", "Союз", "Старт", "Техно", "Урал", "Форвард",
+]
+
+ACTIVITY_WORDS = [
+    "Продукты", "Услуги", "Оборудование", "Сервис", "Материалы", "Товары",
+    "Ремонт", "Доставка", "Производство", "Консалтинг", "Аренда", "Обучение",
+]
+
+
+def _chunks(items: Sequence, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def _insert_returning_ids(
+    db, model, rows: List[dict], batch_size: int
+) -> List[int]:
+    ids: List[int] = []
+    statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+    for chunk in _chunks(rows, batch_size):
+        result = await db.scalars(statement, chunk)
+        ids.extend(result.all())
+    return ids
+
+
+async def _seed_activities(
+    db, rng: random.Random, roots: int, children: int, grandchildren: int
+) -> List[int]:
+    root_rows = [{"name": f"Категория {i + 1}", "parent_id": None} for i in range(roots)]
+    root_ids = await _insert_returning_ids(db, Activity, root_rows, len(root_rows) or 1)
+
+    child_rows = [
+        {"name": f"{rng.choice(ACTIVITY_WORDS)} {root_index + 1}.{i + 1}", "parent_id": root_id}
+        for root_index, root_id in enumerate(root_ids)
+        for i in range(children)
+    ]
+    child_ids = await _insert_returning_ids(db, Activity, child_rows, 10000)
+
+    leaf_rows = [
+        {"name": f"{rng.choice(ACTIVITY_WORDS)} {child_index + 1}.{i + 1}", "parent_id": child_id}
+        for child_index, child_id in enumerate(child_ids)
+        for i in range(grandchildren)
+    ]
+    leaf_ids = await _insert_returning_ids(db, Activity, leaf_rows, 10000)
+
+    return root_ids + child_ids + leaf_ids
+
+
+async def _seed_buildings(db, rng: random.Random, count: int, batch_size: int) -> List[int]:
+    weights = [city[3] for city in CITIES]
+    rows = []
+    for i in range(count):
+        city, lat, lon, _ = rng.choices(CITIES, weights=weights)[0]
+        rows.append(
+            {
+                "name": f"Здание {i + 1}",
+                "address": f"г. {city}, ул. {rng.choice(STREETS)} {rng.randint(1, 200)}",
+                "latitude": rng.gauss(lat, 0.08),
+                "longitude": rng.gauss(lon, 0.12),
+            }
+        )
+    return await _insert_returning_ids(db, Building, rows, batch_size)
+
+
+async def _seed_organizations(
+    db,
+    rng: random.Random,
+    count: int,
+    building_ids: List[int],
+    activity_ids: List[int],
+    batch_size: int,
+) -> None:
+    building_weights = [1.0 / (rank + 1) for rank in range(len(building_ids))]
+    activity_weights = [1.0 / (rank + 1) ** 0.8 for rank in range(len(activity_ids))]
+    shuffled_buildings = building_ids[:]
+    shuffled_activities = activity_ids[:]
+    rng.shuffle(shuffled_buildings)
+    rng.shuffle(shuffled_activities)
+
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        buildings = rng.choices(shuffled_buildings, weights=building_weights, k=size)
+        rows = [
+            {
+                "name": f'{rng.choice(LEGAL_FORMS)} "{rng.choice(NAME_WORDS)} {created + i + 1}"',
+                "building_id": buildings[i],
+            }
+            for i in range(size)
+        ]
+        organization_ids = await _insert_returning_ids(db, Organization, rows, size)
+
+        phone_rows = []
+        link_rows = []
+        for organization_id in organization_ids:
+            for _ in range(rng.choices((1, 2, 3), weights=(0.6, 0.3, 0.1))[0]):
+                phone_rows.append(
+                    {
+                        **phone_values(
+                            f"8-9{rng.randint(10, 99)}-{rng.randint(100, 999)}-"
+                            f"{rng.randint(10, 99)}-{rng.randint(10, 99)}"
+                        ),
+                        "organization_id": organization_id,
+                    }
+                )
+            links = rng.choices(
+                shuffled_activities,
+                weights=activity_weights,
+                k=rng.choices((1, 2, 3), weights=(0.5, 0.35, 0.15))[0],
+            )
+            for activity_id in set(links):
+                link_rows.append(
+                    {"organization_id": organization_id, "activity_id": activity_id}
+                )
+
+        await db.execute(insert(PhoneNumber), phone_rows)
+        await db.execute(insert(organization_activity), link_rows)
+        await db.commit()
+
+        created += size
+        logger.info(f"Organizations: {created}/{count}")
+
+
+async def seed_large(
+    organizations: int,
+    buildings: int,
+    roots: int,
+    children: int,
+    grandchildren: int,
+    batch_size: int,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    async with async_session_factory() as db:
+        logger.info("Creating activity tree...")
+        activity_ids = await _seed_activities(db, rng, roots, children, grandchildren)
+        await db.commit()
+
+        logger.info("Creating buildings...")
+        building_ids = await _seed_buildings(db, rng, buildings, batch_size)
+        await db.commit()
+
+        logger.info("Creating organizations...")
+        await _seed_organizations(
+            db, rng, organizations, building_ids, activity_ids, batch_size
+        )
+
+    logger.info("Building organization documents...")
+    await rebuild_documents()
+
+    logger.info(
+        f"Seeded {organizations} organizations, {buildings} buildings and "
+        f"{len(activity_ids)} activities in {time.perf_counter() - started:.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генерация большого набора тестовых данных")
+    parser.add_argument("--organizations", type=int, default=1_000_000)
+    parser.add_argument("--buildings", type=int, default=100_000)
+    parser.add_argument("--roots", type=int, default=12)
+    parser.add_argument("--children", type=int, default=8)
+    parser.add_argument("--grandchildren", type=int, default=6)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    asyncio.run(
+        seed_large(
+            organizations=args.organizations,
+            buildings=args.buildings,
+            roots=args.roots,
+            children=args.children,
+            grandchildren=args.grandchildren,
+            batch_size=args.batch_size,
+            seed=args.seed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
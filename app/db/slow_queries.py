@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.instrumentation import current_db_stats, route_label
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(value: Any) -> str:
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()[:16]
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float,
+        size: int,
+        explain_sample_rate: float,
+        explain_timeout_ms: int,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._explains: Set[asyncio.Task] = set()
+
+    def track(self, async_engine: AsyncEngine) -> None:
+        explain_supported = async_engine.dialect.name == "postgresql"
+        sync_engine = async_engine.sync_engine
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info["slow_query_started_at"] = time.perf_counter()
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started_at = conn.info.pop("slow_query_started_at", None)
+            if started_at is None or conn.info.get("slow_query_explain"):
+                return
+
+            duration = time.perf_counter() - started_at
+            if duration < self.threshold:
+                return
+
+            entry = self._record(statement, parameters, duration, executemany)
+            if (
+                explain_supported
+                and not executemany
+                and statement.lstrip()[:6].upper() == "SELECT"
+                and random.random() < self.explain_sample_rate
+            ):
+                self._schedule_explain(async_engine, entry, statement, parameters)
+
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+
+    def _record(self, statement: str, parameters, duration: float, executemany: bool) -> Dict[str, Any]:
+        stats = current_db_stats.get()
+        scope = stats.scope if stats is not None else None
+
+        entry = {
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 2),
+            "route": (
+                f"{scope['method']} {route_label(scope)}" if scope is not None else None
+            ),
+            "statement": statement,
+            "statement_fingerprint": _fingerprint(statement),
+            "parameters_fingerprint": _fingerprint(parameters),
+            "executemany": executemany,
+            "plan": None,
+        }
+        self.entries.append(entry)
+        logger.warning(
+            f"Медленный запрос {entry['duration_ms']} мс ({entry['route']}): "
+            f"{statement[:200]}"
+        )
+        return entry
+
+    def _schedule_explain(self, async_engine: AsyncEngine, entry, statement: str, parameters) -> None:
+        if self._explains:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        task = loop.create_task(self._explain(async_engine, entry, statement, parameters))
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+
+    async def _explain(self, async_engine: AsyncEngine, entry, statement: str, parameters) -> None:
+        current_db_stats.set(None)
+        try:
+            async with async_engine.connect() as conn:
+                conn.sync_connection.info["slow_query_explain"] = True
+                try:
+                    await conn.execute(
+                        text(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                    )
+                    result = await conn.exec_driver_sql(
+                        "EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters
+                    )
+                    entry["plan"] = "\n".join(row[0] for row in result)
+                finally:
+                    conn.sync_connection.info.pop("slow_query_explain", None)
+                    await conn.rollback()
+        except Exception as e:
+            logger.warning(f"Не удалось получить план медленного запроса: {str(e)}")
+            entry["plan_error"] = str(e)
+
+    def snapshot(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        entries = list(reversed(self.entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    size=settings.SLOW_QUERY_BUFFER_SIZE,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    explain_timeout_ms=settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+)
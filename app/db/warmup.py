@@ -0,0 +1,30 @@
+from sqlalchemy import text
+
+from app.db.base import UnitOfWork, engine, replica_engines
+from app.services.activity_service import ActivityService
+from app.services.organization_service import OrganizationService
+
+
+async def open_connections() -> None:
+    for async_engine in (engine, *replica_engines):
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+
+async def compile_hot_queries() -> None:
+    organization_service = OrganizationService()
+    activity_service = ActivityService()
+
+    modes = (False, True) if replica_engines else (False,)
+    for read_only in modes:
+        async with UnitOfWork(read_only=read_only) as db:
+            await organization_service.get_all(db, limit=1)
+            await organization_service.get_with_details(db, 0)
+            await organization_service.get_by_activity(db, 0, include_children=True)
+            await organization_service.search_by_name(db, "")
+            await organization_service.get_by_location(db, 0.0, 0.0, radius=0.1)
+            await organization_service.get_by_location(
+                db, 1.0, 1.0, min_lat=1.0, min_lon=1.0, max_lat=1.0, max_lon=1.0
+            )
+            await activity_service.get_activity_tree(db)
+            await db.rollback()
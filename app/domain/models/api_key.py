@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class ApiKeyCreate(BaseModel):
+    name: str = Field(..., min_length=1, description="Название партнёра или приложения")
+    is_admin: bool = Field(False, description="Доступ к административным эндпоинтам")
+    rate_limit_per_minute: Optional[int] = Field(
+        None, ge=1, description="Лимит запросов в минуту (по умолчанию RATE_LIMIT_DEFAULT_PER_MINUTE)"
+    )
+    burst: Optional[int] = Field(
+        None, ge=1, description="Допустимый всплеск запросов (по умолчанию RATE_LIMIT_DEFAULT_BURST)"
+    )
+
+
+class ApiKey(BaseModel):
+    id: int = Field(..., description="Идентификатор ключа")
+    name: str = Field(..., description="Название партнёра или приложения")
+    key_prefix: str = Field(..., description="Первые символы ключа")
+    is_active: bool = Field(..., description="Ключ активен")
+    is_admin: bool = Field(..., description="Доступ к административным эндпоинтам")
+    rate_limit_per_minute: Optional[int] = Field(None, description="Лимит запросов в минуту")
+    burst: Optional[int] = Field(None, description="Допустимый всплеск запросов")
+    created_at: datetime = Field(..., description="Дата создания")
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ApiKeyCreated(ApiKey):
+    key: str = Field(..., description="API ключ, показывается только один раз")
@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class BatchOperation(BaseModel):
+    entity: Literal["organization", "building", "activity"] = Field(
+        ..., description="Тип сущности"
+    )
+    action: Literal["create", "update", "delete"] = Field(
+        ..., description="Операция"
+    )
+    id: Optional[int] = Field(
+        None, description="Идентификатор сущности для update и delete"
+    )
+    data: Dict[str, Any] = Field(
+        default_factory=dict, description="Данные для create и update"
+    )
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., description="Список операций")
+
+
+class BatchOperationResult(BaseModel):
+    index: int = Field(..., description="Порядковый номер операции")
+    status: Literal["ok", "error", "skipped"] = Field(
+        ..., description="Результат выполнения операции"
+    )
+    id: Optional[int] = Field(None, description="Идентификатор сущности")
+    detail: Optional[str] = Field(None, description="Описание ошибки")
+
+
+class BatchResponse(BaseModel):
+    committed: bool = Field(..., description="Были ли изменения сохранены")
+    results: List[BatchOperationResult] = Field(
+        default_factory=list, description="Результаты операций"
+    )
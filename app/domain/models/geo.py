@@ -0,0 +1,39 @@
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+
+class GeoPoint(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90, description="Широта")
+    longitude: float = Field(..., ge=-180, le=180, description="Долгота")
+
+
+class PolygonSearch(BaseModel):
+    points: List[GeoPoint] = Field(..., min_length=3, description="Вершины полигона")
+    limit: int = Field(100, gt=0, description="Максимальное количество организаций")
+
+    def coordinates(self) -> List[Tuple[float, float]]:
+        return [(point.latitude, point.longitude) for point in self.points]
+
+
+class RouteSearch(BaseModel):
+    points: List[GeoPoint] = Field(..., min_length=2, description="Точки маршрута")
+    distance: float = Field(..., gt=0, description="Расстояние от маршрута в метрах")
+    limit: int = Field(100, gt=0, description="Максимальное количество организаций")
+
+    def coordinates(self) -> List[Tuple[float, float]]:
+        return [(point.latitude, point.longitude) for point in self.points]
+
+
+class PointsSearch(BaseModel):
+    points: List[GeoPoint] = Field(..., min_length=1, description="Точки поиска")
+    radius: float = Field(..., gt=0, description="Радиус поиска в метрах")
+    activity_id: Optional[int] = Field(None, description="Идентификатор вида деятельности")
+    include_child_activities: bool = Field(
+        True, description="Учитывать дочерние виды деятельности"
+    )
+    limit: int = Field(
+        20, gt=0, description="Максимальное количество организаций на точку"
+    )
+
+    def coordinates(self) -> List[Tuple[float, float]]:
+        return [(point.latitude, point.longitude) for point in self.points]
@@ -43,6 +43,25 @@ class OrganizationUpdate(BaseModel):
     )
 
 
+class OrganizationPatch(BaseModel):
+    name: Optional[str] = Field(None, description="Название организации")
+    building_id: Optional[int] = Field(None, description="Идентификатор здания")
+    add_phone_numbers: List[PhoneNumberCreate] = Field(
+        default_factory=list, description="Номера телефонов для добавления"
+    )
+    remove_phone_numbers: List[str] = Field(
+        default_factory=list, description="Номера телефонов для удаления"
+    )
+    add_activity_ids: List[int] = Field(
+        default_factory=list,
+        description="Идентификаторы видов деятельности для добавления",
+    )
+    remove_activity_ids: List[int] = Field(
+        default_factory=list,
+        description="Идентификаторы видов деятельности для удаления",
+    )
+
+
 class Organization(OrganizationBase):
     id: int = Field(..., description="Идентификатор организации")
     phone_numbers: List[PhoneNumber] = Field(
@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(module: str, env: Optional[Dict[str, str]] = None) -> List[Dict]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Не удалось импортировать {module}:\n{completed.stderr[-2000:]}")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(
+                {
+                    "module": name,
+                    "self_ms": int(self_us) / 1000,
+                    "cumulative_ms": int(cumulative_us) / 1000,
+                    "depth": len(indent) // 2,
+                }
+            )
+    return entries
+
+
+def summarize(entries: List[Dict], module: str, top: int) -> Dict:
+    total = next(
+        (entry["cumulative_ms"] for entry in entries if entry["module"] == module),
+        sum(entry["self_ms"] for entry in entries),
+    )
+
+    packages: Dict[str, float] = defaultdict(float)
+    for entry in entries:
+        packages[entry["module"].split(".")[0]] += entry["self_ms"]
+
+    app_modules = sorted(
+        (entry for entry in entries if entry["module"].startswith("app.")),
+        key=lambda entry: entry["cumulative_ms"],
+        reverse=True,
+    )
+
+    return {
+        "module": module,
+        "total_ms": round(total, 1),
+        "modules_imported": len(entries),
+        "packages": {
+            name: round(duration, 1)
+            for name, duration in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+        "app_modules": {
+            entry["module"]: round(entry["cumulative_ms"], 1) for entry in app_modules[:top]
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время импорта приложения (python -X importtime)")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        help="Переменная окружения для замера, например GRAPHQL_ENABLED=false",
+    )
+    parser.add_argument("--output", help="Сохранить отчёт в JSON")
+    args = parser.parse_args()
+
+    env = dict(item.split("=", 1) for item in args.env)
+    reports = [
+        summarize(measure(args.module, env), args.module, args.top)
+        for _ in range(max(args.repeat, 1))
+    ]
+    report = min(reports, key=lambda item: item["total_ms"])
+    report["budget_ms"] = args.budget_ms
+    report["runs_ms"] = [item["total_ms"] for item in reports]
+
+    print(f"{args.module}: {report['total_ms']:.1f} мс, модулей: {report['modules_imported']}")
+    print("\nПакеты (собственное время):")
+    for name, duration in report["packages"].items():
+        print(f"  {name:40} {duration:>9.1f} мс")
+    print("\nМодули приложения (с зависимостями):")
+    for name, duration in report["app_modules"].items():
+        print(f"  {name:40} {duration:>9.1f} мс")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if report["total_ms"] > args.budget_ms:
+        print(f"\nБюджет превышен: {report['total_ms']:.1f} мс > {args.budget_ms:.0f} мс")
+        sys.exit(1)
+    print(f"\nВ пределах бюджета {args.budget_ms:.0f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from app.api.routes import buildings, activities, organizations
+from app.api.routes import buildings, activities, organizations, batch, admin
+from app.api.middleware import (
+    CacheStatusMiddleware,
+    CompressionMiddleware,
+    LastWriteMiddleware,
+    ProfilingMiddleware,
+    RequestMetricsMiddleware,
+)
 from app.core.config import settings
+from app.core.metrics import registry
+from app.core.api_keys import api_key_cache
+from app.core.data_version import data_version_watcher
+from app.core.jobs import job_queue
+from app.core.rate_limit import rate_limiter
+from app.core.warmup import warmup
+from app.db.base import dispose_engines
+from app.db.documents import register_jobs
+from app.db.warmup import compile_hot_queries, open_connections
+
+warmup.register("connections", open_connections)
+warmup.register("hot_queries", compile_hot_queries)
+register_jobs(job_queue)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(warmup.run())
+    else:
+        warmup.ready = True
+        warmup_task = None
+    api_key_cache.start()
+    data_version_watcher.start()
+    if settings.JOBS_WORKER_ENABLED:
+        job_queue.start()
+
+    yield
+
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await api_key_cache.stop()
+    await data_version_watcher.stop()
+    await job_queue.stop()
+    await rate_limiter.close()
+    await dispose_engines()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -18,6 +67,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CacheStatusMiddleware)
+app.add_middleware(LastWriteMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+if settings.PROFILING_ENABLED:
+    from app.core.profiler import route_sampler
+
+    app.add_middleware(ProfilingMiddleware, sampler=route_sampler)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
 
 app.include_router(
     organizations.router,
@@ -30,6 +88,14 @@ app.include_router(
 app.include_router(
     activities.router, prefix=f"{settings.API_V1_STR}/activities", tags=["activities"]
 )
+app.include_router(batch.router, prefix=f"{settings.API_V1_STR}/batch", tags=["batch"])
+if settings.GRAPHQL_ENABLED:
+    from app.api.graphql.schema import router as graphql_router
+
+    app.include_router(
+        graphql_router, prefix=f"{settings.API_V1_STR}/graphql", tags=["graphql"]
+    )
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
 
 
 @app.get("/")
@@ -37,3 +103,16 @@ async def root():
     return {
         "message": "Тестовое задание справочник организаций. Документация доступна по адресу /docs"
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    body = {"ready": warmup.ready, "warmup": warmup.report}
+    return JSONResponse(body, status_code=200 if warmup.ready else 503)
@@ -0,0 +1,36 @@
+"""api keys
+
+Revision ID: 3b8d2f4a9c10
+Revises: 6f9bf7c65ee0
+Create Date: 2026-10-19 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3b8d2f4a9c10'
+down_revision: Union[str, None] = '6f9bf7c65ee0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'api_keys',
+        sa.Column('id', sa.Integer(), primary_key=True, index=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('key_prefix', sa.String(length=8), nullable=False),
+        sa.Column('key_hash', sa.String(length=64), nullable=False, unique=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('is_admin', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('rate_limit_per_minute', sa.Integer(), nullable=True),
+        sa.Column('burst', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('api_keys')
@@ -0,0 +1,26 @@
+"""buildings coordinates index
+
+Revision ID: 7a3c9e5b1d28
+Revises: 5e2a8c3f7b14
+Create Date: 2026-10-19 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '7a3c9e5b1d28'
+down_revision: Union[str, None] = '5e2a8c3f7b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_buildings_latitude_longitude', 'buildings', ['latitude', 'longitude']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_buildings_latitude_longitude', table_name='buildings')
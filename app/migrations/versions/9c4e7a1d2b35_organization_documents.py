@@ -0,0 +1,38 @@
+"""organization documents
+
+Revision ID: 9c4e7a1d2b35
+Revises: 3b8d2f4a9c10
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '9c4e7a1d2b35'
+down_revision: Union[str, None] = '3b8d2f4a9c10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    json_type = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+    op.create_table(
+        'organization_documents',
+        sa.Column(
+            'organization_id',
+            sa.Integer(),
+            sa.ForeignKey('organizations.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('document', json_type, nullable=False),
+        sa.Column('summary', json_type, nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('organization_documents')
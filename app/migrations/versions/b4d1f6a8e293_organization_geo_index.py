@@ -0,0 +1,51 @@
+"""organization geo index
+
+Revision ID: b4d1f6a8e293
+Revises: 7a3c9e5b1d28
+Create Date: 2026-10-19 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b4d1f6a8e293'
+down_revision: Union[str, None] = '7a3c9e5b1d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'organization_geo_index',
+        sa.Column(
+            'activity_id',
+            sa.Integer(),
+            sa.ForeignKey('activities.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('geohash', sa.String(length=12), primary_key=True),
+        sa.Column(
+            'organization_id',
+            sa.Integer(),
+            sa.ForeignKey('organizations.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('depth', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+    )
+    op.create_index(
+        'ix_organization_geo_index_organization_id',
+        'organization_geo_index',
+        ['organization_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_organization_geo_index_organization_id', table_name='organization_geo_index'
+    )
+    op.drop_table('organization_geo_index')
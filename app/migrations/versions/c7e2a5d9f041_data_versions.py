@@ -0,0 +1,30 @@
+"""data versions
+
+Revision ID: c7e2a5d9f041
+Revises: e1f7c3a9b562
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c7e2a5d9f041'
+down_revision: Union[str, None] = 'e1f7c3a9b562'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    data_versions = op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(length=32), primary_key=True),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.bulk_insert(data_versions, [{'name': 'data', 'version': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
@@ -0,0 +1,96 @@
+"""phone numbers normalized
+
+Revision ID: e1f7c3a9b562
+Revises: b4d1f6a8e293
+Create Date: 2026-10-19 20:15:00.000000
+
+"""
+import os
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e1f7c3a9b562'
+down_revision: Union[str, None] = 'b4d1f6a8e293'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+COUNTRY_CODE = os.getenv("PHONE_COUNTRY_CODE", "7")
+TRUNK_PREFIX = os.getenv("PHONE_TRUNK_PREFIX", "8")
+NATIONAL_NUMBER_LENGTH = int(os.getenv("PHONE_NATIONAL_NUMBER_LENGTH", "10"))
+
+
+def _normalize(number: str) -> Optional[str]:
+    digits = re.sub(r"\D", "", number)
+    if not digits:
+        return None
+    if not number.lstrip().startswith("+"):
+        if len(digits) == NATIONAL_NUMBER_LENGTH + len(TRUNK_PREFIX) and digits.startswith(
+            TRUNK_PREFIX
+        ):
+            digits = COUNTRY_CODE + digits[len(TRUNK_PREFIX):]
+        elif len(digits) == NATIONAL_NUMBER_LENGTH:
+            digits = COUNTRY_CODE + digits
+    return digits if len(digits) <= 15 else None
+
+
+def upgrade() -> None:
+    digits_type = sa.String(length=16).with_variant(
+        sa.String(length=16, collation='C'), 'postgresql'
+    )
+    op.add_column('phone_numbers', sa.Column('number_normalized', digits_type, nullable=True))
+    op.add_column('phone_numbers', sa.Column('number_reversed', digits_type, nullable=True))
+
+    connection = op.get_bind()
+    phone_numbers = sa.table(
+        'phone_numbers',
+        sa.column('id', sa.Integer()),
+        sa.column('number', sa.String()),
+        sa.column('number_normalized', sa.String()),
+        sa.column('number_reversed', sa.String()),
+    )
+    update = (
+        phone_numbers.update()
+        .where(phone_numbers.c.id == sa.bindparam('phone_id'))
+        .values(
+            number_normalized=sa.bindparam('normalized'),
+            number_reversed=sa.bindparam('reversed'),
+        )
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(phone_numbers.c.id, phone_numbers.c.number)
+            .where(phone_numbers.c.id > last_id)
+            .order_by(phone_numbers.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for phone_id, number in rows:
+            normalized = _normalize(number)
+            params.append(
+                {
+                    'phone_id': phone_id,
+                    'normalized': normalized,
+                    'reversed': normalized[::-1] if normalized else None,
+                }
+            )
+        connection.execute(update, params)
+        last_id = rows[-1].id
+
+    op.create_index('ix_phone_numbers_number_normalized', 'phone_numbers', ['number_normalized'])
+    op.create_index('ix_phone_numbers_number_reversed', 'phone_numbers', ['number_reversed'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_phone_numbers_number_reversed', table_name='phone_numbers')
+    op.drop_index('ix_phone_numbers_number_normalized', table_name='phone_numbers')
+    op.drop_column('phone_numbers', 'number_reversed')
+    op.drop_column('phone_numbers', 'number_normalized')
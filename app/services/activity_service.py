@@ -1,13 +1,29 @@
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.single_flight import single_flight
+from app.core.swr import stale_while_revalidate
+from app.core.jobs import job_queue
+from app.db.documents import REFRESH_ACTIVITY_DOCUMENTS, REFRESH_ORGANIZATION_DOCUMENTS
 from app.db.repositories.activity_repository import ActivityRepository
-from app.domain.models.activity import ActivityCreate, ActivityUpdate, Activity
+from app.db.repositories.organization_document_repository import (
+    OrganizationDocumentRepository,
+)
+from app.domain.models.activity import (
+    ActivityCreate,
+    ActivityUpdate,
+    Activity,
+    ActivityWithChildren,
+)
+
+MAX_ACTIVITY_DEPTH = 3
+DEPTH_ERROR = f"Превышена максимальная глубина вложенности ({MAX_ACTIVITY_DEPTH} уровня)"
 
 
 class ActivityService:
     def __init__(self):
         self.repository = ActivityRepository()
+        self.documents = OrganizationDocumentRepository()
 
     async def get(self, db: AsyncSession, activity_id: int) -> Optional[Activity]:
         return await self.repository.get(db, activity_id)
@@ -22,26 +38,38 @@ class ActivityService:
     ) -> List[Activity]:
         return await self.repository.get_multi(db, skip=skip, limit=limit)
 
+    async def get_children(
+        self, db: AsyncSession, parent_ids: List[int]
+    ) -> List[Activity]:
+        return await self.repository.get_children_by_parent_ids(db, parent_ids)
+
     async def get_root_activities(self, db: AsyncSession) -> List[Activity]:
         return await self.repository.get_root_activities(db)
 
-    async def get_activity_tree(self, db: AsyncSession) -> List[Activity]:
-        return await self.repository.get_activity_tree(db)
-
-    async def create(self, db: AsyncSession, activity_in: ActivityCreate) -> Activity:
-        if activity_in.parent_id:
+    @stale_while_revalidate()
+    @single_flight
+    async def get_activity_tree(self, db: AsyncSession) -> List[ActivityWithChildren]:
+        return [
+            ActivityWithChildren.model_validate(activity)
+            for activity in await self.repository.get_activity_tree(db)
+        ]
+
+    async def create(
+        self, db: AsyncSession, activity_in: ActivityCreate, check_hierarchy: bool = True
+    ) -> Activity:
+        if check_hierarchy and activity_in.parent_id:
             depth = await self.repository.check_depth(db, activity_in.parent_id)
-            if (
-                depth >= 2
-            ):  
-                raise ValueError(
-                    "Превышена максимальная глубина вложенности (3 уровня)"
-                )
+            if depth >= MAX_ACTIVITY_DEPTH:
+                raise ValueError(DEPTH_ERROR)
 
         return await self.repository.create(db, obj_in=activity_in)
 
     async def update(
-        self, db: AsyncSession, activity_id: int, activity_in: ActivityUpdate
+        self,
+        db: AsyncSession,
+        activity_id: int,
+        activity_in: ActivityUpdate,
+        check_hierarchy: bool = True,
     ) -> Optional[Activity]:
         db_activity = await self.repository.get(db, activity_id)
         if not db_activity:
@@ -52,22 +80,60 @@ class ActivityService:
                 "Вид деятельности не может быть своим собственным родителем"
             )
 
-        if activity_in.parent_id and activity_in.parent_id != db_activity.parent_id:
-            depth = await self.repository.check_depth(db, activity_in.parent_id)
-            if depth >= 2:
-                raise ValueError(
-                    "Превышена максимальная глубина вложенности (3 уровня)"
-                )
-
-            child_ids = await self.repository.get_all_child_ids(db, activity_id)
-            if activity_in.parent_id in child_ids:
-                raise ValueError("Обнаружена циклическая ссылка")
-
-        return await self.repository.update(db, db_obj=db_activity, obj_in=activity_in)
+        parent_id = db_activity.parent_id
+        db_activity = await self.repository.update(db, db_obj=db_activity, obj_in=activity_in)
+        if check_hierarchy and db_activity.parent_id != parent_id:
+            # Перенос затрагивает всё поддерево: проверяем глубину и циклы целиком.
+            await self.validate_hierarchy(db)
+
+        payload = {"activity_id": activity_id}
+        idempotency_key = f"{REFRESH_ACTIVITY_DOCUMENTS}:{activity_id}"
+        if db_activity.parent_id != parent_id:
+            payload["subtree"] = True
+            idempotency_key += ":subtree"
+        await job_queue.enqueue(
+            db, REFRESH_ACTIVITY_DOCUMENTS, payload, idempotency_key=idempotency_key
+        )
+        return db_activity
 
     async def delete(self, db: AsyncSession, activity_id: int) -> bool:
+        organization_ids = await self.documents.get_organization_ids_by_activities(
+            db, [activity_id]
+        )
+        for child in await self.repository.get_children_by_parent_ids(db, [activity_id]):
+            await job_queue.enqueue(
+                db,
+                REFRESH_ACTIVITY_DOCUMENTS,
+                {"activity_id": child.id, "subtree": True},
+                idempotency_key=f"{REFRESH_ACTIVITY_DOCUMENTS}:{child.id}:subtree",
+            )
         db_activity = await self.repository.remove(db, id=activity_id)
+        if db_activity is not None and organization_ids:
+            await job_queue.enqueue(
+                db, REFRESH_ORGANIZATION_DOCUMENTS, {"organization_ids": organization_ids}
+            )
         return db_activity is not None
 
     async def get_all_child_ids(self, db: AsyncSession, activity_id: int) -> Set[int]:
         return await self.repository.get_all_child_ids(db, activity_id)
+
+    async def validate_hierarchy(self, db: AsyncSession) -> None:
+        parents = await self.repository.get_parent_map(db)
+        depths: Dict[int, int] = {}
+
+        for activity_id in parents:
+            path = []
+            current_id = activity_id
+            while current_id is not None and current_id not in depths:
+                if current_id in path:
+                    raise ValueError("Обнаружена циклическая ссылка")
+                path.append(current_id)
+                current_id = parents.get(current_id)
+
+            depth = depths[current_id] if current_id is not None else 0
+            for path_id in reversed(path):
+                depth += 1
+                depths[path_id] = depth
+
+            if depths[activity_id] > MAX_ACTIVITY_DEPTH:
+                raise ValueError(DEPTH_ERROR)
@@ -0,0 +1,32 @@
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.api_keys import api_key_cache, generate_api_key
+from app.db.repositories.api_key_repository import ApiKeyRepository
+from app.domain.models.api_key import ApiKey, ApiKeyCreate, ApiKeyCreated
+
+
+class ApiKeyService:
+    def __init__(self):
+        self.repository = ApiKeyRepository()
+
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ApiKey]:
+        return await self.repository.get_multi(db, skip=skip, limit=limit)
+
+    async def create(self, db: AsyncSession, api_key_in: ApiKeyCreate) -> ApiKeyCreated:
+        key, key_prefix, key_hash = generate_api_key()
+        db_api_key = await self.repository.create_with_hash(
+            db, obj_in=api_key_in, key_prefix=key_prefix, key_hash=key_hash
+        )
+        api_key_cache.add(db, db_api_key)
+        return ApiKeyCreated(**ApiKey.model_validate(db_api_key).model_dump(), key=key)
+
+    async def deactivate(self, db: AsyncSession, api_key_id: int) -> Optional[ApiKey]:
+        db_api_key = await self.repository.get(db, api_key_id)
+        if not db_api_key:
+            return None
+        db_api_key = await self.repository.update(
+            db, db_obj=db_api_key, obj_in={"is_active": False}
+        )
+        api_key_cache.remove(db, db_api_key.key_hash)
+        return db_api_key
@@ -0,0 +1,136 @@
+from typing import List
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.activity_service import ActivityService
+from app.services.building_service import BuildingService
+from app.services.organization_service import OrganizationService
+from app.domain.models.activity import ActivityCreate, ActivityUpdate
+from app.domain.models.building import BuildingCreate, BuildingUpdate
+from app.domain.models.organization import OrganizationCreate, OrganizationUpdate
+from app.domain.models.batch import (
+    BatchOperation,
+    BatchOperationResult,
+    BatchResponse,
+)
+
+
+class BatchService:
+    def __init__(self):
+        self.organization_service = OrganizationService()
+        self.building_service = BuildingService()
+        self.activity_service = ActivityService()
+
+    async def execute(
+        self, db: AsyncSession, operations: List[BatchOperation]
+    ) -> BatchResponse:
+        results: List[BatchOperationResult] = []
+        touches_activities = False
+
+        for index, operation in enumerate(operations):
+            try:
+                entity_id = await self._execute_operation(db, operation)
+            except (ValueError, ValidationError, SQLAlchemyError) as e:
+                results.append(
+                    BatchOperationResult(index=index, status="error", detail=str(e))
+                )
+                return await self._abort(db, results, len(operations))
+
+            if entity_id is None:
+                results.append(
+                    BatchOperationResult(
+                        index=index, status="error", detail="Объект не найден"
+                    )
+                )
+                return await self._abort(db, results, len(operations))
+
+            touches_activities = touches_activities or operation.entity == "activity"
+            results.append(BatchOperationResult(index=index, status="ok", id=entity_id))
+
+        if touches_activities:
+            try:
+                await self.activity_service.validate_hierarchy(db)
+            except ValueError as e:
+                await db.rollback()
+                for result, operation in zip(results, operations):
+                    if operation.entity == "activity":
+                        result.status = "error"
+                        result.detail = str(e)
+                return BatchResponse(committed=False, results=results)
+
+        return BatchResponse(committed=True, results=results)
+
+    async def _abort(
+        self, db: AsyncSession, results: List[BatchOperationResult], total: int
+    ) -> BatchResponse:
+        await db.rollback()
+        results.extend(
+            BatchOperationResult(index=index, status="skipped")
+            for index in range(len(results), total)
+        )
+        return BatchResponse(committed=False, results=results)
+
+    async def _execute_operation(self, db: AsyncSession, operation: BatchOperation):
+        if operation.action != "create" and operation.id is None:
+            raise ValueError("Для update и delete необходимо указать id")
+
+        if operation.entity == "organization":
+            return await self._execute_organization(db, operation)
+        if operation.entity == "building":
+            return await self._execute_building(db, operation)
+        return await self._execute_activity(db, operation)
+
+    async def _execute_organization(self, db: AsyncSession, operation: BatchOperation):
+        service = self.organization_service
+        if operation.action == "create":
+            obj = await service.create(
+                db, organization_in=OrganizationCreate.model_validate(operation.data)
+            )
+        elif operation.action == "update":
+            obj = await service.update(
+                db,
+                organization_id=operation.id,
+                organization_in=OrganizationUpdate.model_validate(operation.data),
+            )
+        else:
+            deleted = await service.delete(db, organization_id=operation.id)
+            return operation.id if deleted else None
+        return obj.id if obj else None
+
+    async def _execute_building(self, db: AsyncSession, operation: BatchOperation):
+        service = self.building_service
+        if operation.action == "create":
+            obj = await service.create(
+                db, building_in=BuildingCreate.model_validate(operation.data)
+            )
+        elif operation.action == "update":
+            obj = await service.update(
+                db,
+                building_id=operation.id,
+                building_in=BuildingUpdate.model_validate(operation.data),
+            )
+        else:
+            deleted = await service.delete(db, building_id=operation.id)
+            return operation.id if deleted else None
+        return obj.id if obj else None
+
+    async def _execute_activity(self, db: AsyncSession, operation: BatchOperation):
+        service = self.activity_service
+        if operation.action == "create":
+            obj = await service.create(
+                db,
+                activity_in=ActivityCreate.model_validate(operation.data),
+                check_hierarchy=False,
+            )
+        elif operation.action == "update":
+            obj = await service.update(
+                db,
+                activity_id=operation.id,
+                activity_in=ActivityUpdate.model_validate(operation.data),
+                check_hierarchy=False,
+            )
+        else:
+            deleted = await service.delete(db, activity_id=operation.id)
+            return operation.id if deleted else None
+        return obj.id if obj else None
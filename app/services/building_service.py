@@ -1,13 +1,19 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.jobs import job_queue
+from app.db.documents import REFRESH_BUILDING_DOCUMENTS
 from app.db.repositories.building_repository import BuildingRepository
+from app.db.repositories.organization_document_repository import (
+    OrganizationDocumentRepository,
+)
 from app.domain.models.building import BuildingCreate, BuildingUpdate, Building
 
 
 class BuildingService:
     def __init__(self):
         self.repository = BuildingRepository()
+        self.documents = OrganizationDocumentRepository()
     
     async def get(self, db: AsyncSession, building_id: int) -> Optional[Building]:
         return await self.repository.get(db, building_id)
@@ -25,9 +31,18 @@ class BuildingService:
         db_building = await self.repository.get(db, building_id)
         if not db_building:
             return None
-        return await self.repository.update(db, db_obj=db_building, obj_in=building_in)
+        db_building = await self.repository.update(db, db_obj=db_building, obj_in=building_in)
+        await job_queue.enqueue(
+            db,
+            REFRESH_BUILDING_DOCUMENTS,
+            {"building_id": building_id},
+            idempotency_key=f"{REFRESH_BUILDING_DOCUMENTS}:{building_id}",
+        )
+        return db_building
     
     async def delete(self, db: AsyncSession, building_id: int) -> bool:
+        organization_ids = await self.documents.get_organization_ids_by_buildings(db, [building_id])
+        await self.documents.remove(db, organization_ids)
         db_building = await self.repository.remove(db, id=building_id)
         return db_building is not None
     
@@ -1,10 +1,13 @@
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.single_flight import single_flight
+from app.core.swr import stale_while_revalidate
 from app.db.repositories.organization_repository import OrganizationRepository
 from app.domain.models.organization import (
     OrganizationCreate,
     OrganizationUpdate,
+    OrganizationPatch,
     Organization,
 )
 
@@ -30,6 +33,19 @@ class OrganizationService:
             db, skip=skip, limit=limit
         )
 
+    async def get_json(self, db: AsyncSession, organization_id: int) -> Optional[str]:
+        return await self.repository.get_document_json(db, organization_id)
+
+    async def get_all_json(
+        self, db: AsyncSession, skip: int = 0, limit: int = 100
+    ) -> Optional[str]:
+        documents = await self.repository.get_multi_documents_json(
+            db, skip=skip, limit=limit
+        )
+        if documents is None:
+            return None
+        return "[" + ",".join(documents) + "]"
+
     async def create(
         self, db: AsyncSession, organization_in: OrganizationCreate
     ) -> Organization:
@@ -48,6 +64,19 @@ class OrganizationService:
             db, db_obj=db_organization, obj_in=organization_in
         )
 
+    async def patch(
+        self,
+        db: AsyncSession,
+        organization_id: int,
+        organization_in: OrganizationPatch,
+    ) -> Optional[Organization]:
+        db_organization = await self.repository.get(db, organization_id)
+        if not db_organization:
+            return None
+        return await self.repository.patch_with_relations(
+            db, db_obj=db_organization, obj_in=organization_in
+        )
+
     async def delete(self, db: AsyncSession, organization_id: int) -> bool:
         db_organization = await self.repository.remove(db, id=organization_id)
         return db_organization is not None
@@ -57,14 +86,37 @@ class OrganizationService:
     ) -> List[Organization]:
         return await self.repository.get_by_building(db, building_id)
 
+    async def get_by_buildings(
+        self, db: AsyncSession, building_ids: List[int]
+    ) -> List[Organization]:
+        return await self.repository.get_by_buildings(db, building_ids)
+
+    @stale_while_revalidate()
+    @single_flight
+    async def count_by_activities(
+        self, db: AsyncSession, activity_ids: List[int]
+    ) -> Dict[int, int]:
+        return await self.repository.count_by_activities(db, activity_ids)
+
+    @single_flight
     async def get_by_activity(
-        self, db: AsyncSession, activity_id: int, include_children: bool = False
+        self,
+        db: AsyncSession,
+        activity_id: int,
+        include_children: bool = False,
+        skip: int = 0,
+        limit: Optional[int] = None,
     ) -> List[Organization]:
-        return await self.repository.get_by_activity(db, activity_id, include_children)
+        return await self.repository.get_by_activity(
+            db, activity_id, include_children, skip=skip, limit=limit
+        )
 
-    async def search_by_name(self, db: AsyncSession, name: str) -> List[Organization]:
-        return await self.repository.search_by_name(db, name)
+    async def search_by_name(
+        self, db: AsyncSession, name: str, skip: int = 0, limit: Optional[int] = None
+    ) -> List[Organization]:
+        return await self.repository.search_by_name(db, name, skip=skip, limit=limit)
 
+    @single_flight
     async def get_by_location(
         self,
         db: AsyncSession,
@@ -87,6 +139,72 @@ class OrganizationService:
             max_lon=max_lon,
         )
 
+    @single_flight
+    async def get_by_polygon(
+        self, db: AsyncSession, points: List[Tuple[float, float]], limit: int = 100
+    ) -> List[Organization]:
+        return await self.repository.get_by_polygon(db, points, limit=limit)
+
+    @single_flight
+    async def get_by_route(
+        self,
+        db: AsyncSession,
+        points: List[Tuple[float, float]],
+        distance: float,
+        limit: int = 100,
+    ) -> List[Organization]:
+        return await self.repository.get_by_route(db, points, distance, limit=limit)
+
+    async def iter_by_points(
+        self,
+        db: AsyncSession,
+        points: List[Tuple[float, float]],
+        radius: float,
+        activity_id: Optional[int] = None,
+        include_children: bool = True,
+        limit: int = 20,
+        chunk_size: int = 500,
+    ) -> AsyncIterator[List[List[Organization]]]:
+        activity_ids = await self.repository.get_activity_ids(
+            db, activity_id, include_children
+        )
+        for start in range(0, len(points), chunk_size):
+            yield await self.repository.get_by_points(
+                db,
+                points=points[start:start + chunk_size],
+                radius=radius,
+                activity_ids=activity_ids,
+                limit=limit,
+            )
+            db.expunge_all()
+            db.info.pop("loaders", None)
+
+    @single_flight
+    async def get_nearby(
+        self,
+        db: AsyncSession,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        activity_id: int,
+        include_children: bool = True,
+        limit: int = 100,
+    ) -> List[Organization]:
+        return await self.repository.get_nearby(
+            db,
+            latitude=latitude,
+            longitude=longitude,
+            radius=radius,
+            activity_id=activity_id,
+            include_children=include_children,
+            limit=limit,
+        )
+
+    async def get_by_phone(
+        self, db: AsyncSession, number: str, suffix: bool = False
+    ) -> List[Organization]:
+        return await self.repository.get_by_phone(db, number=number, suffix=suffix)
+
     async def get_by_activity_name(
         self, db: AsyncSession, activity_name: str, include_children: bool = True
     ) -> List[Organization]:
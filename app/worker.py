@@ -0,0 +1,22 @@
+import asyncio
+import logging
+
+from app.core.jobs import job_queue
+from app.db.base import dispose_engines
+from app.db.documents import register_jobs
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    register_jobs(job_queue)
+    logger.info("Обработчик очереди задач запущен")
+    try:
+        await job_queue.run_forever()
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
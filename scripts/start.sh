@@ -1,13 +1,13 @@
 #!/bin/bash
 set -e
 
-alembic upgrade head
-
-echo "Waiting for database to start..."
-sleep 5
-
-echo "Running migrations and initializing database..."
+echo "Preparing database..."
 python -m app.db.migrations
 
+if [ "${SERVER_MODE:-development}" = "production" ]; then
+    echo "Starting application (production, ${WEB_CONCURRENCY:-auto} workers)..."
+    exec gunicorn app.main:app -c gunicorn.conf.py
+fi
+
 echo "Starting application..."
-uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload 
+exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
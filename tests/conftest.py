@@ -0,0 +1,55 @@
+import asyncio
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}",
+)
+os.environ.setdefault("DB_POOL_SIZE", "0")
+os.environ.setdefault("API_KEY", "test-key")
+os.environ.setdefault("WARMUP_ENABLED", "false")
+os.environ.setdefault("JOBS_WORKER_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.response_cache import response_cache
+from app.db.base import Base, engine
+from app.db.init_db import init_db
+
+API_KEY = os.environ["API_KEY"]
+
+
+async def _reset_database(seed: bool) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    if seed:
+        await init_db()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def database():
+    asyncio.run(_reset_database(seed=False))
+    response_cache.clear()
+
+
+@pytest.fixture
+def seeded_database():
+    asyncio.run(_reset_database(seed=True))
+    response_cache.clear()
+
+
+@pytest.fixture
+def client(seeded_database):
+    from app.main import app
+
+    with TestClient(app, headers={"X-API-Key": API_KEY}) as test_client:
+        yield test_client
@@ -0,0 +1,48 @@
+from app.core.config import settings
+from app.services.activity_service import DEPTH_ERROR
+
+URL = f"{settings.API_V1_STR}/activities/"
+
+
+def _ids(client):
+    ids = {}
+    stack = list(client.get(f"{URL}tree").json()["activities"])
+    while stack:
+        activity = stack.pop()
+        ids[activity["name"]] = activity["id"]
+        stack.extend(activity.get("children") or [])
+    return ids
+
+
+def test_create_allows_three_levels(client):
+    ids = _ids(client)
+
+    third = client.post(URL, json={"name": "Фарш", "parent_id": ids["Мясная продукция"]})
+    assert third.status_code == 200
+
+    fourth = client.post(URL, json={"name": "Котлеты", "parent_id": third.json()["id"]})
+    assert fourth.status_code == 400
+    assert fourth.json()["detail"] == DEPTH_ERROR
+
+
+def test_update_checks_depth_of_moved_subtree(client):
+    ids = _ids(client)
+
+    # «Еда» сама по себе корень, но вместе с поддеревом уже занимает три уровня.
+    moved = client.put(f"{URL}{ids['Еда']}", json={"parent_id": ids["Автомобили"]})
+    assert moved.status_code == 400
+    assert moved.json()["detail"] == DEPTH_ERROR
+    assert client.get(f"{URL}{ids['Еда']}").json()["parent_id"] is None
+
+    leaf = client.put(
+        f"{URL}{ids['Хлебобулочные изделия']}", json={"parent_id": ids["Мясная продукция"]}
+    )
+    assert leaf.status_code == 200
+
+
+def test_update_rejects_cycles(client):
+    ids = _ids(client)
+
+    cycle = client.put(f"{URL}{ids['Еда']}", json={"parent_id": ids["Говядина"]})
+    assert cycle.status_code == 400
+    assert client.get(f"{URL}{ids['Еда']}").json()["parent_id"] is None
@@ -0,0 +1,60 @@
+import pytest
+
+from app.core.api_keys import ApiKeyCache, api_key_cache, hash_api_key
+from app.db.base import UnitOfWork
+from app.domain.models.api_key import ApiKeyCreate
+from app.services.api_key_service import ApiKeyService
+
+
+@pytest.mark.anyio
+async def test_cache_changes_are_applied_only_after_commit(database):
+    service = ApiKeyService()
+
+    async with UnitOfWork() as db:
+        rolled_back = await service.create(db, ApiKeyCreate(name="rolled back"))
+        await db.rollback()
+    assert hash_api_key(rolled_back.key) not in api_key_cache._keys
+
+    async with UnitOfWork() as db:
+        created = await service.create(db, ApiKeyCreate(name="partner"))
+        assert hash_api_key(created.key) not in api_key_cache._keys
+    assert api_key_cache._keys[hash_api_key(created.key)].id == created.id
+    await api_key_cache._refresh_task
+
+    async with UnitOfWork() as db:
+        await service.deactivate(db, created.id)
+        assert hash_api_key(created.key) in api_key_cache._keys
+    assert hash_api_key(created.key) not in api_key_cache._keys
+    await api_key_cache._refresh_task
+    assert await api_key_cache.lookup(created.key) is None
+
+
+@pytest.mark.anyio
+async def test_miss_falls_back_to_database_with_negative_ttl(database, monkeypatch):
+    cache = ApiKeyCache(refresh_seconds=30, negative_ttl=60, negative_max_size=1)
+    await cache.refresh()
+
+    lookups = []
+    get_active_by_hash = cache.repository.get_active_by_hash
+
+    async def counting_get_active_by_hash(db, key_hash):
+        lookups.append(key_hash)
+        return await get_active_by_hash(db, key_hash)
+
+    monkeypatch.setattr(cache.repository, "get_active_by_hash", counting_get_active_by_hash)
+
+    async with UnitOfWork() as db:
+        # Ключ создан «в другом воркере»: в этот кэш он не попадает.
+        created = await ApiKeyService().create(db, ApiKeyCreate(name="elsewhere"))
+    info = await cache.lookup(created.key)
+    assert info is not None and info.id == created.id
+    assert await cache.lookup(created.key) is info
+    assert len(lookups) == 1
+
+    assert await cache.lookup("unknown") is None
+    assert await cache.lookup("unknown") is None
+    assert len(lookups) == 2
+
+    assert await cache.lookup("another") is None
+    assert list(cache._unknown) == [hash_api_key("another")]
+    await api_key_cache._refresh_task
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import update
+
+from app.core.data_version import DataVersionWatcher
+from app.core.jobs import job_queue
+from app.db.base import UnitOfWork, engine
+from app.db.models import Building, DataVersion
+from app.db.repositories.data_version_repository import DataVersionRepository
+
+
+async def _version() -> int:
+    async with UnitOfWork(read_only=True) as db:
+        return await DataVersionRepository().get_version(db)
+
+
+@pytest.mark.anyio
+async def test_write_commit_bumps_version(database):
+    assert await _version() == 0
+    async with UnitOfWork() as db:
+        db.add(Building(name="Здание", address="Адрес", latitude=55.0, longitude=37.0))
+    assert await _version() == 1
+
+    async with UnitOfWork() as db:
+        await db.get(Building, 1)
+    assert await _version() == 1
+
+
+@pytest.mark.anyio
+async def test_idle_job_poll_does_not_bump_version(database):
+    assert await job_queue.run_once() == 0
+    await job_queue.maintain()
+    await job_queue.update_stats()
+    assert await _version() == 0
+
+
+@pytest.mark.anyio
+async def test_watcher_notifies_on_commit_from_another_process(database):
+    calls = []
+    watcher = DataVersionWatcher(poll_interval=0)
+    watcher.subscribe(lambda: calls.append(1))
+
+    assert await watcher.check() is False
+    async with engine.begin() as connection:
+        await connection.execute(update(DataVersion).values(version=DataVersion.version + 1))
+    assert await watcher.check() is True
+    assert await watcher.check() is False
+    assert calls == [1]
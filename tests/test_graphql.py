@@ -0,0 +1,49 @@
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/graphql"
+
+
+def _query(client, query, **variables):
+    response = client.post(URL, json={"query": query, "variables": variables})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_search_organizations_is_limited(client):
+    everything = _query(client, '{ searchOrganizations(name: "") { id } }')
+    first_two = _query(client, '{ searchOrganizations(name: "", limit: 2) { id } }')
+    next_two = _query(client, '{ searchOrganizations(name: "", skip: 2, limit: 2) { id } }')
+
+    ids = [organization["id"] for organization in everything["data"]["searchOrganizations"]]
+    assert len(ids) > 4
+    assert [o["id"] for o in first_two["data"]["searchOrganizations"]] == sorted(ids)[:2]
+    assert [o["id"] for o in next_two["data"]["searchOrganizations"]] == sorted(ids)[2:4]
+
+
+def test_list_fields_are_limited(client):
+    result = _query(
+        client,
+        "{ organizationsByActivity(activityId: 1, limit: 1) { id }"
+        " buildings(limit: 5) { organizations(limit: 1) { id } } }",
+    )
+    assert len(result["data"]["organizationsByActivity"]) == 1
+    assert all(len(building["organizations"]) <= 1 for building in result["data"]["buildings"])
+
+
+def test_cost_uses_limit_of_list_fields(client):
+    limit = settings.GRAPHQL_MAX_LIST_SIZE
+    query = (
+        f'{{ searchOrganizations(name: "", limit: {limit}) '
+        f"{{ building {{ organizations(limit: {limit}) {{ id }} }} }} }}"
+    )
+    result = _query(client, query)
+    assert result["data"] is None
+    assert "стоимость" in result["errors"][0]["message"]
+
+    result = _query(
+        client,
+        'query($limit: Int!) { searchOrganizations(name: "", limit: $limit)'
+        " { building { organizations { id } } } }",
+        limit=limit,
+    )
+    assert result["data"] is None
@@ -0,0 +1,121 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.jobs import JobQueue, job_queue
+from app.db.base import UnitOfWork
+from app.db.documents import REFRESH_ORGANIZATION_DOCUMENTS, rebuild_documents, register_jobs
+from app.db.models import Activity, Job, organization_activity
+from app.db.repositories.job_repository import SUPERSEDED, JobRepository
+from app.db.repositories.organization_document_repository import (
+    OrganizationDocumentRepository,
+)
+from app.services.activity_service import ActivityService
+
+register_jobs(job_queue)
+
+
+async def _document(organization_id: int) -> dict:
+    async with UnitOfWork(read_only=True) as db:
+        return json.loads(await OrganizationDocumentRepository().get_raw(db, organization_id))
+
+
+@pytest.mark.anyio
+async def test_deleting_activity_refreshes_documents_of_descendants(seeded_database):
+    await rebuild_documents()
+    async with UnitOfWork(read_only=True) as db:
+        child_id, parent_id, organization_id = (
+            await db.execute(
+                select(Activity.id, Activity.parent_id, organization_activity.c.organization_id)
+                .join(organization_activity, organization_activity.c.activity_id == Activity.id)
+                .where(Activity.parent_id.is_not(None))
+                .order_by(Activity.id)
+                .limit(1)
+            )
+        ).one()
+    activity = next(a for a in (await _document(organization_id))["activities"] if a["id"] == child_id)
+    assert activity["parent_id"] == parent_id
+
+    async with UnitOfWork() as db:
+        assert await ActivityService().delete(db, parent_id)
+    while await job_queue.run_once():
+        pass
+
+    activity = next(a for a in (await _document(organization_id))["activities"] if a["id"] == child_id)
+    assert activity["parent_id"] is None
+
+
+@pytest.mark.anyio
+async def test_retry_with_pending_duplicate_is_superseded(database):
+    repository = JobRepository()
+    async with UnitOfWork() as db:
+        await job_queue.enqueue(db, REFRESH_ORGANIZATION_DOCUMENTS, {"organization_ids": []}, "key")
+    async with UnitOfWork() as db:
+        (job,) = await repository.claim(db, limit=10)
+    async with UnitOfWork() as db:
+        await job_queue.enqueue(db, REFRESH_ORGANIZATION_DOCUMENTS, {"organization_ids": []}, "key")
+
+    async with UnitOfWork() as db:
+        assert await repository.retry(db, job.id, error="boom", delay=timedelta(0)) is False
+    async with UnitOfWork(read_only=True) as db:
+        statuses = (await db.execute(select(Job.id, Job.status, Job.last_error).order_by(Job.id))).all()
+    assert statuses[0] == (job.id, "done", SUPERSEDED)
+    assert statuses[1][1] == "pending"
+
+
+@pytest.mark.anyio
+async def test_stale_running_job_is_requeued_by_maintenance(database):
+    repository = JobRepository()
+    async with UnitOfWork() as db:
+        await job_queue.enqueue(db, REFRESH_ORGANIZATION_DOCUMENTS, {"organization_ids": []}, "key")
+    async with UnitOfWork() as db:
+        (job,) = await repository.claim(db, limit=10)
+
+    async with UnitOfWork() as db:
+        await repository.requeue_stale(db, lock_timeout=timedelta(minutes=5))
+    async with UnitOfWork(read_only=True) as db:
+        assert await db.scalar(select(Job.status).where(Job.id == job.id)) == "running"
+
+    async with UnitOfWork() as db:
+        await repository.requeue_stale(db, lock_timeout=timedelta(0))
+    async with UnitOfWork(read_only=True) as db:
+        assert await db.scalar(select(Job.status).where(Job.id == job.id)) == "pending"
+
+
+@pytest.mark.anyio
+async def test_idle_queue_backs_off_and_maintains_on_its_own_interval():
+    queue = JobQueue(
+        batch_size=10,
+        poll_interval=0.01,
+        max_poll_interval=0.08,
+        maintenance_interval=60,
+        lock_timeout=300,
+        max_attempts=5,
+        retry_backoff=1,
+        retention_hours=24,
+    )
+    calls = {"run_once": 0, "maintain": 0, "update_stats": 0}
+
+    def counter(name, result=None):
+        async def count():
+            calls[name] += 1
+            return result
+        return count
+
+    queue.run_once = counter("run_once", 0)
+    queue.maintain = counter("maintain")
+    queue.update_stats = counter("update_stats")
+
+    task = asyncio.create_task(queue.run_forever())
+    await asyncio.sleep(0.5)
+    polls = calls["run_once"]
+    queue.wake()
+    await asyncio.sleep(0.005)
+    task.cancel()
+
+    assert 4 <= polls <= 12
+    assert calls["run_once"] == polls + 1
+    assert calls["maintain"] == calls["update_stats"] == 1
@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import event, insert, select
+
+from app.db.base import UnitOfWork, engine
+from app.db.loaders import MAX_BATCH_SIZE, DataLoader, get_loaders
+from app.db.models import Building, Organization, PhoneNumber
+from app.db.repositories.organization_repository import OrganizationRepository
+
+ASYNCPG_MAX_ARGUMENTS = 32767
+
+
+@pytest.mark.anyio
+async def test_load_many_splits_missing_keys_into_batches():
+    batches = []
+
+    async def load(keys):
+        batches.append(len(keys))
+        return {key: key * 2 for key in keys}
+
+    loader = DataLoader(load, max_batch_size=100)
+    result = await loader.load_many(range(250))
+
+    assert batches == [100, 100, 50]
+    assert result[249] == 498
+    assert await loader.load_many([1, 2]) == {1: 2, 2: 4}
+    assert batches == [100, 100, 50]
+
+
+@pytest.mark.anyio
+async def test_attach_relations_for_more_ids_than_bind_limit(database):
+    count = ASYNCPG_MAX_ARGUMENTS + MAX_BATCH_SIZE
+    async with UnitOfWork() as db:
+        await db.execute(
+            insert(Building),
+            [
+                {"id": 1, "name": "Здание", "address": "Адрес", "latitude": 55.0, "longitude": 37.0}
+            ],
+        )
+        await db.execute(
+            insert(Organization),
+            [{"id": i, "name": f"Организация {i}", "building_id": 1} for i in range(1, count + 1)],
+        )
+        await db.execute(
+            insert(PhoneNumber),
+            [{"organization_id": count, "number": "1-11", "number_normalized": "111"}],
+        )
+
+    arguments = []
+
+    def count_arguments(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            arguments.append(len(parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_arguments)
+    try:
+        async with UnitOfWork(read_only=True) as db:
+            organizations = (await db.execute(select(Organization))).scalars().all()
+            await get_loaders(db).attach_organization_relations(organizations)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_arguments)
+
+    assert max(arguments) < ASYNCPG_MAX_ARGUMENTS
+
+    assert len(organizations) == count
+    assert organizations[-1].building.name == "Здание"
+    assert [phone.number for phone in organizations[-1].phone_numbers] == ["1-11"]
+    assert organizations[0].activities == []
+
+
+@pytest.mark.anyio
+async def test_loaders_are_reset_after_writes(seeded_database):
+    repository = OrganizationRepository()
+    async with UnitOfWork() as db:
+        organization_id = (await db.execute(select(Organization.id))).scalars().first()
+        loaders = get_loaders(db)
+        organization = await repository.get_with_details(db, organization_id)
+        phone_count = len(organization.phone_numbers)
+        assert get_loaders(db) is loaders
+
+        db.add(PhoneNumber(number="1-111-111", organization_id=organization_id))
+        await db.flush()
+        assert get_loaders(db) is not loaders
+        organization = await repository.get_with_details(db, organization_id)
+        assert len(organization.phone_numbers) == phone_count + 1
+
+        loaders = get_loaders(db)
+        await db.execute(
+            insert(PhoneNumber).values(number="2-222-222", organization_id=organization_id)
+        )
+        assert get_loaders(db) is not loaders
+
+        loaders = get_loaders(db)
+        await db.commit()
+        assert get_loaders(db) is not loaders
+        organization = await repository.get_with_details(db, organization_id)
+        assert len(organization.phone_numbers) == phone_count + 2
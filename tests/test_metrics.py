@@ -0,0 +1,27 @@
+import os
+
+from app.core.metrics import Counter, Gauge, MetricsRegistry
+
+
+def test_samples_are_labelled_with_worker_pid():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Запросы", ["route"])
+    in_flight = registry.gauge("in_flight", "В обработке")
+    duration = registry.histogram("duration_seconds", "Длительность", buckets=(0.1,))
+
+    requests.labels("/").inc()
+    in_flight.inc()
+    in_flight.dec()
+    duration.observe(0.05)
+
+    worker = f'worker="{os.getpid()}"'
+    output = registry.render()
+    assert f'requests_total{{{worker},route="/"}} 1' in output
+    assert f"in_flight{{{worker}}} 0" in output
+    assert f'duration_seconds_bucket{{{worker},le="0.1"}} 1' in output
+    assert f"duration_seconds_count{{{worker}}} 1" in output
+
+
+def test_gauge_is_not_a_counter():
+    assert not issubclass(Gauge, Counter)
+    assert not hasattr(Counter("c", "c"), "set")
@@ -0,0 +1,25 @@
+from app.core.config import settings
+from app.db.base import LAST_WRITE_COOKIE, LAST_WRITE_HEADER
+
+URL = f"{settings.API_V1_STR}/buildings/"
+
+
+def test_last_write_is_set_after_a_committed_write(client):
+    response = client.post(
+        URL, json={"name": "Тест", "address": "ул. Тестовая, 1", "latitude": 55.75, "longitude": 37.61}
+    )
+    assert response.status_code == 200
+    assert float(response.headers[LAST_WRITE_HEADER]) > 0
+    assert response.cookies[LAST_WRITE_COOKIE] == response.headers[LAST_WRITE_HEADER]
+
+
+def test_last_write_is_not_set_for_failed_writes(client):
+    client.cookies.clear()
+    missing = client.delete(f"{URL}999999")
+    assert missing.status_code == 404
+    assert LAST_WRITE_HEADER not in missing.headers
+    assert LAST_WRITE_COOKIE not in missing.cookies
+
+    invalid = client.post(URL, json={"address": "ул. Тестовая, 1"})
+    assert invalid.status_code == 422
+    assert LAST_WRITE_HEADER not in invalid.headers
@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.single_flight import SingleFlight, single_flight
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_execution():
+    group = SingleFlight("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*(group.do("key", fetch) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert await group.do("key", fetch) is not results[0]
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_error_is_shared_and_not_cached():
+    group = SingleFlight("test")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(group.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    with pytest.raises(RuntimeError):
+        await group.do("key", fail)
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_follower_takes_over_when_leader_is_cancelled():
+    group = SingleFlight("test")
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "fast"
+
+    leader = asyncio.create_task(group.do("key", slow))
+    await started.wait()
+    follower = asyncio.create_task(group.do("key", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "fast"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+class _Service:
+    def __init__(self):
+        self.calls = 0
+
+    @single_flight
+    async def get(self, db, value: int, tags=()):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return value
+
+
+@pytest.mark.anyio
+async def test_decorator_merges_only_read_only_sessions():
+    service = _Service()
+    read_db = SimpleNamespace(info={"read_only": True})
+    write_db = SimpleNamespace(info={"read_only": False})
+
+    await asyncio.gather(
+        service.get(read_db, 1, tags=["a"]), service.get(read_db, value=1, tags=("a",))
+    )
+    assert service.calls == 1
+
+    await asyncio.gather(service.get(read_db, 1), service.get(read_db, 2))
+    assert service.calls == 3
+
+    await asyncio.gather(service.get(write_db, 1), service.get(write_db, 1))
+    assert service.calls == 5
@@ -0,0 +1,40 @@
+import time
+
+import pytest
+from sqlalchemy import update
+
+from app.core.data_version import data_version_watcher
+from app.db.base import UnitOfWork, engine
+from app.db.models import DataVersion
+from app.domain.models.activity import ActivityWithChildren
+from app.services.activity_service import ActivityService
+
+cache = ActivityService.get_activity_tree.cache
+
+
+@pytest.mark.anyio
+async def test_activity_tree_is_cached_as_plain_models(seeded_database):
+    cache.clear()
+    service = ActivityService()
+    async with UnitOfWork(read_only=True) as db:
+        tree = await service.get_activity_tree(db)
+    async with UnitOfWork(read_only=True) as db:
+        assert await service.get_activity_tree(db) is tree
+
+    assert tree and all(isinstance(activity, ActivityWithChildren) for activity in tree)
+    assert any(activity.children for activity in tree)
+
+
+@pytest.mark.anyio
+async def test_version_change_from_another_process_marks_entries_stale(seeded_database):
+    cache.clear()
+    await data_version_watcher.check()
+    async with UnitOfWork(read_only=True) as db:
+        await ActivityService().get_activity_tree(db)
+    (entry,) = cache._entries.values()
+    assert entry.fresh_until > time.monotonic()
+
+    async with engine.begin() as connection:
+        await connection.execute(update(DataVersion).values(version=DataVersion.version + 1))
+    assert await data_version_watcher.check() is True
+    assert entry.fresh_until <= time.monotonic()